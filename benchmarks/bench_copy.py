@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""Compare copy throughput of the copy engine at different worker counts.
+
+Usage:
+    python benchmarks/bench_copy.py [--files N] [--size BYTES] [--jobs 1,2,4,8]
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from emery_cli.file_handler import FileHandler  # noqa: E402
+
+
+def make_tree(root: Path, file_count: int, file_size: int) -> None:
+    """Create a synthetic tree of small files spread over subdirectories."""
+    payload = os.urandom(file_size)
+    for i in range(file_count):
+        sub = root / f"dir_{i % 64:02d}"
+        sub.mkdir(parents=True, exist_ok=True)
+        (sub / f"file_{i:06d}.bin").write_bytes(payload)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=5000, help="Number of files to generate")
+    parser.add_argument("--size", type=int, default=4096, help="Size of each file in bytes")
+    parser.add_argument("--jobs", default="1,2,4,8,16", help="Comma-separated worker counts")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="emery-bench-") as tmp:
+        tmp_path = Path(tmp)
+        source = tmp_path / "source"
+        make_tree(source, args.files, args.size)
+        total_mb = args.files * args.size / (1024 * 1024)
+
+        print(f"{args.files} files, {total_mb:.1f} MB total")
+        print(f"{'jobs':>6} {'seconds':>9} {'files/s':>10} {'MB/s':>8}")
+
+        for jobs in (int(j) for j in args.jobs.split(",")):
+            dest = tmp_path / f"dest_{jobs}"
+            handler = FileHandler(max_size_mb=100, jobs=jobs)
+
+            start = time.perf_counter()
+            success, message, copied = handler.copy_directory(source, dest)
+            elapsed = time.perf_counter() - start
+
+            if not success:
+                print(f"{jobs:>6} failed: {message}")
+                continue
+
+            print(f"{jobs:>6} {elapsed:>9.3f} {len(copied) / elapsed:>10.0f} {total_mb / elapsed:>8.1f}")
+            shutil.rmtree(dest)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""Benchmark every phase of the upload pipeline on synthetic trees.
+
+Each scenario generates a source tree, then runs scan, validate, copy,
+commit and push against a throwaway git repository with a local bare
+remote. Scenarios run in separate processes so their peak RSS figures do
+not mix; RSS is the process high-water mark after each phase.
+
+Scenarios:
+    tiny        many tiny files in a few directories
+    huge        a few very large files
+    deep        files spread over deeply nested directories
+    collisions  same-named files from many directories uploaded into one
+
+Usage:
+    python benchmarks/bench_pipeline.py [--scenarios tiny,huge] [--scale 0.5] [--jobs 4]
+                                        [--output results.json] [--compare baseline.json]
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+# name -> (file count, file size in bytes, directory depth, directory fan-out)
+SCENARIOS = {
+    "tiny": (20000, 512, 1, 50),
+    "huge": (3, 128 * 1024 * 1024, 1, 1),
+    "deep": (5000, 4096, 24, 2),
+    "collisions": (2000, 2048, 1, 100),
+}
+
+PHASES = ("scan", "validate", "copy", "commit", "push")
+
+
+def make_tree(root: Path, scenario: str, scale: float) -> tuple[int, int]:
+    """Generate the source tree for a scenario.
+
+    Returns:
+        Tuple of (file_count, total_bytes)
+    """
+    count, size, depth, fanout = SCENARIOS[scenario]
+    count = max(1, int(count * scale))
+    if scenario == "huge":
+        size = max(1, int(size * scale))
+
+    block = os.urandom(min(size, 1024 * 1024))
+    for i in range(count):
+        if scenario == "deep":
+            parts = [f"level_{(i >> level) % fanout}" for level in range(depth)]
+            directory = root.joinpath(*parts)
+        else:
+            directory = root / f"dir_{i % fanout:03d}"
+        directory.mkdir(parents=True, exist_ok=True)
+
+        # Collisions give every directory the same names (report_0 ... report_<count/fanout>),
+        # so each name arrives once per directory and every path is still unique
+        name = f"report_{i // fanout}.bin" if scenario == "collisions" else f"file_{i:06d}.bin"
+        with open(directory / name, "wb") as f:
+            remaining = size
+            while remaining > 0:
+                # Vary the first bytes so no two files share content
+                chunk = block[:remaining]
+                f.write(i.to_bytes(8, "little") + chunk[8:] if remaining == size else chunk)
+                remaining -= len(chunk)
+    return count, count * size
+
+
+def peak_rss_mb() -> float:
+    """High-water mark of this process's resident set size, in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_scenario(scenario: str, scale: float, jobs: int) -> Dict:
+    """Run every pipeline phase for one scenario in this process."""
+    from git import Repo
+
+    from emery_cli.file_handler import FileHandler
+    from emery_cli.git_handler import GitHandler
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix=f"emery-bench-{scenario}-") as tmp:
+        tmp_path = Path(tmp)
+        source = tmp_path / "source"
+        source.mkdir()
+        file_count, total_bytes = make_tree(source, scenario, scale)
+
+        Repo.init(str(tmp_path / "remote.git"), bare=True)
+        repo = Repo.init(str(tmp_path / "work"))
+        repo.index.commit("init")
+        repo.create_remote("origin", str(tmp_path / "remote.git"))
+        files_dir = tmp_path / "work" / "files"
+
+        file_handler = FileHandler(max_size_mb=1024 * 1024, jobs=jobs)
+        git_handler = GitHandler(tmp_path / "work")
+
+        def timed(phase: str, func):
+            start = time.perf_counter()
+            value = func()
+            elapsed = time.perf_counter() - start
+            results[phase] = {
+                "seconds": round(elapsed, 4),
+                "files_per_s": round(file_count / elapsed, 1) if elapsed else None,
+                "mb_per_s": round(total_bytes / (1024 * 1024) / elapsed, 1) if elapsed else None,
+                "peak_rss_mb": round(peak_rss_mb(), 1),
+            }
+            return value
+
+        manifest = timed("scan", lambda: file_handler.scan_directory(source))
+        timed("validate", lambda: file_handler.validate_directory(source, manifest))
+
+        if scenario == "collisions":
+            # Upload every file into one directory, so names have to be made unique
+            sources = [source / entry.rel_path for entry in manifest]
+            copied, errors = timed("copy", lambda: file_handler.copy_files_batch(sources, files_dir))
+        else:
+            success, message, copied = timed("copy", lambda: file_handler.copy_directory(source, files_dir, manifest))
+            errors = [] if success else [message]
+        if errors:
+            raise RuntimeError(f"copy failed: {errors[0]}")
+
+        committed = timed(
+            "commit",
+            lambda: git_handler.commit_in_shards(
+                "files", [str(path) for path in copied], "bench", "bench@emery.local", summary_base=files_dir
+            ),
+        )
+        if not committed:
+            raise RuntimeError("commit failed")
+        if not timed("push", lambda: git_handler.push("files")):
+            raise RuntimeError("push failed")
+
+    return {"files": file_count, "bytes": total_bytes, "phases": results}
+
+
+def print_results(results: Dict, baseline: Optional[Dict]) -> None:
+    header = f"{'scenario':<11} {'phase':<9} {'seconds':>9} {'files/s':>11} {'MB/s':>9} {'RSS MB':>8}"
+    if baseline:
+        header += f" {'vs base':>8}"
+    print(header)
+
+    for scenario, result in results["scenarios"].items():
+        for phase in PHASES:
+            row = result["phases"][phase]
+            line = (
+                f"{scenario:<11} {phase:<9} {row['seconds']:>9.3f} {row['files_per_s'] or 0:>11.0f} "
+                f"{row['mb_per_s'] or 0:>9.1f} {row['peak_rss_mb']:>8.1f}"
+            )
+            base = (baseline or {}).get("scenarios", {}).get(scenario, {}).get("phases", {}).get(phase)
+            if base and base["seconds"]:
+                # Positive means slower than the baseline
+                line += f" {(row['seconds'] / base['seconds'] - 1) * 100:>+7.0f}%"
+            print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="Comma-separated scenarios to run")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply file counts (and huge file sizes) by this")
+    parser.add_argument("--jobs", type=int, default=4, help="Copy workers")
+    parser.add_argument("--output", type=Path, help="Write results as JSON to this file")
+    parser.add_argument("--compare", type=Path, help="Show the change against a previous --output file")
+    parser.add_argument("--run-scenario", help=argparse.SUPPRESS)
+    parser.add_argument("--result-file", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_scenario:
+        result = run_scenario(args.run_scenario, args.scale, args.jobs)
+        args.result_file.write_text(json.dumps(result))
+        return
+
+    scenarios: List[str] = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = [name for name in scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(unknown)}")
+
+    results = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "scale": args.scale,
+        "jobs": args.jobs,
+        "scenarios": {},
+    }
+    for scenario in scenarios:
+        with tempfile.NamedTemporaryFile(suffix=".json") as result_file:
+            # A fresh process per scenario keeps peak RSS figures separate
+            subprocess.run(
+                [
+                    sys.executable, __file__,
+                    "--run-scenario", scenario,
+                    "--scale", str(args.scale),
+                    "--jobs", str(args.jobs),
+                    "--result-file", result_file.name,
+                ],
+                check=True,
+                stdout=subprocess.DEVNULL,
+            )
+            results["scenarios"][scenario] = json.loads(Path(result_file.name).read_text())
+
+    baseline = json.loads(args.compare.read_text()) if args.compare else None
+    print_results(results, baseline)
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+        print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
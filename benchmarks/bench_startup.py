@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Check CLI startup cost of every subcommand with `python -X importtime`.
+
+Each subcommand is started in a fresh interpreter (with --help, except
+read-only commands which run for real). The script reports the total
+import time, the part spent outside typer (whose cost is fixed), and
+fails if that part exceeds the budget, a share of typer's own import time
+so it holds on slow and fast machines alike, or if a command imported a
+module it should load lazily. tests/test_startup.py checks the same for
+real runs of every command.
+
+Usage:
+    python benchmarks/bench_startup.py [--budget 0.5] [--runs 3]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+# Modules that must only be imported by commands that actually use them
+LAZY_MODULES = {"git", "tkinter", "rich.progress", "concurrent.futures"}
+
+# Commands that are safe to run for real; everything else runs with --help
+READ_ONLY_COMMANDS = {"info"}
+
+
+def parse_importtime(stderr: str) -> Dict[str, int]:
+    """Map each imported module to its cumulative import time in microseconds."""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, _, rest = line.partition(":")
+        self_us, cumulative_us, name = rest.split("|")
+        modules[name.strip()] = int(cumulative_us)
+    return modules
+
+
+def measure(args: List[str]) -> Dict[str, int]:
+    """Run the CLI once with -X importtime and return per-module timings."""
+    # Import the module by name (not with -m) so it shows up in the timings
+    code = "import sys; sys.argv = ['emery'] + sys.argv[1:]; import emery_cli.main as m; m.main()"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code, *args],
+        cwd=str(ROOT),
+        capture_output=True,
+        text=True,
+        env={**os.environ, "COLUMNS": "200"},
+    )
+    return parse_importtime(result.stderr)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--budget", type=float, default=0.5, help="Budget for import time outside typer, as a share of typer's"
+    )
+    parser.add_argument("--runs", type=int, default=3, help="Runs per command (best one counts)")
+    args = parser.parse_args()
+
+    import typer.main
+    from emery_cli.main import app
+
+    commands = sorted(typer.main.get_command(app).commands)
+    failures = []
+
+    print(f"{'command':<22} {'total ms':>9} {'own ms':>8}  lazily-loaded modules imported")
+    for command in commands:
+        cli_args = [command] if command in READ_ONLY_COMMANDS else [command, "--help"]
+        runs = [measure(cli_args) for _ in range(args.runs)]
+        best = min(runs, key=lambda modules: modules.get("emery_cli.main", 0))
+
+        total_ms = best.get("emery_cli.main", 0) / 1000
+        typer_ms = best.get("typer", 0) / 1000
+        own_ms = total_ms - typer_ms
+        eager = sorted(LAZY_MODULES & best.keys())
+
+        print(f"{' '.join(cli_args):<22} {total_ms:>9.1f} {own_ms:>8.1f}  {', '.join(eager) or '-'}")
+        if own_ms > args.budget * typer_ms:
+            failures.append(f"{command}: {own_ms:.1f} ms over the {args.budget * typer_ms:.0f} ms budget")
+        if eager:
+            failures.append(f"{command}: imported {', '.join(eager)} at startup")
+
+    if failures:
+        print("\nStartup budget exceeded:")
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
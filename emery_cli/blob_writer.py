@@ -0,0 +1,82 @@
+"""Background git blob writing for uploads.
+
+Copying and committing used to run one after the other: every file was
+copied, and only then read again to write its git blob. A BlobWriter
+receives each file as soon as it is stored and writes its blob on a
+background thread, so git object writing overlaps with the copies of
+later files (while the copy is still in the page cache). The commit then
+reuses those blobs instead of reading the files again.
+
+The queue between the copy workers and the writer is bounded: when the
+writer falls behind, copy workers wait, so memory use does not grow with
+the size of the upload.
+"""
+
+import os
+import queue
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, List, Optional
+
+if TYPE_CHECKING:
+    from emery_cli.git_handler import GitHandler
+
+# Stored files waiting for their blob before copy workers are held back
+DEFAULT_MAX_PENDING = 1024
+
+# Put on the queue by close() to stop the writer thread
+_DONE = None
+
+
+class BlobWriter:
+    """Write the git blobs of stored files while the upload is still copying."""
+
+    def __init__(self, git_handler: "GitHandler", max_pending: int = DEFAULT_MAX_PENDING):
+        """Start the writer thread.
+
+        Args:
+            git_handler: Handler whose object database receives the blobs
+            max_pending: Files queued before submit() blocks
+        """
+        self.git_handler = git_handler
+        self.written = 0
+        # (path, error) of files whose blob could not be written; the
+        # commit writes them again and reports what still fails
+        self.errors: List[tuple[Path, Exception]] = []
+        self._queue: "queue.Queue[Optional[Path]]" = queue.Queue(maxsize=max(1, max_pending))
+        self._thread = threading.Thread(target=self._run, name="emery-blob-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, path: Path) -> None:
+        """Queue a stored file, waiting while the queue is full.
+
+        Safe to call from several copy workers at once.
+        """
+        self._queue.put(path)
+
+    def _run(self) -> None:
+        while True:
+            path = self._queue.get()
+            if path is _DONE:
+                return
+            try:
+                # Remember the file as it was before reading it; the commit
+                # writes the blob again if the file changed since
+                stat = os.stat(path)
+                rel_path, binsha, mode = self.git_handler.write_blob(path)
+            except Exception as e:
+                self.errors.append((path, e))
+                continue
+            self.git_handler.add_prewritten(rel_path, binsha, mode, stat.st_size, stat.st_mtime_ns)
+            self.written += 1
+
+    def close(self) -> None:
+        """Wait until every queued file has its blob, then stop the thread."""
+        self._queue.put(_DONE)
+        self._thread.join()
+
+    def __enter__(self) -> "BlobWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
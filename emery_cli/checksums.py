@@ -0,0 +1,128 @@
+"""Checksum manifest of uploaded files for Emery CLI."""
+
+import json
+import os
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional
+
+from emery_cli.hashing import DEFAULT_ALGORITHM, check_algorithm, hash_files
+
+
+class VerifyResult(NamedTuple):
+    """Outcome of re-checking stored files against their checksums."""
+
+    verified: int
+    mismatched: List[Path]
+    missing: List[Path]
+
+    @property
+    def ok(self) -> bool:
+        """True if every stored file matched its checksum."""
+        return not self.mismatched and not self.missing
+
+
+class ChecksumManifest:
+    """Record the content digest of every file stored under FILES_DIR.
+
+    Digests are stored as "algorithm:hexdigest", so files hashed with
+    different algorithms can share one manifest.
+    """
+
+    def __init__(self, manifest_path: Path, files_dir: Path, algorithm: str = DEFAULT_ALGORITHM):
+        """Initialize checksum manifest.
+
+        Args:
+            manifest_path: JSON file holding the checksums
+            files_dir: Directory stored paths are relative to
+            algorithm: Algorithm used for newly recorded files
+        """
+        self.manifest_path = manifest_path
+        self.files_dir = files_dir
+        self.algorithm = check_algorithm(algorithm)
+        self._entries: Dict[str, str] = {}
+        self._dirty = False
+        self.load()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def load(self) -> None:
+        """Load the manifest from disk, starting empty if it is missing or corrupt."""
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                self._entries = json.load(f)
+        except (OSError, ValueError):
+            self._entries = {}
+
+    def _rel_path(self, stored_path: Path) -> Optional[str]:
+        try:
+            return stored_path.relative_to(self.files_dir).as_posix()
+        except ValueError:
+            return None
+
+    def record(self, stored_path: Path, digest: str) -> None:
+        """Remember the digest of a stored file, hashed with self.algorithm.
+
+        Paths outside files_dir are not recorded.
+
+        Args:
+            stored_path: Path of the stored file under files_dir
+            digest: Hex digest of its content
+        """
+        rel_path = self._rel_path(stored_path)
+        if rel_path is not None:
+            self._entries[rel_path] = f"{self.algorithm}:{digest}"
+            self._dirty = True
+
+    def remove(self, stored_path: Path) -> None:
+        """Forget a stored file that was deleted.
+
+        Args:
+            stored_path: Path of the stored file under files_dir
+        """
+        rel_path = self._rel_path(stored_path)
+        if self._entries.pop(rel_path, None) is not None:
+            self._dirty = True
+
+    def save(self) -> None:
+        """Write the manifest to disk atomically if it changed."""
+        if not self._dirty:
+            return
+
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.manifest_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._entries, f, indent=0, sort_keys=True)
+        os.replace(tmp_path, self.manifest_path)
+        self._dirty = False
+
+    def verify(self, jobs: int = 1) -> VerifyResult:
+        """Re-hash every stored file and compare it with its recorded digest.
+
+        Args:
+            jobs: Number of worker processes hashing files
+
+        Returns:
+            Counts of verified files and the paths that failed
+        """
+        by_algorithm = defaultdict(list)
+        for rel_path, value in self._entries.items():
+            algorithm, _, digest = value.partition(":")
+            by_algorithm[algorithm].append((self.files_dir / rel_path, digest))
+
+        verified = 0
+        mismatched = []
+        missing = []
+        for algorithm, expected in by_algorithm.items():
+            digests = hash_files([path for path, _ in expected], algorithm, jobs)
+            for path, digest in expected:
+                actual = digests[path]
+                if actual is None:
+                    missing.append(path)
+                elif actual != digest:
+                    mismatched.append(path)
+                else:
+                    verified += 1
+
+        return VerifyResult(verified, sorted(mismatched), sorted(missing))
@@ -0,0 +1,263 @@
+"""Chunked storage of large files for Emery CLI.
+
+Files over the size limit are split into chunks stored by content digest
+under a chunk store, so identical chunks are only stored once. A small
+JSON manifest (<name>.chunks.json) takes the file's place and lists its
+chunks in order; `emery restore` stitches them back together.
+"""
+
+import hashlib
+import json
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import BinaryIO, Iterator, List, Optional
+
+from emery_cli.hashing import DEFAULT_ALGORITHM
+
+CHUNK_FIXED = "fixed"
+CHUNK_CDC = "cdc"
+CHUNK_MODES = (CHUNK_CDC, CHUNK_FIXED)
+
+# Suffix of the manifest stored in place of a chunked file
+CHUNK_MANIFEST_SUFFIX = ".chunks.json"
+
+# Default average chunk size
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+# Bytes read from the source at a time
+READ_SIZE = 8 * 1024 * 1024
+
+# Content-defined boundaries look at one bit per byte: each byte value maps
+# to "0" or "1" (half of the values each), and a chunk ends where the bits
+# of the last few dozen bytes spell out a fixed anchor pattern. Both steps
+# run in C (bytes.translate and bytes.find), so chunking keeps up with disk
+# speed, and the anchor holds as many zeros as ones so skewed byte
+# distributions (text) still hit it about as often as random data does.
+_RANKED = sorted(range(256), key=lambda i: hashlib.sha256(bytes([i])).digest())
+_BIT_TABLE = bytes(ord("1") if _RANKED.index(i) < 128 else ord("0") for i in range(256))
+
+
+@lru_cache(maxsize=None)
+def _anchor(bits: int) -> bytes:
+    seed = hashlib.sha256(f"emery-anchor-{bits}".encode()).digest()
+    pattern = [int(b) for b in bin(int.from_bytes(seed, "big"))[2:].zfill(256)][:bits]
+    # Balance zeros and ones by flipping surplus bits
+    surplus = pattern.count(1) - bits // 2
+    for i, bit in enumerate(pattern):
+        if surplus == 0:
+            break
+        if surplus > 0 and bit == 1:
+            pattern[i] = 0
+            surplus -= 1
+        elif surplus < 0 and bit == 0:
+            pattern[i] = 1
+            surplus += 1
+    return bytes(ord("1") if bit else ord("0") for bit in pattern)
+
+
+def check_mode(mode: str) -> str:
+    """Make sure a chunking mode is known.
+
+    Args:
+        mode: One of CHUNK_MODES
+
+    Returns:
+        The mode
+
+    Raises:
+        ValueError: If the mode is unknown
+    """
+    if mode not in CHUNK_MODES:
+        raise ValueError(f"Unknown chunking mode: {mode} (choose from {', '.join(CHUNK_MODES)})")
+    return mode
+
+
+def _find_cut(data: memoryview, avg_size: int) -> int:
+    """Find the end of the next content-defined chunk.
+
+    Chunks are at least a quarter and at most four times the average size.
+    Between the two, the chunk ends right after the first anchor match.
+    """
+    min_size = avg_size // 4
+    max_size = avg_size * 4
+    length = len(data)
+    if length <= min_size:
+        return length
+
+    end = min(length, max_size)
+    # Matches past the minimum occur about every 2**bits bytes
+    anchor = _anchor(max(8, (avg_size - min_size).bit_length() - 1))
+    start = max(0, min_size - len(anchor))
+    # Most chunks end well before the maximum, so search a short window first
+    for window_end in (min(end, avg_size * 2), end):
+        found = bytes(data[start:window_end]).translate(_BIT_TABLE).find(anchor)
+        if found >= 0:
+            return start + found + len(anchor)
+        start = max(start, window_end - len(anchor) + 1)
+    return end
+
+
+def iter_chunks(f: BinaryIO, mode: str = CHUNK_CDC, avg_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bytes]:
+    """Split a stream into chunks.
+
+    Args:
+        f: Binary stream to read
+        mode: CHUNK_CDC for content-defined chunks, CHUNK_FIXED for fixed-size ones
+        avg_size: Average (CDC) or exact (fixed) chunk size in bytes
+
+    Yields:
+        Chunk contents, in order
+    """
+    if mode == CHUNK_FIXED:
+        while True:
+            chunk = f.read(avg_size)
+            if not chunk:
+                return
+            yield chunk
+
+    buffer = bytearray()
+    eof = False
+    while buffer or not eof:
+        # Keep at least one maximum-size chunk buffered so every cut sees enough data
+        while not eof and len(buffer) < avg_size * 4:
+            data = f.read(READ_SIZE)
+            if not data:
+                eof = True
+            buffer += data
+        if not buffer:
+            return
+        with memoryview(buffer) as view:
+            cut = _find_cut(view, avg_size)
+            chunk = bytes(view[:cut])
+        del buffer[:cut]
+        yield chunk
+
+
+class ChunkStore:
+    """Content-addressed directory of chunks, sharded by digest prefix."""
+
+    def __init__(self, store_dir: Path, algorithm: str = DEFAULT_ALGORITHM):
+        """Initialize chunk store.
+
+        Args:
+            store_dir: Directory holding the chunks
+            algorithm: Digest algorithm naming the chunks
+        """
+        self.store_dir = store_dir
+        self.algorithm = algorithm
+
+    def path_for(self, digest: str) -> Path:
+        """Path where the chunk with this digest is stored."""
+        return self.store_dir / digest[:2] / digest[2:]
+
+    def put(self, data: bytes) -> tuple[str, Optional[Path]]:
+        """Store a chunk unless an identical one is already stored.
+
+        Args:
+            data: Chunk contents
+
+        Returns:
+            Tuple of (digest, path); path is None if the chunk was already stored
+        """
+        digest = hashlib.new(self.algorithm, data).hexdigest()
+        path = self.path_for(digest)
+        if path.exists():
+            return digest, None
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.emery-tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        return digest, path
+
+
+def store_chunked(
+    source_path: Path,
+    manifest_path: Path,
+    store_dir: Path,
+    mode: str = CHUNK_CDC,
+    avg_size: int = DEFAULT_CHUNK_SIZE,
+) -> List[Path]:
+    """Split a file into the chunk store and write its manifest.
+
+    Runs in worker processes, so it only takes picklable arguments.
+
+    Args:
+        source_path: File to store
+        manifest_path: Where the chunk manifest is written
+        store_dir: Chunk store directory
+        mode: Chunking mode
+        avg_size: Average chunk size in bytes
+
+    Returns:
+        Paths of newly stored chunks followed by the manifest path
+    """
+    store = ChunkStore(store_dir)
+    chunks = []
+    new_paths = []
+    with open(source_path, "rb") as f:
+        stat = os.fstat(f.fileno())
+        for data in iter_chunks(f, mode, avg_size):
+            digest, path = store.put(data)
+            chunks.append([digest, len(data)])
+            if path is not None:
+                new_paths.append(path)
+
+    manifest = {
+        "name": source_path.name,
+        "size": stat.st_size,
+        "mtime": stat.st_mtime,
+        "algorithm": store.algorithm,
+        "chunking": mode,
+        "store": os.path.relpath(store_dir, manifest_path.parent),
+        "chunks": chunks,
+    }
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = manifest_path.with_name(f".{manifest_path.name}.emery-tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    os.replace(tmp_path, manifest_path)
+    return new_paths + [manifest_path]
+
+
+def restore_chunked(manifest_path: Path, output_path: Path) -> int:
+    """Reassemble a chunked file by streaming its chunks in order.
+
+    Each chunk is checked against its digest. The output is written under
+    a temporary name and renamed into place once complete.
+
+    Args:
+        manifest_path: Chunk manifest of the file
+        output_path: Where the restored file is written
+
+    Returns:
+        Size of the restored file in bytes
+
+    Raises:
+        ValueError: If a chunk is corrupted
+        OSError: If a chunk is missing
+    """
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    store = ChunkStore((manifest_path.parent / manifest["store"]).resolve(), manifest["algorithm"])
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output_path.with_name(f".{output_path.name}.emery-tmp")
+    size = 0
+    try:
+        with open(tmp_path, "wb") as dst:
+            for digest, length in manifest["chunks"]:
+                with open(store.path_for(digest), "rb") as src:
+                    data = src.read()
+                if len(data) != length or hashlib.new(store.algorithm, data).hexdigest() != digest:
+                    raise ValueError(f"Chunk {digest[:12]} is corrupted")
+                dst.write(data)
+                size += length
+        os.utime(tmp_path, (manifest["mtime"], manifest["mtime"]))
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return size
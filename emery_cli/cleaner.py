@@ -0,0 +1,120 @@
+"""Fast removal of uploaded files for `emery clean`.
+
+Directories are first renamed into a trash directory, which is atomic and
+instant, so the upload directory is empty as soon as `emery clean`
+returns. The trash is then deleted in parallel, usually by a detached
+background process:
+
+    python -m emery_cli.cleaner [--jobs N] TRASH_DIR
+"""
+
+import argparse
+import os
+import time
+from pathlib import Path
+from typing import List, Optional
+
+
+def move_aside(path: Path, trash_dir: Path) -> Optional[Path]:
+    """Atomically move a directory or file into the trash.
+
+    Args:
+        path: Directory or file to remove
+        trash_dir: Trash directory, on the same filesystem as path
+
+    Returns:
+        New location of the moved path, or None if path did not exist
+
+    Raises:
+        OSError: If the path cannot be renamed (for example across filesystems)
+    """
+    if not os.path.lexists(path):
+        return None
+    trash_dir.mkdir(parents=True, exist_ok=True)
+    target = trash_dir / f"{path.name}-{time.time_ns()}"
+    try:
+        os.rename(path, target)
+    except FileNotFoundError:
+        return None
+    return target
+
+
+def _clear_dir(path: str) -> List[str]:
+    """Delete the files of one directory.
+
+    Returns:
+        Paths of its subdirectories, still to be cleared
+    """
+    subdirs = []
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                    else:
+                        os.unlink(entry.path)
+                except FileNotFoundError:
+                    continue
+    except FileNotFoundError:
+        pass
+    return subdirs
+
+
+def delete_tree(path: Path, jobs: int = 4) -> None:
+    """Delete a directory tree, clearing up to `jobs` directories at once.
+
+    Unlike shutil.rmtree, files of different directories are unlinked in
+    parallel; the emptied directories are then removed deepest first.
+
+    Args:
+        path: Directory (or file) to delete
+        jobs: Number of directories cleared in parallel
+    """
+    if not path.is_dir() or path.is_symlink():
+        path.unlink(missing_ok=True)
+        return
+
+    from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+    directories = [str(path)]
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        pending = {pool.submit(_clear_dir, str(path))}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                for subdir in future.result():
+                    directories.append(subdir)
+                    pending.add(pool.submit(_clear_dir, subdir))
+
+    # Children have longer paths than their parents
+    for directory in sorted(directories, key=len, reverse=True):
+        try:
+            os.rmdir(directory)
+        except FileNotFoundError:
+            pass
+
+
+def empty_trash(trash_dir: Path, jobs: int = 4) -> None:
+    """Delete everything in the trash directory, then the directory itself."""
+    if not trash_dir.is_dir():
+        return
+    for entry in os.scandir(trash_dir):
+        delete_tree(Path(entry.path), jobs)
+    try:
+        trash_dir.rmdir()
+    except OSError:
+        # Something new was moved in meanwhile; the next clean removes it
+        pass
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Delete the contents of an emery trash directory.")
+    parser.add_argument("--jobs", type=int, default=4, help="Directories cleared in parallel")
+    parser.add_argument("trash_dir", type=Path)
+    args = parser.parse_args()
+    empty_trash(args.trash_dir, args.jobs)
+
+
+if __name__ == "__main__":
+    main()
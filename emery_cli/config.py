@@ -6,6 +6,12 @@ from pathlib import Path
 # Max file size in MB
 MAX_FILE_SIZE_MB = 100
 
+# Number of files copied concurrently
+COPY_JOBS = int(os.getenv("EMERY_JOBS", "4"))
+
+# Size of the reusable buffer for streaming copies, in bytes
+COPY_BUFFER_SIZE = int(os.getenv("EMERY_BUFFER_SIZE", str(1024 * 1024)))
+
 # Target branch for uploads
 TARGET_BRANCH = "files"
 
@@ -15,6 +21,63 @@ REPO_ROOT = Path(__file__).parent.parent
 # Files upload directory
 FILES_DIR = REPO_ROOT / "files"
 
+# Local state (indexes, caches) kept next to the files directory
+STATE_DIR = REPO_ROOT / ".emery"
+
+# Content digest -> stored file index used by --dedup
+DEDUP_INDEX_PATH = STATE_DIR / "dedup.json"
+
+# Checksums of stored files, recorded by --hash and checked by `emery verify`
+CHECKSUMS_PATH = STATE_DIR / "checksums.json"
+
+# Hash algorithm for upload checksums (e.g. sha256, blake2b); unset disables them
+HASH_ALGORITHM = os.getenv("EMERY_HASH") or None
+
+# Folder files smaller than this are stored in packs by --pack, in KB
+PACK_THRESHOLD_KB = int(os.getenv("EMERY_PACK_THRESHOLD_KB", "64"))
+
+# Content-addressed chunks of large files uploaded with --chunk
+CHUNK_STORE_DIR = FILES_DIR / ".chunks"
+
+# Average chunk size for --chunk, in KB
+CHUNK_SIZE_KB = int(os.getenv("EMERY_CHUNK_SIZE_KB", "1024"))
+
+# Uploads spooled for a single committer (upload --spool), and whether uploads spool by default
+SPOOL_DIR = STATE_DIR / "spool"
+SPOOL = os.getenv("EMERY_SPOOL", "").lower() in ("1", "true", "yes")
+
+# How name collisions of uploaded files are resolved: "counter" (name_1, name_2),
+# "hash", "timestamp" or "subdir" (one subdirectory per upload)
+NAMING_STRATEGY = os.getenv("EMERY_NAMING", "counter")
+
+# Per-name collision counters of the counter naming strategy, kept between uploads
+NAMING_COUNTERS_PATH = STATE_DIR / "naming.json"
+
+# File counts per folder and recent uploads, shown by `emery info`
+SUMMARY_PATH = STATE_DIR / "summary.json"
+
+# Removed directories wait here until `emery clean` has deleted them
+TRASH_DIR = STATE_DIR / "trash"
+
+# Per-folder manifests used for incremental re-uploads
+MANIFEST_CACHE_DIR = STATE_DIR / "manifests"
+
+# Write-ahead journal of the current upload, replayed by --resume
+JOURNAL_PATH = STATE_DIR / "journal.jsonl"
+
+# How uploads are pushed: "now", "defer" (until `emery push`) or "background"
+PUSH_STRATEGY = os.getenv("EMERY_PUSH", "now")
+
+# Branches with commits waiting for `emery push`
+PUSH_QUEUE_PATH = STATE_DIR / "push_queue.json"
+
+# Paths of a --from-file/--stdin list copied and committed together
+LIST_BATCH_FILES = int(os.getenv("EMERY_LIST_BATCH_FILES", "5000"))
+
+# Per-phase upload metrics are written here when set: Prometheus text format
+# for files ending in .prom, JSON lines otherwise
+METRICS_FILE = os.getenv("EMERY_METRICS_FILE") or None
+
 # Git config
 GIT_AUTHOR_NAME = os.getenv("GIT_AUTHOR_NAME", "Emery CLI")
 GIT_AUTHOR_EMAIL = os.getenv("GIT_AUTHOR_EMAIL", "cli@emery.local")
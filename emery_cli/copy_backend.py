@@ -0,0 +1,232 @@
+"""Fast file copy primitives for Emery CLI."""
+
+import errno
+import hashlib
+import os
+import shutil
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+# ioctl request number for FICLONE (reflink) on Linux
+FICLONE = 0x40049409
+
+STRATEGY_HARDLINK = "hardlink"
+STRATEGY_REFLINK = "reflink"
+STRATEGY_COPY_FILE_RANGE = "copy_file_range"
+STRATEGY_SENDFILE = "sendfile"
+STRATEGY_COPY = "copy"
+
+# Suffix of in-progress copies; they are renamed into place once complete
+TEMP_SUFFIX = ".emery-tmp"
+
+# Default size of the reusable buffer for streaming copies
+DEFAULT_BUFFER_SIZE = 1024 * 1024
+
+# Bytes moved per kernel copy call, so progress is reported for large files
+KERNEL_CHUNK_SIZE = 8 * 1024 * 1024
+
+# Called with (bytes_copied, files_copied) increments, possibly from worker threads
+ProgressCallback = Callable[[int, int], None]
+
+# Errors that mean a primitive is unsupported here, rather than a real I/O failure
+_UNSUPPORTED_ERRNOS = {
+    errno.EXDEV,
+    errno.ENOSYS,
+    errno.EINVAL,
+    errno.EOPNOTSUPP,
+    errno.ENOTTY,
+    errno.EBADF,
+    errno.EPERM,
+}
+
+
+class CopyBackend:
+    """Copy files with the fastest primitive the filesystem supports.
+
+    Strategies are tried fastest first: hardlink (only when allowed),
+    FICLONE reflink, os.copy_file_range, os.sendfile, and finally a
+    streaming copy through a fixed, per-thread buffer. Once a strategy is
+    found to be unsupported between two devices it is not tried again for
+    that device pair.
+
+    With a hash algorithm set, streamed files are hashed as they are
+    copied; hardlinks and reflinks move no data and are left for the
+    caller to hash.
+    """
+
+    def __init__(
+        self,
+        allow_hardlink: bool = False,
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+        progress_callback: Optional[ProgressCallback] = None,
+        hash_algorithm: Optional[str] = None,
+    ):
+        """Initialize copy backend.
+
+        Args:
+            allow_hardlink: Hardlink instead of copying when possible
+            buffer_size: Size of the reusable buffer for streaming copies
+            progress_callback: Receives (bytes, files) increments as data is copied
+            hash_algorithm: Hash data while streaming it, so it is read only once
+        """
+        self.allow_hardlink = allow_hardlink
+        self.buffer_size = buffer_size
+        self.progress_callback = progress_callback
+        self.hash_algorithm = hash_algorithm
+        # Destination path -> digest of files hashed while they were copied
+        self.digests: Dict[Path, str] = {}
+        self.strategy_counts: Counter = Counter()
+        self._unsupported: Dict[tuple, set] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _strategies(self) -> List[str]:
+        strategies = []
+        if self.allow_hardlink:
+            strategies.append(STRATEGY_HARDLINK)
+        if fcntl is not None:
+            strategies.append(STRATEGY_REFLINK)
+        if self.hash_algorithm is not None:
+            # Kernel copies never pass the data through user space, so hashing
+            # would need a second read; stream (and hash) the data instead
+            return strategies
+        if hasattr(os, "copy_file_range"):
+            strategies.append(STRATEGY_COPY_FILE_RANGE)
+        if hasattr(os, "sendfile"):
+            strategies.append(STRATEGY_SENDFILE)
+        return strategies
+
+    def copy(self, source_path: Path, dest_path: Path) -> str:
+        """Copy a file atomically, preserving metadata like shutil.copy2.
+
+        Data is written to a temporary file next to the destination and
+        renamed into place, so an interrupted copy never leaves a partial
+        file under the destination name.
+
+        Args:
+            source_path: Source file path
+            dest_path: Destination file path (overwritten if present)
+
+        Returns:
+            Name of the strategy that performed the copy
+        """
+        tmp_path = dest_path.with_name(f".{dest_path.name}.{os.getpid()}-{threading.get_ident()}{TEMP_SUFFIX}")
+        try:
+            strategy, digest = self._copy_to(source_path, tmp_path)
+            os.replace(tmp_path, dest_path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        if digest is not None:
+            with self._lock:
+                self.digests[dest_path] = digest
+        self._record(strategy)
+        return strategy
+
+    def _copy_to(self, source_path: Path, dest_path: Path) -> tuple[str, Optional[str]]:
+        src_dev = os.stat(source_path).st_dev
+        dst_dev = os.stat(dest_path.parent).st_dev
+        unsupported = self._unsupported.setdefault((src_dev, dst_dev), set())
+
+        for strategy in self._strategies():
+            if strategy in unsupported:
+                continue
+            try:
+                self._run(strategy, source_path, dest_path)
+            except OSError as e:
+                if e.errno not in _UNSUPPORTED_ERRNOS:
+                    raise
+                unsupported.add(strategy)
+                continue
+            if strategy != STRATEGY_HARDLINK:
+                shutil.copystat(source_path, dest_path)
+            return strategy, None
+
+        hasher = hashlib.new(self.hash_algorithm) if self.hash_algorithm is not None else None
+        self._stream_copy(source_path, dest_path, hasher)
+        shutil.copystat(source_path, dest_path)
+        return STRATEGY_COPY, hasher.hexdigest() if hasher is not None else None
+
+    def _record(self, strategy: str) -> None:
+        with self._lock:
+            self.strategy_counts[strategy] += 1
+        self.report(0, 1)
+
+    def report(self, bytes_copied: int, files_copied: int = 0) -> None:
+        """Forward a progress increment to the progress callback, if any.
+
+        Args:
+            bytes_copied: Bytes copied (or skipped) since the last report
+            files_copied: Files finished since the last report
+        """
+        if self.progress_callback is not None:
+            self.progress_callback(bytes_copied, files_copied)
+
+    def _buffer(self) -> bytearray:
+        """Get this thread's copy buffer, allocating it on first use."""
+        buffer = getattr(self._local, "buffer", None)
+        if buffer is None or len(buffer) != self.buffer_size:
+            buffer = bytearray(self.buffer_size)
+            self._local.buffer = buffer
+        return buffer
+
+    def _stream_copy(self, source_path: Path, dest_path: Path, hasher=None) -> None:
+        """Copy file contents through a reused buffer without per-chunk allocations."""
+        buffer = self._buffer()
+        view = memoryview(buffer)
+        with open(source_path, "rb", buffering=0) as src, open(dest_path, "wb", buffering=0) as dst:
+            while True:
+                read = src.readinto(buffer)
+                if not read:
+                    break
+                written = 0
+                if hasher is not None:
+                    hasher.update(view[:read])
+                while written < read:
+                    written += dst.write(view[written:read])
+                self.report(read)
+
+    def summary(self) -> str:
+        """Describe which strategies were used, most common first.
+
+        Returns:
+            Summary such as "reflink (120 files), copy (2 files)"
+        """
+        return ", ".join(f"{name} ({count} files)" for name, count in self.strategy_counts.most_common())
+
+    def _run(self, strategy: str, source_path: Path, dest_path: Path) -> None:
+        if strategy == STRATEGY_HARDLINK:
+            os.link(source_path, dest_path)
+            self.report(dest_path.stat().st_size)
+            return
+
+        with open(source_path, "rb") as src, open(dest_path, "wb") as dst:
+            if strategy == STRATEGY_REFLINK:
+                fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+                self.report(os.fstat(src.fileno()).st_size)
+            else:
+                self._copy_range(strategy, src.fileno(), dst.fileno(), os.fstat(src.fileno()).st_size)
+
+    def _copy_range(self, strategy: str, src_fd: int, dst_fd: int, size: int) -> None:
+        offset = 0
+        while offset < size:
+            count = min(size - offset, KERNEL_CHUNK_SIZE)
+            if strategy == STRATEGY_COPY_FILE_RANGE:
+                sent = os.copy_file_range(src_fd, dst_fd, count, offset, offset)
+            else:
+                sent = os.sendfile(dst_fd, src_fd, offset, count)
+            if sent == 0:
+                break
+            offset += sent
+            self.report(sent)
+        if offset < size:
+            # Source shrank or the primitive stopped early; let the next strategy retry
+            raise OSError(errno.EINVAL, "short copy")
+
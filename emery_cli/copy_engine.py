@@ -0,0 +1,80 @@
+"""Parallel copy engine for Emery CLI."""
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, List, Optional, Sequence, TypeVar
+
+from emery_cli.copy_backend import CopyBackend
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class CopyEngine:
+    """Copy many files using a pool of worker threads."""
+
+    def __init__(self, jobs: int = 1, backend: Optional[CopyBackend] = None):
+        """Initialize copy engine.
+
+        Args:
+            jobs: Number of files copied concurrently
+            backend: Copy backend used for each file
+        """
+        self.jobs = max(1, jobs)
+        self.backend = backend or CopyBackend()
+
+    def map(self, func: Callable[[T], R], items: Sequence[T]) -> List[R]:
+        """Apply a function to each item on the copy worker threads.
+
+        Args:
+            func: Function called once per item
+            items: Items to process
+
+        Returns:
+            Results in input order
+        """
+        if self.jobs == 1 or len(items) < 2:
+            return [func(item) for item in items]
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            return list(pool.map(func, items))
+
+    def _copy_one(
+        self, source_path: Path, dest_path: Path, on_copied: Optional[Callable[[Path], None]] = None
+    ) -> Optional[str]:
+        try:
+            self.backend.copy(source_path, dest_path)
+        except Exception as e:
+            return f"{source_path.name}: {e}"
+        if on_copied is not None:
+            on_copied(dest_path)
+        return None
+
+    def copy_pairs(
+        self, pairs: Sequence[tuple[Path, Path]], on_copied: Optional[Callable[[Path], None]] = None
+    ) -> tuple[List[Path], List[str]]:
+        """Copy each source file to its destination path.
+
+        Parent directories are created up front, once each, before any
+        worker starts copying.
+
+        Args:
+            pairs: Sequence of (source_path, dest_path) tuples
+            on_copied: Called by the worker with each destination as soon as it is copied
+
+        Returns:
+            Tuple of (copied_dest_paths, error_messages), in input order
+        """
+        for parent in sorted({dest.parent for _, dest in pairs}):
+            parent.mkdir(parents=True, exist_ok=True)
+
+        results = self.map(lambda pair: self._copy_one(*pair, on_copied), pairs)
+
+        copied = []
+        errors = []
+        for (_, dest), error in zip(pairs, results):
+            if error is None:
+                copied.append(dest)
+            else:
+                errors.append(error)
+
+        return copied, errors
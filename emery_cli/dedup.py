@@ -0,0 +1,141 @@
+"""Content-addressed deduplication index for Emery CLI."""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, Optional
+
+from emery_cli.hashing import hash_file
+
+
+class DedupIndex:
+    """Map content digests to files already stored under FILES_DIR."""
+
+    def __init__(self, index_path: Path, files_dir: Path):
+        """Initialize dedup index.
+
+        Args:
+            index_path: JSON file holding the digest index
+            files_dir: Directory stored paths are relative to
+        """
+        self.index_path = index_path
+        self.files_dir = files_dir
+        # Digest -> [rel_path, size, mtime_ns, inode] of the stored file when it was last verified
+        self._entries: Dict[str, list] = {}
+        # rel_path -> digest, to forget paths that are rewritten
+        self._digests: Dict[str, str] = {}
+        self._dirty = False
+        self.load()
+
+    def load(self) -> None:
+        """Load the index from disk, starting empty if it is missing or corrupt."""
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            entries = {}
+        # Older indexes stored only the path, or the path and size; their
+        # files are hashed once on their next hit
+        self._entries = {}
+        for digest, entry in entries.items():
+            entry = [entry] if isinstance(entry, str) else list(entry)
+            self._entries[digest] = entry + [None] * (4 - len(entry))
+        self._digests = {entry[0]: digest for digest, entry in self._entries.items()}
+
+    def _rel_path(self, stored_path: Path) -> Optional[str]:
+        try:
+            return stored_path.relative_to(self.files_dir).as_posix()
+        except ValueError:
+            return None
+
+    def _drop(self, digest: str) -> None:
+        rel_path = self._entries.pop(digest)[0]
+        if self._digests.get(rel_path) == digest:
+            del self._digests[rel_path]
+        self._dirty = True
+
+    @staticmethod
+    def _signature(stat: os.stat_result) -> list:
+        return [stat.st_size, stat.st_mtime_ns, stat.st_ino]
+
+    def lookup(self, digest: str) -> Optional[Path]:
+        """Find the stored file holding the given content.
+
+        A stored file whose size, mtime and inode are unchanged since it was
+        recorded is trusted as is. Otherwise it is hashed again, so a file
+        that was overwritten or edited is never mistaken for the content.
+        Entries that no longer match are dropped.
+
+        Args:
+            digest: Content digest
+
+        Returns:
+            Path of the stored file, or None if the content is new
+        """
+        entry = self._entries.get(digest)
+        if entry is None:
+            return None
+
+        rel_path, size = entry[0], entry[1]
+        stored_path = self.files_dir / rel_path
+        try:
+            stat = stored_path.stat()
+            signature = self._signature(stat)
+            if entry[1:] == signature:
+                return stored_path
+            matches = (
+                stored_path.is_file()
+                and (size is None or stat.st_size == size)
+                and hash_file(stored_path) == digest
+            )
+        except OSError:
+            matches = False
+        if not matches:
+            self._drop(digest)
+            return None
+        # Same content under a new mtime or inode (e.g. touched or restored)
+        self._entries[digest] = [rel_path] + signature
+        self._dirty = True
+        return stored_path
+
+    def forget(self, stored_path: Path) -> None:
+        """Drop the entry of a stored path that is being rewritten or deleted."""
+        rel_path = self._rel_path(stored_path)
+        digest = self._digests.get(rel_path) if rel_path is not None else None
+        if digest is not None and self._entries.get(digest, [None])[0] == rel_path:
+            self._drop(digest)
+
+    def record(self, digest: str, stored_path: Path) -> None:
+        """Remember that stored_path holds the content with this digest.
+
+        Paths outside files_dir are not recorded.
+
+        Args:
+            digest: Content digest
+            stored_path: Path of the stored file under files_dir
+        """
+        rel_path = self._rel_path(stored_path)
+        if rel_path is None:
+            return
+        self.forget(stored_path)
+        if digest in self._entries:
+            self._drop(digest)
+        try:
+            stat = stored_path.stat()
+        except OSError:
+            return
+        self._entries[digest] = [rel_path] + self._signature(stat)
+        self._digests[rel_path] = digest
+        self._dirty = True
+
+    def save(self) -> None:
+        """Write the index to disk atomically if it changed."""
+        if not self._dirty:
+            return
+
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._entries, f)
+        os.replace(tmp_path, self.index_path)
+        self._dirty = False
@@ -1,25 +1,116 @@
 """File operations for Emery CLI."""
 
-import shutil
+import os
+from functools import partial
 from pathlib import Path
-from typing import Optional, List
+from typing import Callable, Iterable, Optional, List
 from rich.console import Console
-from rich.table import Table
 from datetime import datetime
 
+from emery_cli.copy_backend import DEFAULT_BUFFER_SIZE, TEMP_SUFFIX, CopyBackend
+from emery_cli.copy_engine import CopyEngine
+from emery_cli.dedup import DedupIndex
+from emery_cli.checksums import ChecksumManifest
+from emery_cli.chunker import CHUNK_MANIFEST_SUFFIX, DEFAULT_CHUNK_SIZE, store_chunked
+from emery_cli.hashing import DEFAULT_ALGORITHM, hash_file, hash_files
+from emery_cli.ignore import FileFilter
+from emery_cli.manifest_cache import CachedEntries, ManifestCache
+from emery_cli.metrics import metrics
+from emery_cli.naming import NAMING_COUNTER, DestinationNamer
+from emery_cli.packer import INDEX_SUFFIX, PackWriter, drop_members
+from emery_cli.scanner import Manifest, ManifestEntry, iter_directory, scan_directory
+from emery_cli.summary import StorageSummary
+
 console = Console()
 
 class FileHandler:
     """Handle file operations for uploads."""
 
-    def __init__(self, max_size_mb: int = 100):
+    def __init__(
+        self,
+        max_size_mb: int = 100,
+        jobs: int = 1,
+        allow_hardlink: bool = False,
+        dedup_index: Optional[DedupIndex] = None,
+        manifest_cache: Optional[ManifestCache] = None,
+        delete_missing: bool = False,
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+        checksums: Optional[ChecksumManifest] = None,
+        pack_format: Optional[str] = None,
+        pack_threshold: int = 0,
+        chunk_mode: Optional[str] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        chunk_store_dir: Optional[Path] = None,
+        naming: str = NAMING_COUNTER,
+        naming_counters: Optional[Path] = None,
+        summary: Optional[StorageSummary] = None,
+        file_filter: Optional[FileFilter] = None,
+    ):
         """Initialize file handler.
         
         Args:
             max_size_mb: Maximum file size in MB
+            jobs: Number of files copied concurrently
+            allow_hardlink: Hardlink uploads instead of copying when possible
+            dedup_index: Content index; when set, already-stored content is not copied again
+            manifest_cache: Folder manifests; when set, re-uploads only copy changed files
+            delete_missing: Remove uploaded files whose source was deleted since the last upload
+            buffer_size: Size of the reusable buffer for streaming copies
+            checksums: Checksum manifest; when set, every stored file's digest is recorded
+            pack_format: Pack format (see packer.PACK_EXTENSIONS); when set, small folder files are packed
+            pack_threshold: Folder files smaller than this many bytes are packed
+            chunk_mode: Chunking mode (see chunker.CHUNK_MODES); when set, files over
+                the size limit are stored as deduplicated chunks instead of being rejected
+            chunk_size: Average chunk size in bytes
+            chunk_store_dir: Directory holding the chunks
+            naming: How name collisions of uploaded files are resolved (see naming.NAMING_STRATEGIES)
+            naming_counters: File keeping the naming counters between uploads
+            summary: Summary index of the upload directory; when set, it is kept up to date
+            file_filter: Ignore rules and filters applied when scanning folders
         """
         self.max_size_bytes = max_size_mb * 1024 * 1024
         self.max_size_mb = max_size_mb
+        self.checksums = checksums
+        self.copy_backend = CopyBackend(
+            allow_hardlink, buffer_size, hash_algorithm=checksums.algorithm if checksums is not None else None
+        )
+        self.copy_engine = CopyEngine(jobs, self.copy_backend)
+        self.dedup_index = dedup_index
+        # (source_path, stored_path) for every upload skipped as a duplicate
+        self.deduplicated: List[tuple[Path, Path]] = []
+        self.manifest_cache = manifest_cache
+        # (key, source_dir, entries) of folder manifests waiting for save_manifests()
+        self.pending_manifests: List[tuple] = []
+        self.delete_missing = delete_missing
+        # Uploaded files removed because their source disappeared
+        self.deleted: List[Path] = []
+        # Files skipped because they did not change since the last upload
+        self.unchanged_count = 0
+        self.pack_format = pack_format
+        self.pack_threshold = pack_threshold
+        # Files stored inside packs instead of as individual files
+        self.packed_count = 0
+        self.chunk_mode = chunk_mode
+        self.chunk_size = chunk_size
+        self.chunk_store_dir = chunk_store_dir
+        # Large files stored as chunks, and the chunks that were new
+        self.chunked_count = 0
+        self.stored_chunks: List[Path] = []
+        self.namer = DestinationNamer(naming, naming_counters)
+        self.summary = summary
+        self.file_filter = file_filter
+        # Called with every file written to the upload directory as soon as it
+        # is stored (packs, chunks and manifests included), e.g. by a BlobWriter
+        self.on_stored: Optional[Callable[[Path], None]] = None
+
+    def reset_stats(self) -> None:
+        """Forget the results of previous uploads, before starting a new batch."""
+        self.deduplicated = []
+        self.deleted = []
+        self.unchanged_count = 0
+        self.packed_count = 0
+        self.chunked_count = 0
+        self.stored_chunks = []
 
     def validate_file(self, file_path: Path) -> tuple[bool, str]:
         """Validate if file can be uploaded.
@@ -38,6 +129,9 @@ class FileHandler:
         
         file_size = file_path.stat().st_size
         
+        if file_size > self.max_size_bytes and self.chunk_mode is not None:
+            return True, "Valid (chunked)"
+        
         if file_size > self.max_size_bytes:
             size_mb = file_size / (1024 * 1024)
             return False, f"File too large: {size_mb:.2f}MB (max: {self.max_size_mb}MB)"
@@ -47,6 +141,12 @@ class FileHandler:
     def copy_file(self, source_path: Path, dest_dir: Path) -> tuple[bool, str]:
         """Copy file to destination directory.
         
+        With a dedup index, content that is already stored is not copied
+        again and the path of the stored copy is returned instead.
+        
+        Files over the size limit are stored as chunks when chunking is
+        enabled; the message is then the path of the chunk manifest.
+        
         Args:
             source_path: Source file path
             dest_dir: Destination directory path
@@ -59,28 +159,189 @@ class FileHandler:
             return False, message
         
         try:
-            dest_dir.mkdir(parents=True, exist_ok=True)
-            dest_path = dest_dir / source_path.name
-            
-            # Handle duplicate filenames
-            if dest_path.exists():
-                name = source_path.stem
-                ext = source_path.suffix
-                counter = 1
-                while dest_path.exists():
-                    dest_path = dest_dir / f"{name}_{counter}{ext}"
-                    counter += 1
-            
-            shutil.copy2(source_path, dest_path)
+            if self.chunk_mode is not None and source_path.stat().st_size > self.max_size_bytes:
+                manifest_path = self.namer.reserve(self._chunk_manifest_path(source_path), dest_dir)
+                manifests, errors = self._chunk_files([(source_path, manifest_path)])
+                if errors:
+                    self.namer.release(manifest_path)
+                    return False, f"Error chunking file: {errors[0]}"
+                return True, str(manifest_path)
+            
+            digest, stored_path = self._find_duplicate(source_path)
+            if stored_path is not None:
+                self.copy_backend.report(source_path.stat().st_size, 1)
+                return True, str(stored_path)
+            
+            dest_path = self.namer.reserve(source_path, dest_dir)
+            try:
+                with metrics.phase("copy", 1, source_path.stat().st_size):
+                    self.copy_backend.copy(source_path, dest_path)
+            except BaseException:
+                self.namer.release(dest_path)
+                raise
+            self._record_copied({dest_path: digest}, [dest_path])
+            self._stored([dest_path])
             return True, str(dest_path)
         except Exception as e:
             return False, f"Error copying file: {e}"
 
-    def validate_directory(self, dir_path: Path) -> tuple[bool, str]:
+    def _hash_candidates(self, paths: List[Path]) -> dict:
+        """Hash dedup candidates on the copy worker threads.
+        
+        Args:
+            paths: Source file paths to check for duplicates
+            
+        Returns:
+            Dictionary mapping each path to its digest, or None if it could not
+            be read; empty when dedup is disabled
+        """
+        if self.dedup_index is None or not paths:
+            return {}
+        
+        def digest_of(path: Path) -> Optional[str]:
+            try:
+                return hash_file(path)
+            except OSError:
+                return None
+        
+        with metrics.phase("dedup", len(paths)):
+            return dict(zip(paths, self.copy_engine.map(digest_of, paths)))
+
+    def _find_duplicate(
+        self, source_path: Path, planned: Optional[dict] = None, digest: Optional[str] = None
+    ) -> tuple[Optional[str], Optional[Path]]:
+        """Hash a file and look for already-stored identical content.
+        
+        Duplicates are recorded in self.deduplicated.
+        
+        Args:
+            source_path: Source file path
+            planned: Digests already claimed by the current batch, mapped to their destination
+            digest: Digest from _hash_candidates; the file is hashed here if omitted
+            
+        Returns:
+            Tuple of (digest, stored_path); both None when dedup is disabled,
+            stored_path None when the content is new
+        """
+        if self.dedup_index is None:
+            return None, None
+        
+        if digest is None:
+            with metrics.phase("dedup", 1):
+                digest = hash_file(source_path)
+        stored_path = self.dedup_index.lookup(digest)
+        if stored_path is None and planned is not None:
+            stored_path = planned.get(digest)
+        
+        if stored_path is not None:
+            self.deduplicated.append((source_path, stored_path))
+        return digest, stored_path
+
+    def _record_copied(self, digests: dict, copied: List[Path], replaced: Optional[dict] = None) -> None:
+        """Add successfully copied files to the dedup index, checksum manifest and summary.
+        
+        Checksums come from hashing during the copy or from the dedup
+        check where possible; the remaining files are hashed in parallel.
+        
+        Args:
+            digests: Maps destination paths to the dedup digest of their content
+            copied: Destination paths that were copied successfully
+            replaced: Maps destination paths that overwrote a file to its size
+        """
+        self._summarize(copied, replaced)
+        
+        if self.dedup_index is not None:
+            for dest_path in copied:
+                # The path may have held other content before this copy
+                self.dedup_index.forget(dest_path)
+                if digests.get(dest_path) is not None:
+                    self.dedup_index.record(digests[dest_path], dest_path)
+        
+        if self.checksums is None:
+            return
+        
+        # Dedup digests use the default algorithm; reuse them when it matches
+        reuse_dedup = self.checksums.algorithm == DEFAULT_ALGORITHM
+        unhashed = []
+        for dest_path in copied:
+            digest = self.copy_backend.digests.pop(dest_path, None)
+            if digest is None and reuse_dedup:
+                digest = digests.get(dest_path)
+            if digest is None:
+                unhashed.append(dest_path)
+            else:
+                self.checksums.record(dest_path, digest)
+        
+        with metrics.phase("hash", len(unhashed)):
+            hashed = hash_files(unhashed, self.checksums.algorithm, self.copy_engine.jobs)
+        for dest_path, digest in hashed.items():
+            if digest is not None:
+                self.checksums.record(dest_path, digest)
+
+    def _stored(self, paths: List[Path]) -> None:
+        """Pass files written to the upload directory to on_stored."""
+        if self.on_stored is not None:
+            for path in paths:
+                self.on_stored(path)
+
+    def _summarize(self, stored: List[Path], replaced: Optional[dict] = None) -> None:
+        """Count newly stored files in the summary index, if there is one.
+        
+        Args:
+            stored: Files written under the upload directory
+            replaced: Maps paths that overwrote a file to its size
+        """
+        if self.summary is None:
+            return
+        
+        replaced = replaced or {}
+        for path in stored:
+            try:
+                size = path.stat().st_size
+            except OSError:
+                continue
+            self.summary.add(path, size, replaced.get(path))
+
+    def _existing_sizes(self, paths: List[Path]) -> dict:
+        """Sizes of the files about to be overwritten, for the summary index.
+        
+        Args:
+            paths: Destination paths
+            
+        Returns:
+            Maps each path that already exists to its size (empty without a summary)
+        """
+        if self.summary is None:
+            return {}
+        
+        sizes = {}
+        for path in paths:
+            try:
+                sizes[path] = path.stat().st_size
+            except OSError:
+                pass
+        return sizes
+
+    def scan_directory(self, dir_path: Path) -> Manifest:
+        """Scan a directory once into a manifest of its files.
+        
+        Args:
+            dir_path: Path to the directory
+            
+        Returns:
+            Manifest of every file under the directory that passes the file filter
+        """
+        with metrics.phase("scan") as phase:
+            manifest = scan_directory(dir_path, self.file_filter)
+            phase.add(len(manifest), manifest.total_bytes)
+        return manifest
+
+    def validate_directory(self, dir_path: Path, manifest: Optional[Manifest] = None) -> tuple[bool, str]:
         """Validate if directory can be uploaded.
         
         Args:
             dir_path: Path to the directory
+            manifest: Manifest from a previous scan (scanned here if omitted)
             
         Returns:
             Tuple of (is_valid, message)
@@ -91,38 +352,47 @@ class FileHandler:
         if not dir_path.is_dir():
             return False, f"Path is not a directory: {dir_path}"
         
-        # Get all files in directory (recursively)
-        files = list(dir_path.rglob("*"))
-        file_count = sum(1 for f in files if f.is_file())
+        if manifest is None:
+            manifest = self.scan_directory(dir_path)
         
-        if file_count == 0:
+        if len(manifest) == 0:
+            if self.file_filter is not None:
+                return False, f"Directory is empty or every file is filtered out: {dir_path}"
             return False, f"Directory is empty: {dir_path}"
         
-        # Check if any file exceeds size limit
+        # Check if any file exceeds size limit (unless large files are chunked)
         oversized_files = []
-        for file_path in files:
-            if file_path.is_file():
-                file_size = file_path.stat().st_size
-                if file_size > self.max_size_bytes:
-                    size_mb = file_size / (1024 * 1024)
-                    oversized_files.append(f"{file_path.name} ({size_mb:.2f}MB)")
+        with metrics.phase("validate", len(manifest)):
+            for entry in manifest:
+                if entry.size > self.max_size_bytes and self.chunk_mode is None:
+                    size_mb = entry.size / (1024 * 1024)
+                    oversized_files.append(f"{Path(entry.rel_path).name} ({size_mb:.2f}MB)")
         
         if oversized_files:
             return False, f"Files too large: {', '.join(oversized_files[:3])}{'...' if len(oversized_files) > 3 else ''}"
         
-        return True, f"Valid ({file_count} files)"
+        return True, f"Valid ({len(manifest)} files)"
 
-    def copy_directory(self, source_dir: Path, dest_parent: Path) -> tuple[bool, str, List[Path]]:
+    def copy_directory(
+        self, source_dir: Path, dest_parent: Path, manifest: Optional[Manifest] = None
+    ) -> tuple[bool, str, List[Path]]:
         """Copy directory recursively to destination.
         
+        The source tree is walked once; validation and copying both work
+        from the resulting manifest.
+        
         Args:
             source_dir: Source directory path
             dest_parent: Parent destination directory path
+            manifest: Manifest from a previous scan (scanned here if omitted)
             
         Returns:
             Tuple of (success, message, list_of_copied_files)
         """
-        is_valid, message = self.validate_directory(source_dir)
+        if manifest is None and source_dir.is_dir():
+            manifest = self.scan_directory(source_dir)
+        
+        is_valid, message = self.validate_directory(source_dir, manifest)
         if not is_valid:
             return False, message, []
         
@@ -131,45 +401,447 @@ class FileHandler:
             dest_dir = dest_parent / source_dir.name
             dest_dir.mkdir(parents=True, exist_ok=True)
             
-            copied_files = []
-            
-            # Recursively copy all files
-            for source_file in source_dir.rglob("*"):
-                if source_file.is_file():
-                    # Get relative path to preserve structure
-                    rel_path = source_file.relative_to(source_dir)
-                    dest_file = dest_dir / rel_path
-                    
-                    # Create parent directories if needed
-                    dest_file.parent.mkdir(parents=True, exist_ok=True)
-                    
-                    # Copy file
-                    shutil.copy2(source_file, dest_file)
-                    copied_files.append(dest_file)
+            entries, deleted_paths, cache_entries = self._plan_incremental(manifest, dest_dir)
+            
+            pairs = []
+            to_pack = []
+            to_chunk = []
+            planned = {}
+            digests = {}
+            copy_bytes = 0
+            pair_bytes = 0
+            candidates = self._hash_candidates([
+                source_dir / entry.rel_path
+                for entry in entries
+                if self.chunk_mode is None or entry.size <= self.max_size_bytes
+            ])
+            for entry in entries:
+                source_file = source_dir / entry.rel_path
+                dest_file = dest_dir / entry.rel_path
+                if self.chunk_mode is not None and entry.size > self.max_size_bytes:
+                    to_chunk.append((source_file, dest_file))
+                    copy_bytes += entry.size
+                    continue
+                digest, stored_path = self._find_duplicate(source_file, planned, candidates.get(source_file))
+                if stored_path is not None:
+                    continue
+                copy_bytes += entry.size
+                if self.pack_format is not None and entry.size < self.pack_threshold:
+                    to_pack.append(entry)
+                    continue
+                if digest is not None:
+                    planned[digest] = dest_file
+                    digests[dest_file] = digest
+                pairs.append((source_file, dest_file))
+                pair_bytes += entry.size
+            
+            # Count skipped files as done so byte progress still reaches the total
+            self.copy_backend.report(
+                manifest.total_bytes - copy_bytes, len(manifest) - len(pairs) - len(to_pack) - len(to_chunk)
+            )
+            
+            chunk_pairs = [(source_file, self._chunk_manifest_path(dest_file)) for source_file, dest_file in to_chunk]
+            replaced = self._existing_sizes([dest_file for _, dest_file in pairs + chunk_pairs])
+            
+            packed_files = self._pack_entries(source_dir, dest_dir, to_pack) if to_pack else []
+            chunk_manifests, errors = self._chunk_files(chunk_pairs, replaced)
+            copied_files, copy_errors = self._copy_pairs(pairs, pair_bytes)
+            self._record_copied(digests, copied_files, replaced)
+            errors.extend(copy_errors)
+            
+            # Large files that failed to chunk are retried by the next upload too
+            chunked = set(chunk_manifests)
+            stored_chunked = [dest_file for _, dest_file in to_chunk if self._chunk_manifest_path(dest_file) in chunked]
+            pairs = pairs + [pair for pair in to_chunk if self._chunk_manifest_path(pair[1]) not in chunked]
+            
+            # Files stored again are dropped from the packs that held their older versions
+            stored_names = [entry.rel_path for entry in to_pack] + [
+                dest_file.relative_to(dest_dir).as_posix() for dest_file in copied_files + stored_chunked
+            ]
+            rewritten = self._drop_packed(dest_dir, stored_names, packed_files[0] if packed_files else None)
+            copied_files = packed_files + chunk_manifests + copied_files + rewritten
+            
+            if cache_entries is not None:
+                deleted_before = len(self.deleted)
+                rewritten = self._finish_incremental(
+                    source_dir, dest_dir, pairs, copied_files, deleted_paths, cache_entries
+                )
+                # Deletions may rewrite or empty a pack index this upload already wrote
+                deleted = set(self.deleted[deleted_before:])
+                copied_files = [path for path in copied_files if path not in deleted]
+                copied_files += [path for path in rewritten if path not in copied_files]
+            
+            if errors:
+                return False, f"Error copying directory: {'; '.join(errors[:3])}{'...' if len(errors) > 3 else ''}", copied_files
             
             return True, str(dest_dir), copied_files
         except Exception as e:
             return False, f"Error copying directory: {e}", []
 
-    def copy_files_batch(self, source_paths: List[Path], dest_dir: Path) -> tuple[List[Path], List[str]]:
+    def _pack_entries(self, source_dir: Path, dest_dir: Path, entries: List[ManifestEntry]) -> List[Path]:
+        """Stream small files into a single pack in the destination folder.
+        
+        Args:
+            source_dir: Source directory path
+            dest_dir: Destination directory path
+            entries: Files to pack
+            
+        Returns:
+            Paths of the pack and its index
+        """
+        writer = PackWriter(dest_dir, self.pack_format)
+        with metrics.phase("pack") as phase:
+            try:
+                for entry in entries:
+                    size = writer.add(source_dir / entry.rel_path, entry.rel_path)
+                    self.copy_backend.report(size, 1)
+                    phase.add(1, size)
+                writer.close()
+            except BaseException:
+                writer.abort()
+                raise
+        
+        self.packed_count += len(entries)
+        packed_files = [writer.pack_path, writer.index_path]
+        self._record_copied({}, packed_files)
+        self._stored(packed_files)
+        return packed_files
+
+    def _copy_pairs(
+        self, pairs: List[tuple[Path, Path]], total_bytes: int, done: Optional[List[Path]] = None
+    ) -> tuple[List[Path], List[str]]:
+        """Copy (source, dest) pairs with the copy engine as one "copy" phase.
+        
+        Args:
+            pairs: Sequence of (source_path, dest_path) tuples
+            total_bytes: Combined size of the source files
+            done: If given, each destination is appended to it as soon as it
+                is copied, so callers know what finished if the copy is interrupted
+            
+        Returns:
+            Tuple of (copied_dest_paths, error_messages)
+        """
+        on_copied = self.on_stored
+        if done is not None:
+            def on_copied(dest_path: Path) -> None:
+                done.append(dest_path)
+                if self.on_stored is not None:
+                    self.on_stored(dest_path)
+        
+        with metrics.phase("copy", bytes_=total_bytes) as phase:
+            copied, errors = self.copy_engine.copy_pairs(pairs, on_copied)
+            phase.add(len(copied))
+        return copied, errors
+
+    @staticmethod
+    def _chunk_manifest_path(path: Path) -> Path:
+        """Path of the chunk manifest stored in place of a file."""
+        return path.with_name(path.name + CHUNK_MANIFEST_SUFFIX)
+
+    def _chunk_files(
+        self, pairs: List[tuple[Path, Path]], replaced: Optional[dict] = None
+    ) -> tuple[List[Path], List[str]]:
+        """Store large files as chunks, several files at a time in worker processes.
+        
+        New chunks are added to self.stored_chunks.
+        
+        Args:
+            pairs: Sequence of (source_path, manifest_path) tuples
+            replaced: Maps manifest paths that overwrite a file to its size
+            
+        Returns:
+            Tuple of (manifest_paths, error_messages)
+        """
+        if not pairs:
+            return [], []
+        
+        worker = partial(
+            store_chunked, store_dir=self.chunk_store_dir, mode=self.chunk_mode, avg_size=self.chunk_size
+        )
+        results = []
+        chunk_bytes = sum(source_path.stat().st_size for source_path, _ in pairs)
+        with metrics.phase("chunk", len(pairs), chunk_bytes):
+            if self.copy_engine.jobs == 1 or len(pairs) < 2:
+                for source_path, manifest_path in pairs:
+                    try:
+                        results.append((source_path, worker(source_path, manifest_path), None))
+                    except Exception as e:
+                        results.append((source_path, None, e))
+            else:
+                from concurrent.futures import ProcessPoolExecutor
+                
+                with ProcessPoolExecutor(max_workers=min(self.copy_engine.jobs, len(pairs))) as pool:
+                    futures = [
+                        (source_path, pool.submit(worker, source_path, manifest_path))
+                        for source_path, manifest_path in pairs
+                    ]
+                    for source_path, future in futures:
+                        try:
+                            results.append((source_path, future.result(), None))
+                        except Exception as e:
+                            results.append((source_path, None, e))
+        
+        manifests = []
+        errors = []
+        for source_path, written, error in results:
+            if error is not None:
+                errors.append(f"{source_path.name}: {error}")
+                continue
+            # store_chunked returns the new chunks followed by the manifest
+            manifests.append(written[-1])
+            self.stored_chunks.extend(written[:-1])
+            self._stored(written)
+            self._summarize(written[:-1])
+            self.chunked_count += 1
+            self.copy_backend.report(source_path.stat().st_size, 1)
+        
+        self._record_copied({}, manifests, replaced)
+        return manifests, errors
+
+    def _plan_incremental(
+        self, manifest: Manifest, dest_dir: Path
+    ) -> tuple[List[ManifestEntry], List[str], Optional[CachedEntries]]:
+        """Work out which files of a folder need copying.
+        
+        Args:
+            manifest: Scan of the source folder
+            dest_dir: Destination folder
+            
+        Returns:
+            Tuple of (entries_to_copy, deleted_rel_paths, entries_to_cache);
+            entries_to_cache is None when no manifest cache is configured
+        """
+        if self.manifest_cache is None:
+            return manifest.entries, [], None
+        
+        previous = self.manifest_cache.load(str(dest_dir.resolve()))
+        if previous is None:
+            return manifest.entries, [], self.manifest_cache.entries_for(manifest)
+        
+        entries, deleted_paths, cache_entries = self.manifest_cache.diff(previous, manifest)
+        self.unchanged_count += len(manifest) - len(entries)
+        
+        # Keep records of vanished files until their deletion is propagated
+        for rel_path in deleted_paths:
+            cache_entries[rel_path] = previous[rel_path]
+        
+        return entries, deleted_paths, cache_entries
+
+    def _finish_incremental(
+        self,
+        source_dir: Path,
+        dest_dir: Path,
+        pairs: List[tuple[Path, Path]],
+        copied_files: List[Path],
+        deleted_paths: List[str],
+        cache_entries: CachedEntries,
+    ) -> List[Path]:
+        """Propagate deletions and queue the folder manifest for save_manifests().
+        
+        Files that failed to copy are left out of the manifest so the
+        next upload retries them.
+        
+        Returns:
+            Pack indexes rewritten to drop deleted files, to be committed
+        """
+        copied = set(copied_files)
+        for _, dest_file in pairs:
+            if dest_file not in copied:
+                cache_entries.pop(dest_file.relative_to(dest_dir).as_posix(), None)
+        
+        rewritten = []
+        if self.delete_missing:
+            packed = []
+            for rel_path in deleted_paths:
+                dest_file = dest_dir / rel_path
+                chunk_manifest = self._chunk_manifest_path(dest_file)
+                if not dest_file.exists() and chunk_manifest.exists():
+                    dest_file = chunk_manifest
+                if dest_file.exists():
+                    self._delete_stored(dest_file)
+                else:
+                    # Small files may live in a pack instead
+                    packed.append(rel_path)
+                del cache_entries[rel_path]
+            rewritten = self._drop_packed(dest_dir, packed)
+        
+        self.pending_manifests.append((str(dest_dir.resolve()), source_dir, cache_entries))
+        return rewritten
+
+    def _delete_stored(self, dest_file: Path) -> None:
+        """Delete a file from the upload directory and from every index tracking it."""
+        try:
+            size = dest_file.stat().st_size
+            dest_file.unlink()
+            if self.summary is not None:
+                self.summary.remove(dest_file, size)
+        except FileNotFoundError:
+            pass
+        if self.checksums is not None:
+            self.checksums.remove(dest_file)
+        if self.dedup_index is not None:
+            self.dedup_index.forget(dest_file)
+        self.deleted.append(dest_file)
+
+    def _drop_packed(self, dest_dir: Path, names: List[str], keep: Optional[Path] = None) -> List[Path]:
+        """Drop files from the packs of a folder, deleting packs left empty.
+        
+        Args:
+            dest_dir: Folder holding the packs
+            names: Paths of the files relative to dest_dir
+            keep: Pack whose members are left alone
+            
+        Returns:
+            Pack indexes that were rewritten
+        """
+        if not names:
+            return []
+        
+        replaced = self._existing_sizes(list(dest_dir.glob(f"*{INDEX_SUFFIX}")))
+        rewritten, emptied = drop_members(dest_dir, names, keep)
+        for path in emptied:
+            self._delete_stored(path)
+        self._record_copied({}, rewritten, replaced)
+        self._stored(rewritten)
+        return rewritten
+
+    def save_manifests(self) -> None:
+        """Persist the manifests of the folders copied since the last call.
+        
+        Call once their files are committed: a folder whose copy was never
+        committed is then compared against its last committed manifest, and
+        its changes are copied again by the next upload.
+        """
+        for key, source_dir, entries in self.pending_manifests:
+            self.manifest_cache.save(key, source_dir, entries)
+        self.pending_manifests = []
+
+    def remove_partial_files(self, dest_dir: Path, recursive: bool = True, placeholders: Iterable[Path] = ()) -> int:
+        """Delete temporary files left behind by interrupted copies.
+        
+        Args:
+            dest_dir: Directory to clean
+            recursive: Also clean subdirectories
+            placeholders: Destinations claimed by copies that never finished;
+                those still empty are removed too
+            
+        Returns:
+            Number of files removed
+        """
+        removed = 0
+        for path in placeholders:
+            try:
+                if path.stat().st_size == 0:
+                    self.namer.release(path)
+                    removed += 1
+            except OSError:
+                pass
+        
+        if not dest_dir.is_dir():
+            return removed
+        
+        if recursive:
+            candidates = [dest_dir / entry.rel_path for entry in iter_directory(dest_dir)]
+        else:
+            candidates = [Path(entry.path) for entry in os.scandir(dest_dir) if entry.is_file()]
+        
+        for path in candidates:
+            if path.name.endswith(TEMP_SUFFIX):
+                path.unlink(missing_ok=True)
+                removed += 1
+        return removed
+
+    def record_resumed(self, paths: List[Path]) -> None:
+        """Add files an interrupted upload finished copying to the indexes."""
+        self._record_copied({}, paths)
+
+    @staticmethod
+    def finished_copy(source_path: Path, dest_path: Path) -> bool:
+        """Check whether a claimed destination holds a completed copy of its source.
+        
+        Copies are renamed into place when complete, so a claimed path is
+        either the empty placeholder or the whole file.
+        """
+        try:
+            return dest_path.stat().st_size == source_path.stat().st_size
+        except OSError:
+            return False
+
+    def copy_files_batch(
+        self,
+        source_paths: List[Path],
+        dest_dir: Path,
+        failed: Optional[List[Path]] = None,
+        on_reserved: Optional[Callable[[List[tuple[Path, Path]]], None]] = None,
+    ) -> tuple[List[Path], List[str]]:
         """Copy multiple files to destination directory.
         
         Args:
             source_paths: List of source file paths
             dest_dir: Destination directory path
+            failed: If given, source paths that could not be stored are appended to it
+            on_reserved: Called with the (source, dest) pairs once every destination
+                is claimed and before any is copied, e.g. to journal them
             
         Returns:
             Tuple of (successful_paths, error_messages)
         """
-        successful = []
+        pairs = []
         errors = []
+        planned = {}
+        digests = {}
+        pair_bytes = 0
+        done: List[Path] = []
         
+        valid_paths = []
         for path in source_paths:
-            success, result = self.copy_file(path, dest_dir)
-            if success:
-                successful.append(Path(result))
-            else:
-                errors.append(f"{path.name}: {result}")
+            is_valid, message = self.validate_file(path)
+            if not is_valid:
+                errors.append(f"{path.name}: {message}")
+                if failed is not None:
+                    failed.append(path)
+                continue
+            valid_paths.append(path)
+        candidates = self._hash_candidates(valid_paths)
+        
+        try:
+            for path in valid_paths:
+                try:
+                    digest, stored_path = self._find_duplicate(path, planned, candidates.get(path))
+                except OSError as e:
+                    errors.append(f"{path.name}: {e}")
+                    if failed is not None:
+                        failed.append(path)
+                    continue
+                if stored_path is not None:
+                    self.copy_backend.report(path.stat().st_size, 1)
+                    continue
+                dest_path = self.namer.reserve(path, dest_dir)
+                pairs.append((path, dest_path))
+                if digest is not None:
+                    planned[digest] = dest_path
+                    digests[dest_path] = digest
+                pair_bytes += path.stat().st_size
+            
+            if on_reserved is not None and pairs:
+                on_reserved(pairs)
+            successful, copy_errors = self._copy_pairs(pairs, pair_bytes, done)
+        except BaseException:
+            # Do not leave the empty placeholders of unfinished copies behind
+            finished = set(done)
+            for _, dest_path in pairs:
+                if dest_path not in finished:
+                    self.namer.release(dest_path)
+            raise
+        if copy_errors:
+            copied = set(successful)
+            for source_path, dest_path in pairs:
+                if dest_path not in copied:
+                    self.namer.release(dest_path)
+                    if failed is not None:
+                        failed.append(source_path)
+        self._record_copied(digests, successful)
+        errors.extend(copy_errors)
         
         return successful, errors
 
@@ -196,6 +868,8 @@ class FileHandler:
         Args:
             file_path: Path to the file
         """
+        from rich.table import Table
+        
         info = self.get_file_info(file_path)
         
         table = Table(title="File Information", show_header=False)
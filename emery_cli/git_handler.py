@@ -1,12 +1,103 @@
 """Git operations for Emery CLI."""
 
+import functools
+import json
+import os
+import threading
+from io import BytesIO
 from pathlib import Path
 from git import Repo
+from git.objects import Commit, Tree
+from git.objects.fun import tree_to_stream
+from gitdb.base import IStream
 from rich.console import Console
-from typing import Optional
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from emery_cli.journal import PHASE_COMMITTED, PHASE_STAGED, UploadJournal
+from emery_cli.locking import FileLock
+from emery_cli.metrics import metrics
 
 console = Console()
 
+# Git tree entry modes
+MODE_FILE = 0o100644
+MODE_EXECUTABLE = 0o100755
+MODE_TREE = 0o040000
+
+NULL_SHA = "0" * 40
+
+# Lock file inside the git directory that serializes emery's repository updates
+LOCK_NAME = "emery.lock"
+
+
+def _tree_sort_key(entry: tuple) -> bytes:
+    """Sort key matching git's tree entry order (directories sort as 'name/')."""
+    binsha, mode, name = entry
+    return name.encode("utf-8") + (b"/" if mode == MODE_TREE else b"")
+
+
+def _format_size(size_bytes: float) -> str:
+    for unit in ("B", "KB", "MB"):
+        if size_bytes < 1024:
+            return f"{size_bytes:.0f} {unit}" if unit == "B" else f"{size_bytes:.1f} {unit}"
+        size_bytes /= 1024
+    return f"{size_bytes:.1f} GB"
+
+
+def summarize_upload(file_paths: Sequence, total_bytes: int, base_dir: Path, removed_count: int = 0) -> str:
+    """Build a short commit message describing an upload.
+    
+    Args:
+        file_paths: Uploaded files
+        total_bytes: Combined size of the uploaded files
+        base_dir: Directory whose top-level entries are named in the message
+        removed_count: Number of files removed in the same commit
+        
+    Returns:
+        Message such as "Upload 1204 files (56.7 MB) in assets/, docs/ and 2 more",
+        or "Upload 2 files (3.1 KB): notes.txt, docs/a.md" when every name shown
+        is an uploaded file
+    """
+    # Top-level entry -> paths (relative to base_dir) of its uploaded files
+    groups: Dict[str, List[str]] = {}
+    for file_path in file_paths:
+        try:
+            parts = Path(file_path).resolve().relative_to(base_dir.resolve()).parts
+        except ValueError:
+            parts = (Path(file_path).name,)
+        name = parts[0] + "/" if len(parts) > 1 else parts[0]
+        groups.setdefault(name, []).append("/".join(parts))
+    
+    # A folder holding a single uploaded file is named by that file
+    top_level = [paths[0] if len(paths) == 1 else name for name, paths in groups.items()]
+    
+    removed = f"remove {removed_count} file{'s' if removed_count != 1 else ''}"
+    if not file_paths:
+        return removed.capitalize()
+    
+    message = f"Upload {len(file_paths)} file{'s' if len(file_paths) != 1 else ''} ({_format_size(total_bytes)})"
+    shown = ", ".join(top_level[:3])
+    if len(top_level) > 3:
+        shown += f" and {len(top_level) - 3} more"
+    message += f": {shown}" if len(file_paths) == len(groups) else f" in {shown}"
+    if removed_count:
+        message += f", {removed}"
+    return message
+
+
+def _locked(method):
+    """Run a GitHandler method while holding the repository lock."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if not self.lock.acquire(blocking=False):
+            console.print("[cyan]Waiting for another emery process to finish with the repository...[/cyan]")
+            self.lock.acquire()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            self.lock.release()
+    return wrapper
+
 class GitHandler:
     """Handle git operations for file uploads."""
 
@@ -18,7 +109,19 @@ class GitHandler:
         """
         self.repo = Repo(str(repo_path))
         self.repo_path = repo_path
+        # Held around every change to refs, the index and the push queue, so
+        # concurrent emery processes on one repository take turns
+        self.lock = FileLock(Path(self.repo.git_dir) / LOCK_NAME)
+        # Index entries staged since the last commit: repo-relative path ->
+        # (binsha, mode), or None if removed. commit() compares only these
+        # with HEAD instead of diffing the whole index
+        self._staged: Dict[str, Optional[tuple[bytes, int]]] = {}
+        # Blobs written ahead of the commit by a BlobWriter: repo-relative
+        # path -> (binsha, mode, size, mtime_ns) of the file when it was read
+        self.prewritten: Dict[str, tuple[bytes, int, int, int]] = {}
+        self._prewritten_lock = threading.Lock()
 
+    @_locked
     def ensure_branch(self, branch_name: str) -> bool:
         """Ensure the target branch exists.
         
@@ -40,6 +143,7 @@ class GitHandler:
             console.print(f"[red]Error ensuring branch: {e}[/red]")
             return False
 
+    @_locked
     def switch_branch(self, branch_name: str) -> bool:
         """Switch to target branch.
         
@@ -67,24 +171,424 @@ class GitHandler:
             True if successful, False otherwise
         """
         try:
-            rel_paths = []
-            for file_path in file_paths:
-                # Convert to Path object and make absolute
-                abs_path = Path(file_path).resolve()
-                # Make path relative to repo root
-                rel_path = abs_path.relative_to(self.repo_path)
-                rel_paths.append(str(rel_path))
+            rel_paths = [self._repo_relative(file_path) for file_path in file_paths]
             
             if rel_paths:
-                self.repo.index.add(rel_paths)
+                with metrics.phase("stage", len(rel_paths)):
+                    entries = self.repo.index.add(rel_paths)
+                for entry in entries:
+                    self._staged[entry.path] = (entry.binsha, entry.mode)
+            return True
+        except Exception as e:
+            console.print(f"[red]Error staging files: {e}[/red]")
+            return False
+
+    def remove_from_index(self, rel_paths: List[str], recursive: bool = False) -> None:
+        """Stage the removal of paths, leaving the worktree alone.
+        
+        Args:
+            rel_paths: Repo-relative paths; missing ones are ignored
+            recursive: Also remove everything below directories
+        """
+        if not rel_paths:
+            return
+        
+        for rel_path in self.repo.index.remove(rel_paths, r=recursive, ignore_unmatch=True):
+            self._staged[rel_path] = None
+
+    def _repo_relative(self, file_path) -> str:
+        """Convert a file path to a POSIX path relative to the repo root."""
+        abs_path = Path(file_path).resolve()
+        return abs_path.relative_to(self.repo_path).as_posix()
+
+    def write_blob(self, file_path) -> tuple[str, bytes, int]:
+        """Write a file's contents into the object database.
+        
+        A blob written ahead by a BlobWriter is reused if the file has not
+        changed since.
+        
+        Args:
+            file_path: Path to a file inside the repository
+            
+        Returns:
+            Tuple of (repo_relative_path, blob_binsha, mode)
+        """
+        rel_path = self._repo_relative(file_path)
+        abs_path = Path(file_path)
+        stat = abs_path.stat()
+        mode = MODE_EXECUTABLE if stat.st_mode & 0o111 else MODE_FILE
+        
+        with self._prewritten_lock:
+            prewritten = self.prewritten.pop(rel_path, None)
+        if prewritten is not None and prewritten[1:] == (mode, stat.st_size, stat.st_mtime_ns):
+            return rel_path, prewritten[0], mode
+        
+        with metrics.phase("stage", 1, stat.st_size), open(abs_path, "rb") as stream:
+            istream = self.repo.odb.store(IStream(b"blob", stat.st_size, stream))
+        
+        return rel_path, istream.binsha, mode
+
+    def add_prewritten(self, rel_path: str, binsha: bytes, mode: int, size: int, mtime_ns: int) -> None:
+        """Remember a blob written ahead of the commit, for write_blob() to reuse.
+        
+        Args:
+            rel_path: Repo-relative path of the file
+            binsha: SHA of the blob
+            mode: File mode of the blob
+            size: Size of the file when it was read
+            mtime_ns: Modification time of the file when it was read
+        """
+        with self._prewritten_lock:
+            self.prewritten[rel_path] = (binsha, mode, size, mtime_ns)
+
+    def _write_tree(self, base: Optional[Tree], changes: dict) -> Optional[bytes]:
+        """Write a tree object from a base tree plus a nested change set.
+        
+        Only directories that appear in the change set are read and
+        rewritten; untouched subtrees are reused by their SHA.
+        
+        Args:
+            base: Existing tree at this level, if any
+            changes: Maps names to (binsha, mode), a nested dict, or None to delete
+            
+        Returns:
+            Binary SHA of the new tree, or None if it would be empty
+        """
+        entries = {}
+        if base is not None:
+            for item in base:
+                entries[item.name] = (item.binsha, item.mode, item.name)
+        
+        for name, change in changes.items():
+            if change is None:
+                entries.pop(name, None)
+            elif isinstance(change, dict):
+                existing = entries.get(name)
+                subtree = None
+                if existing is not None and existing[1] == MODE_TREE:
+                    subtree = base[name]
+                binsha = self._write_tree(subtree, change)
+                if binsha is None:
+                    entries.pop(name, None)
+                else:
+                    entries[name] = (binsha, MODE_TREE, name)
+            else:
+                binsha, mode = change
+                entries[name] = (binsha, mode, name)
+        
+        if not entries:
+            return None
+        
+        return self._store_tree(list(entries.values()))
+
+    def _store_tree(self, entries: List[tuple]) -> bytes:
+        """Store a tree object built from (binsha, mode, name) entries."""
+        buffer = BytesIO()
+        tree_to_stream(sorted(entries, key=_tree_sort_key), buffer.write)
+        data = buffer.getvalue()
+        return self.repo.odb.store(IStream(b"tree", len(data), BytesIO(data))).binsha
+
+    def _branch_commit(self, branch_name: str) -> Optional[Commit]:
+        """Get the commit a branch points at, or the commit it would start from."""
+        if branch_name in self.repo.heads:
+            return self.repo.heads[branch_name].commit
+        if self.repo.head.is_valid():
+            return self.repo.head.commit
+        return None
+
+    def commit_blobs(
+        self,
+        branch_name: str,
+        blobs: Iterable[tuple[str, bytes, int]],
+        message: str,
+        author_name: str,
+        author_email: str,
+        removed_paths: Iterable[str] = (),
+    ) -> bool:
+        """Commit blobs directly onto a branch without touching HEAD or the worktree.
+        
+        A new tree is built from the branch's current tree plus the given
+        entries, a commit is created on top of it and the branch ref is
+        updated. Cost scales with the number of entries, not the repo size.
+        
+        Args:
+            branch_name: Branch to commit onto (created if missing)
+            blobs: Tuples of (repo_relative_path, blob_binsha, mode)
+            message: Commit message
+            author_name: Name of the author
+            author_email: Email of the author
+            removed_paths: Repo-relative paths to delete from the tree
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            from git.util import Actor
+            
+            changes: dict = {}
+            
+            def place(rel_path: str, value) -> None:
+                *dirs, name = rel_path.split("/")
+                level = changes
+                for part in dirs:
+                    level = level.setdefault(part, {})
+                level[name] = value
+            
+            for rel_path in removed_paths:
+                place(rel_path, None)
+            for rel_path, binsha, mode in blobs:
+                place(rel_path, (binsha, mode))
+            
+            branch_exists = branch_name in self.repo.heads
+            parent = self._branch_commit(branch_name)
+            base_tree = parent.tree if parent is not None else None
+            with metrics.phase("tree"):
+                tree_sha = self._write_tree(base_tree, changes) or self._store_tree([])
+            
+            if base_tree is not None and tree_sha == base_tree.binsha:
+                console.print("[yellow]✓ No changes to commit[/yellow]")
+                return True
+            
+            if not branch_exists:
+                console.print(f"[cyan]Creating branch '{branch_name}'...[/cyan]")
+            
+            actor = Actor(author_name, author_email)
+            with metrics.phase("commit"):
+                new_commit = Commit.create_from_tree(
+                    self.repo,
+                    Tree(self.repo, tree_sha),
+                    message,
+                    parent_commits=[parent] if parent is not None else [],
+                    head=False,
+                    author=actor,
+                    committer=actor,
+                )
+                
+                # Compare-and-swap so a concurrent update is never overwritten
+                old_sha = parent.hexsha if branch_exists else NULL_SHA
+                self.repo.git.update_ref(f"refs/heads/{branch_name}", new_commit.hexsha, old_sha)
+            
+            console.print(f"[green]✓ Committed: {message}[/green]")
             return True
         except Exception as e:
+            console.print(f"[red]Error committing: {e}[/red]")
+            return False
+
+    @_locked
+    def commit_files(
+        self,
+        branch_name: str,
+        file_paths: list,
+        message: str,
+        author_name: str,
+        author_email: str,
+        removed_files: Iterable = (),
+    ) -> bool:
+        """Commit files onto a branch without checking it out.
+        
+        If the branch is currently checked out, the regular index is used
+        instead so the worktree stays consistent with HEAD.
+        
+        Args:
+            branch_name: Branch to commit onto (created if missing)
+            file_paths: List of file paths inside the repository
+            message: Commit message
+            author_name: Name of the author
+            author_email: Email of the author
+            removed_files: Paths inside the repository to delete from the branch
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        removed_paths = [self._repo_relative(file_path) for file_path in removed_files]
+        
+        if self.is_checked_out(branch_name):
+            self.remove_from_index(removed_paths)
+            return self.add_files(file_paths) and self.commit(message, author_name, author_email)
+        
+        try:
+            blobs: List[tuple[str, bytes, int]] = [self.write_blob(file_path) for file_path in file_paths]
+        except Exception as e:
+            console.print(f"[red]Error staging files: {e}[/red]")
+            return False
+        
+        return self.commit_blobs(branch_name, blobs, message, author_name, author_email, removed_paths)
+
+    @_locked
+    def commit_removal(
+        self,
+        branch_name: str,
+        dir_path: Path,
+        message: str,
+        author_name: str,
+        author_email: str,
+    ) -> bool:
+        """Commit the removal of a whole directory from a branch.
+        
+        The directory is dropped as a single tree entry (or, on a checked-out
+        branch, with one recursive index removal), however many files it held.
+        
+        Args:
+            branch_name: Branch to commit onto
+            dir_path: Directory inside the repository to remove
+            message: Commit message
+            author_name: Name of the author
+            author_email: Email of the author
+            
+        Returns:
+            True if successful (or there was nothing to remove), False otherwise
+        """
+        rel_path = self._repo_relative(dir_path)
+        
+        if self.is_checked_out(branch_name):
+            try:
+                self.remove_from_index([rel_path], recursive=True)
+            except Exception as e:
+                console.print(f"[red]Error staging removal: {e}[/red]")
+                return False
+            return self.commit(message, author_name, author_email)
+        
+        if branch_name not in self.repo.heads:
+            console.print(f"[yellow]✓ Branch '{branch_name}' does not exist; nothing to remove[/yellow]")
+            return True
+        return self.commit_blobs(branch_name, [], message, author_name, author_email, [rel_path])
+
+    def _plan_shards(self, file_paths: list, max_files: int, max_bytes: int) -> List[tuple[list, int]]:
+        """Split files into shards bounded by file count and total size.
+        
+        Args:
+            file_paths: Files to commit
+            max_files: Maximum files per shard (0 for no limit)
+            max_bytes: Maximum bytes per shard (0 for no limit)
+            
+        Returns:
+            List of (file_paths, total_bytes) shards; one empty shard if there are no files
+        """
+        shards: List[tuple[list, int]] = []
+        current: list = []
+        current_bytes = 0
+        
+        for file_path in file_paths:
+            size = Path(file_path).stat().st_size
+            full = (max_files and len(current) >= max_files) or (max_bytes and current_bytes + size > max_bytes)
+            if current and full:
+                shards.append((current, current_bytes))
+                current, current_bytes = [], 0
+            current.append(file_path)
+            current_bytes += size
+        
+        if current or not shards:
+            shards.append((current, current_bytes))
+        return shards
+
+    @_locked
+    def commit_in_shards(
+        self,
+        branch_name: str,
+        file_paths: list,
+        author_name: str,
+        author_email: str,
+        message: Optional[str] = None,
+        removed_files: Iterable = (),
+        max_files: int = 0,
+        max_bytes: int = 0,
+        summary_base: Optional[Path] = None,
+        journal: Optional[UploadJournal] = None,
+    ) -> bool:
+        """Commit files onto a branch as a series of bounded commits.
+        
+        Each shard is written and committed on its own, so memory use is
+        bounded by the shard size. With a journal, every shard is recorded
+        as staged and then committed, so a failed upload can be resumed
+        from the first uncommitted shard.
+        
+        Args:
+            branch_name: Branch to commit onto (created if missing)
+            file_paths: List of file paths inside the repository
+            author_name: Name of the author
+            author_email: Email of the author
+            message: Commit message (a compact summary is generated if omitted)
+            removed_files: Paths inside the repository to delete from the branch
+            max_files: Maximum files per commit (0 for no limit)
+            max_bytes: Maximum bytes per commit (0 for no limit)
+            summary_base: Directory whose entries are named in generated messages
+            journal: Upload journal to record progress in
+            
+        Returns:
+            True if every shard was committed, False otherwise
+        """
+        removed_files = list(removed_files)
+        summary_base = summary_base or self.repo_path
+        
+        try:
+            shards = self._plan_shards(file_paths, max_files, max_bytes)
+        except OSError as e:
             console.print(f"[red]Error staging files: {e}[/red]")
             return False
+        
+        for index, (shard_paths, shard_bytes) in enumerate(shards):
+            shard_removed = removed_files if index == 0 else []
+            shard_message = message or summarize_upload(shard_paths, shard_bytes, summary_base, len(shard_removed))
+            if len(shards) > 1:
+                shard_message = f"{shard_message} [{index + 1}/{len(shards)}]"
+            
+            if journal is not None:
+                journal.record_files(PHASE_STAGED, shard_paths + shard_removed)
+            
+            if not self.commit_files(branch_name, shard_paths, shard_message, author_name, author_email, shard_removed):
+                if journal is not None:
+                    remaining = sum(len(paths) for paths, _ in shards[index:])
+                    console.print(
+                        f"[yellow]⚠ {remaining} file(s) not committed; run 'emery upload --resume' to retry[/yellow]"
+                    )
+                return False
+            
+            if journal is not None:
+                journal.record_files(PHASE_COMMITTED, shard_paths + shard_removed)
+        
+        return True
+
+    def _has_staged_changes(self) -> bool:
+        """Check whether the entries staged since the last commit differ from HEAD.
+        
+        Each staged path is looked up in HEAD's tree, reading only the
+        directories on its way, so the cost follows the size of the upload
+        rather than the size of the branch.
+        """
+        if not self._staged:
+            return False
+        if not self.repo.head.is_valid():
+            return any(staged is not None for staged in self._staged.values())
+        
+        root = self.repo.head.commit.tree
+        # Directory -> {name: (binsha, mode)}, or None if missing from HEAD
+        listings: Dict[str, Optional[dict]] = {}
+        
+        def listing(rel_dir: str) -> Optional[dict]:
+            if rel_dir not in listings:
+                if not rel_dir:
+                    tree = root
+                else:
+                    parent_dir, _, name = rel_dir.rpartition("/")
+                    parent = listing(parent_dir)
+                    entry = parent.get(name) if parent is not None else None
+                    tree = Tree(self.repo, entry[0], mode=MODE_TREE, path=rel_dir) if entry and entry[1] == MODE_TREE else None
+                listings[rel_dir] = None if tree is None else {item.name: (item.binsha, item.mode) for item in tree}
+            return listings[rel_dir]
+        
+        for rel_path, staged in self._staged.items():
+            rel_dir, _, name = rel_path.rpartition("/")
+            entries = listing(rel_dir)
+            if (entries.get(name) if entries is not None else None) != staged:
+                return True
+        return False
 
     def commit(self, message: str, author_name: str, author_email: str) -> bool:
         """Commit staged files.
         
+        Only the paths staged through this handler decide whether there is
+        anything to commit; the rest of the index is not compared with HEAD.
+        
         Args:
             message: Commit message
             author_name: Name of the author
@@ -96,40 +600,231 @@ class GitHandler:
         try:
             from git.util import Actor
             
-            if not self.repo.index.diff("HEAD"):
+            with metrics.phase("change_check", len(self._staged)):
+                has_changes = self._has_staged_changes()
+            if not has_changes:
+                self._staged.clear()
                 console.print("[yellow]✓ No changes to commit[/yellow]")
                 return True
             
             actor = Actor(author_name, author_email)
-            self.repo.index.commit(message, author=actor, committer=actor)
+            with metrics.phase("commit"):
+                self.repo.index.commit(message, author=actor, committer=actor)
+            self._staged.clear()
             console.print(f"[green]✓ Committed: {message}[/green]")
             return True
         except Exception as e:
             console.print(f"[red]Error committing: {e}[/red]")
             return False
 
+    def is_checked_out(self, branch_name: str) -> bool:
+        """Check whether HEAD points at the given branch."""
+        return not self.repo.head.is_detached and self.repo.head.reference.name == branch_name
+
+    def _tree_changes(self, old: Optional[Tree], new: Tree) -> dict:
+        """Compute the nested change set that turns one tree into another.
+        
+        Only subtrees whose SHA differs are descended into. The result is
+        in the form accepted by _write_tree.
+        """
+        old_entries = {item.name: item for item in old} if old is not None else {}
+        new_entries = {item.name: item for item in new}
+        changes: dict = {}
+        
+        for name in old_entries.keys() - new_entries.keys():
+            changes[name] = None
+        
+        for name, item in new_entries.items():
+            previous = old_entries.get(name)
+            if previous is not None and previous.binsha == item.binsha and previous.mode == item.mode:
+                continue
+            if item.mode == MODE_TREE:
+                old_subtree = previous if previous is not None and previous.mode == MODE_TREE else None
+                changes[name] = self._tree_changes(old_subtree, item)
+            else:
+                changes[name] = (item.binsha, item.mode)
+        
+        return changes
+
+    def _rebase_onto(self, branch_name: str, upstream: Commit) -> bool:
+        """Replay local commits of a branch on top of an upstream commit.
+        
+        Each commit's changes are reapplied to the upstream tree with the
+        same plumbing used for uploads, so nothing is checked out. Paths
+        changed on both sides take the local version.
+        
+        Args:
+            branch_name: Local branch to rebase
+            upstream: Commit to rebase onto
+            
+        Returns:
+            True if the branch now sits on top of upstream, False otherwise
+        """
+        local = self.repo.heads[branch_name].commit
+        commits = list(self.repo.iter_commits(f"{upstream.hexsha}..{local.hexsha}", reverse=True))
+        
+        new_parent = upstream
+        for commit in commits:
+            if len(commit.parents) != 1:
+                console.print(f"[red]Cannot replay merge commit {commit.hexsha[:8]}[/red]")
+                return False
+            changes = self._tree_changes(commit.parents[0].tree, commit.tree)
+            tree_sha = self._write_tree(new_parent.tree, changes) or self._store_tree([])
+            new_parent = Commit.create_from_tree(
+                self.repo,
+                Tree(self.repo, tree_sha),
+                commit.message,
+                parent_commits=[new_parent],
+                head=False,
+                author=commit.author,
+                committer=commit.committer,
+            )
+        
+        self.repo.git.update_ref(f"refs/heads/{branch_name}", new_parent.hexsha, local.hexsha)
+        return True
+
+    def _push_refspecs(self, branch_names: List[str]) -> tuple[List[str], Optional[str]]:
+        """Push branches to origin in a single round-trip.
+        
+        Returns:
+            Tuple of (rejected_branches, error_message)
+        """
+        from git import GitCommandError, PushInfo
+        
+        refspecs = [f"refs/heads/{name}:refs/heads/{name}" for name in branch_names]
+        try:
+            with metrics.phase("push"):
+                results = self.repo.remotes.origin.push(refspecs)
+        except GitCommandError as e:
+            return [], str(e)
+        
+        rejected = []
+        for info in results:
+            name = info.remote_ref_string
+            if name.startswith("refs/heads/"):
+                name = name[len("refs/heads/"):]
+            if info.flags & (PushInfo.REJECTED | PushInfo.REMOTE_REJECTED):
+                rejected.append(name)
+            elif info.flags & PushInfo.ERROR:
+                return rejected, info.summary.strip()
+        return rejected, None
+
+    def _sync_with_remote(self, branch_name: str) -> bool:
+        """Fetch a branch from origin and rebase local commits onto it."""
+        origin = self.repo.remotes.origin
+        if self.is_checked_out(branch_name):
+            # The worktree holds this branch, so let git update it as well
+            with metrics.phase("pull"):
+                self.repo.git.pull("--rebase", "origin", branch_name)
+            return True
+        
+        with metrics.phase("fetch"):
+            origin.fetch(f"refs/heads/{branch_name}:refs/remotes/origin/{branch_name}")
+        upstream = self.repo.commit(f"refs/remotes/origin/{branch_name}")
+        with metrics.phase("rebase"):
+            return self._rebase_onto(branch_name, upstream)
+
     def push(self, branch_name: str) -> bool:
-        """Push changes to remote.
+        """Push a branch to origin without an unconditional pull.
+        
+        The branch is pushed as a fast-forward first. Only if the remote
+        rejects it are the remote changes fetched, the local commits
+        rebased onto them, and the push retried. Every queued commit on the
+        branch goes out in the same round-trip.
         
         Args:
             branch_name: Name of the branch to push
             
         Returns:
-            True if successful, False otherwise
+            True if successful (or no remote is configured), False otherwise
+        """
+        return self.push_branches([branch_name])
+
+    @_locked
+    def push_branches(self, branch_names: List[str]) -> bool:
+        """Push several branches to origin in one round-trip.
+        
+        Args:
+            branch_names: Names of the branches to push
+            
+        Returns:
+            True if successful (or no remote is configured), False otherwise
         """
         try:
             if not self.repo.remotes:
                 console.print("[yellow]⚠ No remote configured[/yellow]")
                 return True
             
-            origin = self.repo.remotes.origin
-            origin.pull(branch_name)
-            origin.push(branch_name)
-            console.print(f"[green]✓ Pushed to origin/{branch_name}[/green]")
+            rejected, error = self._push_refspecs(branch_names)
+            if rejected and error is None:
+                console.print(f"[cyan]Remote has new commits on {', '.join(rejected)}; rebasing...[/cyan]")
+                for name in rejected:
+                    if not self._sync_with_remote(name):
+                        return False
+                rejected, error = self._push_refspecs(rejected)
+            
+            if error is not None or rejected:
+                console.print(f"[red]Error pushing: {error or 'rejected by remote'}[/red]")
+                return False
+            
+            for name in branch_names:
+                console.print(f"[green]✓ Pushed to origin/{name}[/green]")
             return True
         except Exception as e:
-            console.print(f"[yellow]⚠ Push skipped: {e}[/yellow]")
-            return True  # Don't fail if push fails (might not have remote)
+            console.print(f"[red]Error pushing: {e}[/red]")
+            return False
+
+    @_locked
+    def queue_push(self, branch_name: str, queue_path: Path) -> None:
+        """Remember that a branch has commits waiting to be pushed.
+        
+        Args:
+            branch_name: Branch with unpushed commits
+            queue_path: JSON file listing queued branches
+        """
+        queued = self.queued_pushes(queue_path)
+        if branch_name not in queued:
+            queued.append(branch_name)
+        queue_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = queue_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(queued, f)
+        os.replace(tmp_path, queue_path)
+
+    def queued_pushes(self, queue_path: Path) -> List[str]:
+        """List branches waiting to be pushed.
+        
+        Args:
+            queue_path: JSON file listing queued branches
+            
+        Returns:
+            Names of queued branches
+        """
+        try:
+            with open(queue_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return []
+
+    @_locked
+    def push_queued(self, queue_path: Path) -> bool:
+        """Push every queued branch in one round-trip and clear the queue.
+        
+        Args:
+            queue_path: JSON file listing queued branches
+            
+        Returns:
+            True if successful, False otherwise (the queue is kept)
+        """
+        queued = self.queued_pushes(queue_path)
+        if not queued:
+            console.print("[yellow]✓ Nothing to push[/yellow]")
+            return True
+        
+        if not self.push_branches(queued):
+            return False
+        queue_path.unlink(missing_ok=True)
+        return True
 
     def get_current_branch(self) -> str:
         """Get the current branch name.
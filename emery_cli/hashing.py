@@ -0,0 +1,79 @@
+"""Content hashing for Emery CLI."""
+
+import hashlib
+from functools import partial
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Default digest algorithm for content addressing
+DEFAULT_ALGORITHM = "sha256"
+
+# Bytes read per chunk while hashing
+CHUNK_SIZE = 1024 * 1024
+
+
+def hash_file(file_path: Path, algorithm: str = DEFAULT_ALGORITHM) -> str:
+    """Hash a file's contents in fixed-size chunks.
+
+    Args:
+        file_path: Path to the file
+        algorithm: Name of a hashlib algorithm
+
+    Returns:
+        Hex digest of the file contents
+    """
+    digest = hashlib.new(algorithm)
+    with open(file_path, "rb") as f:
+        while True:
+            chunk = f.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def check_algorithm(algorithm: str) -> str:
+    """Make sure hashlib supports an algorithm.
+
+    Args:
+        algorithm: Name of a hashlib algorithm, such as sha256 or blake2b
+
+    Returns:
+        The algorithm name
+
+    Raises:
+        ValueError: If the algorithm is not available
+    """
+    if algorithm not in hashlib.algorithms_available:
+        raise ValueError(f"Unsupported hash algorithm: {algorithm}")
+    return algorithm
+
+
+def _hash_or_none(file_path: Path, algorithm: str) -> Optional[str]:
+    try:
+        return hash_file(file_path, algorithm)
+    except OSError:
+        return None
+
+
+def hash_files(file_paths: List[Path], algorithm: str = DEFAULT_ALGORITHM, jobs: int = 1) -> Dict[Path, Optional[str]]:
+    """Hash many files, spreading them over a pool of worker processes.
+
+    Args:
+        file_paths: Files to hash
+        algorithm: Name of a hashlib algorithm
+        jobs: Number of worker processes
+
+    Returns:
+        Mapping of each path to its hex digest, or None if it could not be read
+    """
+    worker = partial(_hash_or_none, algorithm=algorithm)
+    if jobs <= 1 or len(file_paths) < 2:
+        return {path: worker(path) for path in file_paths}
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    # Hand out work in batches so small files do not pay per-file IPC costs
+    chunksize = max(1, len(file_paths) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return dict(zip(file_paths, pool.map(worker, file_paths, chunksize=chunksize)))
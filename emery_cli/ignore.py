@@ -0,0 +1,321 @@
+"""Ignore rules and filters for folder uploads.
+
+Patterns use .gitignore syntax and are read from every .gitignore and
+.emeryignore found in an uploaded folder; patterns in deeper directories
+take precedence, and the last matching pattern of a file wins. Each file's
+patterns are compiled once into a few combined regular expressions.
+Directories are matched while the folder is walked, so an ignored
+directory is never entered.
+"""
+
+import os
+import re
+import time
+from datetime import datetime
+from typing import Iterable, List, Optional, Sequence
+
+# Ignore files read from each directory, in increasing order of precedence
+IGNORE_FILES = (".gitignore", ".emeryignore")
+
+# Ignored unless ignore rules are turned off: version control data,
+# dependency directories, tool caches and OS clutter. Output directories
+# with generic names (build/, dist/, target/) often hold real content, so
+# they are left to .gitignore files and --exclude
+DEFAULT_PATTERNS = (
+    ".git/",
+    ".hg/",
+    ".svn/",
+    "node_modules/",
+    "bower_components/",
+    ".venv/",
+    ".tox/",
+    ".nox/",
+    "__pycache__/",
+    "*.py[co]",
+    ".mypy_cache/",
+    ".pytest_cache/",
+    ".ruff_cache/",
+    ".gradle/",
+    ".next/",
+    ".parcel-cache/",
+    ".DS_Store",
+    "Thumbs.db",
+)
+
+# Suffixes accepted by parse_time, in seconds
+_TIME_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 7 * 86400}
+
+# Tuple of (rel_dir_prefix, IgnoreRules), outermost directory first
+RuleChain = tuple
+
+
+def _translate(pattern: str) -> str:
+    """Translate a gitignore glob (without anchoring) into a regular expression."""
+    out = []
+    i = 0
+    n = len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == "*":
+            if pattern.startswith("**/", i):
+                # Zero or more directories
+                out.append("(?:.*/)?")
+                i += 3
+                continue
+            if pattern.startswith("**", i):
+                out.append(".*")
+                i += 2
+                continue
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            end = pattern.find("]", i + 2 if pattern.startswith("[!", i) or pattern.startswith("[]", i) else i + 1)
+            if end < 0:
+                out.append(re.escape(c))
+            else:
+                body = pattern[i + 1:end]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                out.append("[" + body.replace("\\", "\\\\") + "]")
+                i = end
+        elif c == "\\" and i + 1 < n:
+            out.append(re.escape(pattern[i + 1]))
+            i += 1
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return "".join(out)
+
+
+def compile_pattern(pattern: str) -> tuple[str, bool]:
+    """Compile one gitignore pattern (without its "!" prefix).
+
+    Returns:
+        Tuple of (regex_source, dir_only); the regex matches paths
+        relative to the directory holding the pattern
+    """
+    dir_only = pattern.endswith("/")
+    pattern = pattern.rstrip("/")
+    # A slash anywhere but the end anchors the pattern to its directory
+    anchored = "/" in pattern
+    regex = _translate(pattern.lstrip("/"))
+    return (regex if anchored else f"(?:.*/)?{regex}"), dir_only
+
+
+class IgnoreRules:
+    """Compiled patterns of one ignore file."""
+
+    def __init__(self, lines: Iterable[str]):
+        """Compile patterns.
+
+        Consecutive patterns of the same kind are merged into one regular
+        expression, so matching costs a handful of regex searches however
+        many patterns there are.
+
+        Args:
+            lines: Lines in .gitignore syntax
+        """
+        # (regex, negated, dir_only), in file order
+        self._groups: List[tuple] = []
+        pending: List[str] = []
+        kind = None
+        for line in lines:
+            line = line.rstrip("\n")
+            if not line.endswith("\\ "):
+                line = line.rstrip()
+            if not line or line.startswith("#"):
+                continue
+            negated = line.startswith("!")
+            if negated or line.startswith("\\!") or line.startswith("\\#"):
+                line = line[1:]
+            regex, dir_only = compile_pattern(line)
+            if (negated, dir_only) != kind and pending:
+                self._groups.append((re.compile("|".join(pending)), *kind))
+                pending = []
+            kind = (negated, dir_only)
+            pending.append(f"(?:{regex})")
+        if pending:
+            self._groups.append((re.compile("|".join(pending)), *kind))
+
+    def __bool__(self) -> bool:
+        return bool(self._groups)
+
+    @classmethod
+    def from_file(cls, path: str) -> Optional["IgnoreRules"]:
+        """Read an ignore file, returning None if it is unreadable or has no patterns."""
+        try:
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                rules = cls(f)
+        except OSError:
+            return None
+        return rules or None
+
+    def match(self, rel_path: str, is_dir: bool) -> Optional[bool]:
+        """Check a path against the patterns.
+
+        Args:
+            rel_path: POSIX path relative to the directory of the ignore file
+            is_dir: Whether the path is a directory
+
+        Returns:
+            True if ignored, False if re-included by a "!" pattern, None if
+            no pattern matches
+        """
+        for regex, negated, dir_only in reversed(self._groups):
+            if dir_only and not is_dir:
+                continue
+            if regex.fullmatch(rel_path):
+                return not negated
+        return None
+
+
+def parse_time(value: str) -> float:
+    """Parse an age such as "7d", "12h" or "30m", or a date such as "2024-05-01".
+
+    Args:
+        value: Age (s, m, h, d or w suffix) or ISO date/time
+
+    Returns:
+        The point in time as a Unix timestamp
+
+    Raises:
+        ValueError: If the value cannot be parsed
+    """
+    value = value.strip()
+    unit = _TIME_UNITS.get(value[-1:].lower())
+    if unit is not None and value[:-1].replace(".", "", 1).isdigit():
+        return time.time() - float(value[:-1]) * unit
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        raise ValueError(f"Not an age (like 7d, 12h) or date (like 2024-05-01): {value}") from None
+
+
+class FileFilter:
+    """Decide which files of an uploaded folder are scanned and uploaded.
+
+    Ignore rules (built-in defaults, .gitignore/.emeryignore files and
+    exclude patterns) apply to files and directories; ignored directories
+    are pruned from the walk. Include patterns and the size and mtime
+    limits apply to files only.
+    """
+
+    def __init__(
+        self,
+        use_ignore_files: bool = True,
+        excludes: Sequence[str] = (),
+        includes: Sequence[str] = (),
+        min_size: Optional[int] = None,
+        max_size: Optional[int] = None,
+        newer_than: Optional[float] = None,
+        older_than: Optional[float] = None,
+    ):
+        """Initialize file filter.
+
+        Args:
+            use_ignore_files: Apply the default patterns and read ignore files
+            excludes: Extra patterns to ignore, overriding ignore files
+            includes: If given, only files matching one of these patterns are kept
+            min_size: Skip files smaller than this many bytes
+            max_size: Skip files larger than this many bytes
+            newer_than: Skip files modified before this timestamp
+            older_than: Skip files modified after this timestamp
+        """
+        self.use_ignore_files = use_ignore_files
+        self._defaults = IgnoreRules(DEFAULT_PATTERNS) if use_ignore_files else None
+        self._excludes = IgnoreRules(excludes) if excludes else None
+        self._includes = IgnoreRules(includes) if includes else None
+        self.min_size = min_size
+        self.max_size = max_size
+        self.newer_than = newer_than
+        self.older_than = older_than
+
+    def extend(self, chain: RuleChain, prefix: str, dir_path: str, names: Optional[Iterable[str]] = None) -> RuleChain:
+        """Add the ignore files of a directory to the rules inherited from its parents.
+
+        Args:
+            chain: Rules in effect for the directory's parent
+            prefix: Path of the directory relative to the root, with a trailing "/"
+                ("" for the root)
+            dir_path: Path of the directory on disk
+            names: Names of the directory's entries, if already listed
+
+        Returns:
+            Rules in effect inside the directory
+        """
+        if not self.use_ignore_files:
+            return chain
+        if not chain and self._defaults:
+            chain = (("", self._defaults),)
+        for name in IGNORE_FILES:
+            if names is not None and name not in names:
+                continue
+            rules = IgnoreRules.from_file(os.path.join(dir_path, name))
+            if rules is not None:
+                chain = chain + ((prefix, rules),)
+        return chain
+
+    def ignored(self, chain: RuleChain, rel_path: str, is_dir: bool) -> bool:
+        """Check whether a path is excluded by the ignore rules.
+
+        Args:
+            chain: Rules in effect in the path's directory
+            rel_path: POSIX path relative to the root
+            is_dir: Whether the path is a directory
+        """
+        if self._excludes is not None and self._excludes.match(rel_path, is_dir):
+            return True
+        for prefix, rules in reversed(chain):
+            result = rules.match(rel_path[len(prefix):], is_dir)
+            if result is not None:
+                return result
+        return False
+
+    def keep(self, rel_path: str, size: int, mtime: float) -> bool:
+        """Check a file that is not ignored against the include, size and mtime filters."""
+        if self._includes is not None and not self._includes.match(rel_path, False):
+            return False
+        if self.min_size is not None and size < self.min_size:
+            return False
+        if self.max_size is not None and size > self.max_size:
+            return False
+        if self.newer_than is not None and mtime < self.newer_than:
+            return False
+        if self.older_than is not None and mtime > self.older_than:
+            return False
+        return True
+
+    def chain_for(self, root: str, rel_dir: str) -> Optional[RuleChain]:
+        """Rules inherited by a directory from the root and its ancestors.
+
+        The directory's own ignore files are not included; extend() adds
+        them when the directory is listed.
+
+        Args:
+            root: Root directory on disk
+            rel_dir: POSIX path of the directory relative to root ("" for root)
+
+        Returns:
+            Rules in effect for the directory's entries' parent, or None if
+            the directory or one of its ancestors is ignored
+        """
+        chain: RuleChain = ()
+        if not rel_dir:
+            return chain
+        prefix = ""
+        for part in rel_dir.split("/"):
+            chain = self.extend(chain, prefix, os.path.join(root, prefix))
+            if self.ignored(chain, prefix + part, True):
+                return None
+            prefix += part + "/"
+        return chain
+
+    def accepts(self, root: str, rel_path: str, size: int, mtime: float) -> bool:
+        """Check a single file, including the ignore rules of all its ancestors."""
+        rel_dir, _, _ = rel_path.rpartition("/")
+        chain = self.chain_for(root, rel_dir)
+        if chain is None:
+            return False
+        chain = self.extend(chain, f"{rel_dir}/" if rel_dir else "", os.path.join(root, rel_dir))
+        return not self.ignored(chain, rel_path, False) and self.keep(rel_path, size, mtime)
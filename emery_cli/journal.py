@@ -0,0 +1,206 @@
+"""Write-ahead journal for resumable uploads."""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from emery_cli.locking import FileLock
+
+# Phases a file moves through during an upload, in order
+PHASE_SCANNED = "scanned"
+PHASE_RESERVED = "reserved"
+PHASE_COPIED = "copied"
+PHASE_STAGED = "staged"
+PHASE_COMMITTED = "committed"
+PHASE_PUSHED = "pushed"
+
+
+class JournalState:
+    """Progress of an interrupted upload, replayed from its journal."""
+
+    def __init__(self):
+        self.branch: Optional[str] = None
+        self.message: Optional[str] = None
+        # Source paths scanned at the start of the upload, in order
+        self.sources: List[str] = []
+        # Source path -> (copied files, removed files)
+        self.copied: Dict[str, tuple[List[str], List[str]]] = {}
+        # Source path -> destination claimed for it before a batch copy
+        self.reserved: Dict[str, str] = {}
+        self.committed: set = set()
+        self.pushed = False
+        # Where an upload from a path list stands in that list (see main.upload_list)
+        self.listing: Optional[dict] = None
+
+    def pending_sources(self) -> List[str]:
+        """Sources that were scanned but not fully copied."""
+        return [source for source in self.sources if source not in self.copied]
+
+    def uncommitted_files(self) -> tuple[List[str], List[str]]:
+        """Copied files and removals that were not committed yet.
+
+        Returns:
+            Tuple of (file_paths, removed_paths)
+        """
+        files = []
+        removed = []
+        for copied, deleted in self.copied.values():
+            files.extend(path for path in copied if path not in self.committed)
+            removed.extend(path for path in deleted if path not in self.committed)
+        return files, removed
+
+
+class UploadJournal:
+    """Append-only JSON-lines log of every phase of an upload.
+
+    Each event is flushed and fsynced before the upload moves on, so an
+    interrupted run can be resumed from the last completed step.
+    """
+
+    def __init__(self, journal_path: Path):
+        """Initialize upload journal.
+
+        Args:
+            journal_path: JSON-lines file holding the journal
+        """
+        self.journal_path = journal_path
+        # There is one journal per repository, so journaled uploads hold
+        # this lock from start to finish and take turns
+        self.lock = FileLock(journal_path.with_suffix(".lock"))
+
+    def _append(self, event: dict) -> None:
+        with open(self.journal_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(event) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def start(
+        self, sources: List[Path], branch: str, message: Optional[str], listing: Optional[dict] = None
+    ) -> None:
+        """Begin a new upload, replacing any previous journal.
+
+        Callers make sure the previous upload was finished, resumed or
+        explicitly discarded first.
+
+        Args:
+            sources: Files and folders being uploaded
+            branch: Branch the upload commits to
+            message: Custom commit message, if any
+            listing: Position of these sources in a path list, if read from one
+        """
+        self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+        self.journal_path.unlink(missing_ok=True)
+        event = {
+            "phase": PHASE_SCANNED,
+            "sources": [str(source) for source in sources],
+            "branch": branch,
+            "message": message,
+        }
+        if listing is not None:
+            event["listing"] = listing
+        self._append(event)
+
+    def record_copied(self, source: Path, copied_files: List[Path], removed_files: List[Path] = ()) -> None:
+        """Record that every file of one source was copied.
+
+        Args:
+            source: File or folder that was uploaded
+            copied_files: Destination files written for it
+            removed_files: Destination files deleted for it
+        """
+        self._append(
+            {
+                "phase": PHASE_COPIED,
+                "source": str(source),
+                "files": [str(path) for path in copied_files],
+                "removed": [str(path) for path in removed_files],
+            }
+        )
+
+    def record_reserved(self, pairs: List[tuple[Path, Path]]) -> None:
+        """Record the destinations claimed for a batch before it is copied.
+
+        A resumed upload reuses the destinations whose copy finished
+        instead of copying those files again under new names.
+
+        Args:
+            pairs: (source, dest) tuples of the batch
+        """
+        self._append({"phase": PHASE_RESERVED, "files": {str(source): str(dest) for source, dest in pairs}})
+
+    def record_copied_many(self, sources: List[Path], copied_files: List[Path]) -> None:
+        """Record that several sources were copied together.
+
+        Args:
+            sources: Files copied as one batch
+            copied_files: Destination files written for all of them
+        """
+        if sources:
+            self._append(
+                {
+                    "phase": PHASE_COPIED,
+                    "sources": [str(source) for source in sources],
+                    "files": [str(path) for path in copied_files],
+                    "removed": [],
+                }
+            )
+
+    def record_files(self, phase: str, file_paths: List) -> None:
+        """Record that a batch of files reached a phase.
+
+        Args:
+            phase: PHASE_STAGED or PHASE_COMMITTED
+            file_paths: Files (or removed paths) in the batch
+        """
+        self._append({"phase": phase, "files": [str(path) for path in file_paths]})
+
+    def record_pushed(self) -> None:
+        """Record that the upload's commits were pushed."""
+        self._append({"phase": PHASE_PUSHED})
+
+    def finish(self) -> None:
+        """Remove the journal once the upload is complete."""
+        self.journal_path.unlink(missing_ok=True)
+
+    def load(self) -> Optional[JournalState]:
+        """Replay the journal of an interrupted upload.
+
+        A truncated final line, left by a crash mid-write, is ignored.
+
+        Returns:
+            State of the upload, or None if there is no journal
+        """
+        try:
+            with open(self.journal_path, "r", encoding="utf-8") as f:
+                lines = f.readlines()
+        except OSError:
+            return None
+
+        state = JournalState()
+        for line in lines:
+            try:
+                event = json.loads(line)
+            except ValueError:
+                break
+
+            phase = event.get("phase")
+            if phase == PHASE_SCANNED:
+                state.sources = event["sources"]
+                state.branch = event["branch"]
+                state.message = event["message"]
+                state.listing = event.get("listing")
+            elif phase == PHASE_RESERVED:
+                state.reserved.update(event["files"])
+            elif phase == PHASE_COPIED:
+                sources = event["sources"] if "sources" in event else [event["source"]]
+                # Files of a batch are attributed to its first source
+                state.copied[sources[0]] = (event["files"], event["removed"])
+                for source in sources[1:]:
+                    state.copied[source] = ([], [])
+            elif phase == PHASE_COMMITTED:
+                state.committed.update(event["files"])
+            elif phase == PHASE_PUSHED:
+                state.pushed = True
+
+        return state if state.branch is not None else None
@@ -0,0 +1,95 @@
+"""Inter-process file locks for Emery CLI."""
+
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+
+class FileLock:
+    """Exclusive advisory lock held on a lock file, across threads and processes.
+
+    The lock is re-entrant within a process: nested acquisitions by the
+    thread holding it succeed immediately, and the file lock is released
+    when the outermost one is. The operating system drops the lock if the
+    process dies, so a crashed upload never leaves it stuck. Where fcntl
+    is unavailable only threads of the same process are serialized.
+    """
+
+    def __init__(self, lock_path: Path):
+        """Initialize file lock.
+
+        Args:
+            lock_path: File to lock (created if missing)
+        """
+        self.lock_path = lock_path
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._fd: Optional[int] = None
+
+    def acquire(self, blocking: bool = True, timeout: Optional[float] = None) -> bool:
+        """Take the lock.
+
+        Args:
+            blocking: Wait for the lock; if False, give up at once when it is held
+            timeout: Longest time to wait in seconds (no limit if None)
+
+        Returns:
+            True if the lock was taken, False otherwise
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        if not self._thread_lock.acquire(blocking, timeout if blocking and timeout is not None else -1):
+            return False
+
+        if self._depth == 0 and not self._lock_file(blocking, deadline):
+            self._thread_lock.release()
+            return False
+        self._depth += 1
+        return True
+
+    def _lock_file(self, blocking: bool, deadline: Optional[float]) -> bool:
+        if fcntl is None:
+            return True
+
+        self.lock_path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if blocking and deadline is None:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            else:
+                while True:
+                    try:
+                        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                        break
+                    except BlockingIOError:
+                        if not blocking or time.monotonic() >= deadline:
+                            os.close(fd)
+                            return False
+                        time.sleep(0.05)
+        except BaseException:
+            os.close(fd)
+            raise
+        self._fd = fd
+        return True
+
+    def release(self) -> None:
+        """Release one acquisition of the lock."""
+        self._depth -= 1
+        if self._depth == 0 and self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+        self._thread_lock.release()
+
+    def __enter__(self) -> "FileLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.release()
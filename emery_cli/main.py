@@ -1,17 +1,59 @@
-"""Main CLI application for Emery."""
+"""Main CLI application for Emery.
+
+Heavy dependencies (GitPython, tkinter, Rich progress widgets and the
+upload machinery) are imported inside the commands that use them, so
+commands like `info` and `clean` start quickly.
+"""
 
 import sys
+import threading
+from contextlib import contextmanager
+from enum import Enum
 from pathlib import Path
-from typing import Optional, List
+from typing import TYPE_CHECKING, Dict, Iterator, Optional, List
 import typer
 from rich.console import Console
 from rich.panel import Panel
-from rich.progress import Progress
 from rich.text import Text
 
-from emery_cli.config import MAX_FILE_SIZE_MB, TARGET_BRANCH, REPO_ROOT, FILES_DIR, GIT_AUTHOR_NAME, GIT_AUTHOR_EMAIL
-from emery_cli.file_handler import FileHandler
-from emery_cli.git_handler import GitHandler
+from emery_cli.config import (
+    MAX_FILE_SIZE_MB,
+    COPY_JOBS,
+    COPY_BUFFER_SIZE,
+    TARGET_BRANCH,
+    REPO_ROOT,
+    FILES_DIR,
+    DEDUP_INDEX_PATH,
+    CHECKSUMS_PATH,
+    HASH_ALGORITHM,
+    PACK_THRESHOLD_KB,
+    CHUNK_STORE_DIR,
+    CHUNK_SIZE_KB,
+    SUMMARY_PATH,
+    TRASH_DIR,
+    MANIFEST_CACHE_DIR,
+    JOURNAL_PATH,
+    PUSH_STRATEGY,
+    PUSH_QUEUE_PATH,
+    LIST_BATCH_FILES,
+    SPOOL,
+    SPOOL_DIR,
+    NAMING_STRATEGY,
+    NAMING_COUNTERS_PATH,
+    METRICS_FILE,
+    GIT_AUTHOR_NAME,
+    GIT_AUTHOR_EMAIL,
+)
+
+if TYPE_CHECKING:
+    from rich.progress import Progress, TaskID
+    
+    from emery_cli.file_handler import FileHandler
+    from emery_cli.git_handler import GitHandler
+    from emery_cli.journal import JournalState, UploadJournal
+    from emery_cli.path_list import ListEntry
+    from emery_cli.spool import UploadSpool
+    from emery_cli.watcher import LiveManifest
 
 app = typer.Typer(
     name="emery",
@@ -22,6 +64,14 @@ app = typer.Typer(
 console = Console()
 
 
+class PushStrategy(str, Enum):
+    """When upload commits are pushed to the remote."""
+    
+    NOW = "now"
+    DEFER = "defer"
+    BACKGROUND = "background"
+
+
 def show_banner() -> None:
     """Display application banner."""
     banner = Text("✨ EMERY", justify="center", style="bold cyan")
@@ -70,11 +120,248 @@ def open_file_picker() -> List[Path]:
         return []
 
 
+def make_progress_callback(progress: "Progress", task: "TaskID"):
+    """Build a thread-safe copy progress callback that drives a Rich task.
+    
+    Args:
+        progress: Progress display
+        task: Task tracking bytes, with a "files" field
+        
+    Returns:
+        Callback taking (bytes_copied, files_copied) increments
+    """
+    lock = threading.Lock()
+    files_done = 0
+    
+    def on_progress(bytes_copied: int, files_copied: int) -> None:
+        nonlocal files_done
+        with lock:
+            files_done += files_copied
+            progress.update(task, advance=bytes_copied, files=files_done)
+    
+    return on_progress
+
+
+def validate_hash_algorithm(algorithm: Optional[str]) -> Optional[str]:
+    """Reject hash algorithms hashlib does not provide."""
+    if algorithm is None:
+        return None
+    
+    from emery_cli.hashing import check_algorithm
+    
+    try:
+        return check_algorithm(algorithm.lower())
+    except ValueError as e:
+        raise typer.BadParameter(str(e))
+
+
+def validate_pack_format(pack_format: Optional[str]) -> Optional[str]:
+    """Reject unknown pack formats and formats whose compressor is missing."""
+    if pack_format is None:
+        return None
+    
+    from emery_cli.packer import check_format
+    
+    try:
+        return check_format(pack_format.lower())
+    except ValueError as e:
+        raise typer.BadParameter(str(e))
+
+
+def validate_chunk_mode(mode: Optional[str]) -> Optional[str]:
+    """Reject unknown chunking modes."""
+    if mode is None:
+        return None
+    
+    from emery_cli.chunker import check_mode
+    
+    try:
+        return check_mode(mode.lower())
+    except ValueError as e:
+        raise typer.BadParameter(str(e))
+
+
+def validate_naming(strategy: str) -> str:
+    """Reject unknown naming strategies."""
+    from emery_cli.naming import check_strategy
+    
+    try:
+        return check_strategy(strategy.lower())
+    except ValueError as e:
+        raise typer.BadParameter(str(e))
+
+
+def validate_list_format(list_format: str) -> str:
+    """Reject unknown path list formats."""
+    from emery_cli.path_list import check_format
+    
+    try:
+        return check_format(list_format.lower())
+    except ValueError as e:
+        raise typer.BadParameter(str(e))
+
+
+def validate_time(value: Optional[str]) -> Optional[float]:
+    """Turn an age (7d, 12h) or date (2024-05-01) into a timestamp."""
+    if value is None:
+        return None
+    
+    from emery_cli.ignore import parse_time
+    
+    try:
+        return parse_time(value)
+    except ValueError as e:
+        raise typer.BadParameter(str(e))
+
+
+def build_file_filter(
+    use_ignore_files: bool,
+    excludes: Optional[List[str]],
+    includes: Optional[List[str]],
+    min_size_kb: Optional[int],
+    max_size_kb: Optional[int],
+    newer_than: Optional[float],
+    older_than: Optional[float],
+):
+    """Create the FileFilter for folder uploads, or None if nothing is filtered."""
+    if not (use_ignore_files or excludes or includes) and min_size_kb is None and max_size_kb is None \
+            and newer_than is None and older_than is None:
+        return None
+    
+    from emery_cli.ignore import FileFilter
+    
+    return FileFilter(
+        use_ignore_files=use_ignore_files,
+        excludes=excludes or (),
+        includes=includes or (),
+        min_size=min_size_kb * 1024 if min_size_kb is not None else None,
+        max_size=max_size_kb * 1024 if max_size_kb is not None else None,
+        newer_than=newer_than,
+        older_than=older_than,
+    )
+
+
+def show_stats() -> None:
+    """Print the time, files and bytes of every phase recorded so far."""
+    from rich.table import Table
+    
+    from emery_cli.metrics import metrics
+    
+    table = Table(title="Upload phases", title_justify="left")
+    table.add_column("Phase")
+    table.add_column("Calls", justify="right")
+    table.add_column("Seconds", justify="right")
+    table.add_column("Files", justify="right")
+    table.add_column("MB", justify="right")
+    table.add_column("MB/s", justify="right")
+    for name, stats in metrics.snapshot().items():
+        mb = stats["bytes"] / (1024 * 1024)
+        rate = f"{mb / stats['seconds']:.1f}" if stats["bytes"] and stats["seconds"] else "-"
+        table.add_row(
+            name,
+            str(stats["calls"]),
+            f"{stats['seconds']:.3f}",
+            str(stats["files"]) if stats["files"] else "-",
+            f"{mb:.1f}" if stats["bytes"] else "-",
+            rate,
+        )
+    console.print(table)
+
+
+def report_metrics(command: str, stats: bool, metrics_file: Optional[Path], start: float) -> None:
+    """Record a command's total time, then show and/or write its metrics.
+    
+    Args:
+        command: Command that ran, such as "upload"
+        stats: Print a table of the phases
+        metrics_file: File to write the metrics to, if any
+        start: time.perf_counter() when the command started
+    """
+    import time
+    
+    from emery_cli.metrics import metrics
+    
+    metrics.record("total", time.perf_counter() - start)
+    if stats:
+        show_stats()
+    if metrics_file is not None:
+        try:
+            metrics.write(metrics_file, command)
+        except OSError as e:
+            console.print(f"[yellow]⚠ Could not write metrics to {metrics_file}: {e}[/yellow]")
+
+
 @app.command()
 def upload(
+    ctx: typer.Context,
     files: Optional[List[Path]] = typer.Argument(None, help="Optional: Files or folders to upload (if not provided, opens file picker)"),
     auto_commit: bool = typer.Option(True, "--commit/--no-commit", help="Auto-commit and push changes"),
     message: Optional[str] = typer.Option(None, "-m", "--message", help="Custom commit message"),
+    jobs: int = typer.Option(COPY_JOBS, "-j", "--jobs", min=1, help="Number of files to copy in parallel"),
+    hardlink: bool = typer.Option(False, "--hardlink", help="Hardlink files instead of copying when on the same filesystem"),
+    dedup: bool = typer.Option(False, "--dedup", help="Skip files whose content is already stored"),
+    full: bool = typer.Option(False, "--full", help="Re-copy every file of a folder, even if unchanged since the last upload"),
+    checksum: bool = typer.Option(False, "--checksum", help="Compare content hashes when a folder file's mtime changed"),
+    delete: bool = typer.Option(False, "--delete", help="Remove uploaded files whose source was deleted from the folder"),
+    shard_files: int = typer.Option(0, "--shard-files", min=0, help="Split the upload into commits of at most N files"),
+    shard_size: int = typer.Option(0, "--shard-size", min=0, help="Split the upload into commits of at most N MB"),
+    resume: bool = typer.Option(False, "--resume", help="Resume an interrupted upload where it stopped"),
+    discard: bool = typer.Option(False, "--discard", help="Drop an interrupted upload instead of resuming it"),
+    push_strategy: PushStrategy = typer.Option(
+        PUSH_STRATEGY, "--push", help="Push now, defer until 'emery push', or push in the background"
+    ),
+    spool: bool = typer.Option(
+        SPOOL, "--spool/--no-spool", help="Hand the commit to a single committer shared with concurrent uploads"
+    ),
+    hash_algorithm: Optional[str] = typer.Option(
+        HASH_ALGORITHM, "--hash", callback=validate_hash_algorithm, help="Record checksums (e.g. sha256, blake2b) for 'emery verify'"
+    ),
+    pack: Optional[str] = typer.Option(
+        None, "--pack", callback=validate_pack_format, help="Store small folder files in a compressed pack: tar, zip or zstd"
+    ),
+    pack_threshold: int = typer.Option(
+        PACK_THRESHOLD_KB, "--pack-threshold", min=1, help="Pack folder files smaller than N KB"
+    ),
+    chunk: Optional[str] = typer.Option(
+        None, "--chunk", callback=validate_chunk_mode, help="Store files over the size limit as deduplicated chunks: cdc or fixed"
+    ),
+    chunk_size: int = typer.Option(CHUNK_SIZE_KB, "--chunk-size", min=64, help="Average chunk size in KB"),
+    naming: str = typer.Option(
+        NAMING_STRATEGY, "--naming", callback=validate_naming,
+        help="Rename files whose name is taken by: counter, hash, timestamp or subdir (one folder per upload)",
+    ),
+    exclude: Optional[List[str]] = typer.Option(
+        None, "--exclude", help="Skip folder paths matching this .gitignore-style pattern (repeatable)"
+    ),
+    include: Optional[List[str]] = typer.Option(
+        None, "--include", help="Only upload folder files matching this .gitignore-style pattern (repeatable)"
+    ),
+    min_size: Optional[int] = typer.Option(None, "--min-size", min=0, help="Skip folder files smaller than N KB"),
+    max_size: Optional[int] = typer.Option(None, "--max-size", min=0, help="Skip folder files larger than N KB"),
+    newer_than: Optional[str] = typer.Option(
+        None, "--newer-than", callback=validate_time, help="Only upload folder files modified within an age (7d, 12h) or since a date"
+    ),
+    older_than: Optional[str] = typer.Option(
+        None, "--older-than", callback=validate_time, help="Only upload folder files modified before an age (7d, 12h) or a date"
+    ),
+    ignore_files: bool = typer.Option(
+        True, "--ignore/--no-ignore", help="Honour .gitignore/.emeryignore files and skip .git, node_modules, .venv, tool caches and the like"
+    ),
+    from_file: Optional[str] = typer.Option(
+        None, "--from-file", help="Upload the paths listed in this file ('-' for stdin) instead of arguments"
+    ),
+    stdin: bool = typer.Option(False, "--stdin", help="Upload the paths listed on standard input (same as --from-file -)"),
+    list_format: str = typer.Option(
+        "lines", "--list-format", callback=validate_list_format,
+        help="Format of --from-file/--stdin lists: lines, nul (as from find -print0) or jsonl (with per-path \"dest\")",
+    ),
+    batch_files: int = typer.Option(
+        LIST_BATCH_FILES, "--batch-files", min=1, help="With --from-file/--stdin, copy and commit every N listed paths"
+    ),
+    stats: bool = typer.Option(False, "--stats", help="Show the time, files and bytes of every upload phase"),
+    metrics_file: Optional[Path] = typer.Option(
+        METRICS_FILE, "--metrics-file", help="Write phase metrics to this file (.prom: Prometheus text format, else JSON lines)"
+    ),
 ) -> None:
     """
     Upload files and folders to the repository.
@@ -87,11 +374,90 @@ def upload(
         emery upload my_folder/
         emery upload --no-commit large_folder/
         emery upload -m "Add project files" my_project/
+        emery upload --jobs 16 large_folder/
+        emery upload --dedup assets/
+        emery upload --delete my_folder/
+        emery upload --shard-files 5000 huge_folder/
+        emery upload --resume
+        emery upload --discard my_folder/
+        emery upload --push defer my_folder/
+        emery upload --hash blake2b my_folder/
+        emery upload --pack zstd --pack-threshold 128 many_small_files/
+        emery upload --chunk cdc disk_image.iso
+        emery upload --naming subdir */report.pdf
+        emery upload --spool new_scans/
+        emery upload --stats --metrics-file upload.prom my_folder/
+        emery upload --exclude "*.log" --exclude build/ my_project/
+        emery upload --include "*.jpg" --newer-than 7d photos/
+        find /data -name "*.csv" -print0 | emery upload --stdin --list-format nul
+        emery upload --from-file uploads.jsonl --list-format jsonl
     """
+    import time
+    
+    from emery_cli.checksums import ChecksumManifest
+    from emery_cli.dedup import DedupIndex
+    from emery_cli.file_handler import FileHandler
+    from emery_cli.journal import UploadJournal
+    from emery_cli.manifest_cache import ManifestCache
+    from emery_cli.spool import UploadSpool
+    from emery_cli.summary import StorageSummary
+    
     show_banner()
     
-    # If no files provided, open file picker
-    if not files:
+    if resume and spool:
+        console.print("[red]✗ --resume cannot be combined with --spool; spooled uploads are committed by 'emery commit'[/red]")
+        raise typer.Exit(1)
+    if resume and discard:
+        console.print("[red]✗ --resume and --discard cannot be combined[/red]")
+        raise typer.Exit(1)
+    
+    if stdin:
+        from_file = "-"
+    if from_file is not None and (files or resume):
+        console.print("[red]✗ --from-file/--stdin cannot be combined with paths or --resume[/red]")
+        raise typer.Exit(1)
+    if from_file not in (None, "-") and not Path(from_file).is_file():
+        console.print(f"[red]✗ Path list not found: {from_file}[/red]")
+        raise typer.Exit(1)
+    
+    if stats or metrics_file is not None:
+        # Runs however the command ends, including the early returns below
+        start = time.perf_counter()
+        ctx.call_on_close(lambda: report_metrics("upload", stats, metrics_file, start))
+    
+    # Uploads that commit are journaled so an interrupted run can be resumed;
+    # spooled uploads are recorded in the spool instead
+    journal = UploadJournal(JOURNAL_PATH) if auto_commit and not spool else None
+    state = None
+    
+    if journal is not None:
+        if not journal.lock.acquire(blocking=False):
+            console.print("[cyan]Waiting for another upload to finish (--spool uploads run concurrently)...[/cyan]")
+            journal.lock.acquire()
+        ctx.call_on_close(journal.lock.release)
+    
+    if journal is not None and not resume and journal.load() is not None:
+        # Starting a new upload would drop the files the interrupted one has not committed
+        if not discard:
+            console.print(
+                "[red]✗ An interrupted upload is pending; run 'emery upload --resume' to finish it "
+                "or add --discard to drop it[/red]"
+            )
+            raise typer.Exit(1)
+        journal.finish()
+        console.print("[yellow]Discarded the interrupted upload[/yellow]")
+    if discard and not files and from_file is None:
+        return
+    
+    if resume:
+        state = journal.load() if journal is not None else None
+        if state is None:
+            console.print("[yellow]✓ Nothing to resume[/yellow]")
+            return
+        files = [Path(source) for source in state.pending_sources()]
+        message = message or state.message
+    elif not files and from_file is None:
+        # If no files provided, open file picker
         console.print("[cyan]📂 Opening file picker...[/cyan]")
         files = open_file_picker()
         
@@ -109,121 +475,1072 @@ def upload(
                 console.print(f"  📄 {f.name}")
     
     # Initialize handlers
-    file_handler = FileHandler(MAX_FILE_SIZE_MB)
-    git_handler = GitHandler(REPO_ROOT)
+    file_filter = build_file_filter(ignore_files, exclude, include, min_size, max_size, newer_than, older_than)
+    dedup_index = DedupIndex(DEDUP_INDEX_PATH, FILES_DIR) if dedup else None
+    manifest_cache = None if full else ManifestCache(MANIFEST_CACHE_DIR, checksum=checksum)
+    checksums = ChecksumManifest(CHECKSUMS_PATH, FILES_DIR, hash_algorithm) if hash_algorithm else None
+    file_handler = FileHandler(
+        MAX_FILE_SIZE_MB,
+        jobs=jobs,
+        allow_hardlink=hardlink,
+        dedup_index=dedup_index,
+        manifest_cache=manifest_cache,
+        delete_missing=delete,
+        buffer_size=COPY_BUFFER_SIZE,
+        checksums=checksums,
+        pack_format=pack,
+        pack_threshold=pack_threshold * 1024,
+        chunk_mode=chunk,
+        chunk_size=chunk_size * 1024,
+        chunk_store_dir=CHUNK_STORE_DIR,
+        naming=naming,
+        naming_counters=NAMING_COUNTERS_PATH,
+        summary=StorageSummary(SUMMARY_PATH, FILES_DIR),
+        file_filter=file_filter,
+    )
+    git_handler = None
+    if auto_commit:
+        # Copies alone do not need GitPython
+        from emery_cli.git_handler import GitHandler
+        
+        git_handler = GitHandler(REPO_ROOT)
     
     # Ensure files directory exists
     FILES_DIR.mkdir(parents=True, exist_ok=True)
     
-    # Process files and directories
-    with Progress(transient=True) as progress:
-        task = progress.add_task("[cyan]Processing files and folders...", total=len(files))
+    if from_file is not None or (state is not None and state.listing is not None):
+        if state is not None:
+            listing = state.listing
+        else:
+            source = from_file if from_file == "-" else str(Path(from_file).resolve())
+            listing = {"source": source, "format": list_format, "base_dir": str(Path.cwd()), "position": 0}
+        upload_list(
+            file_handler,
+            git_handler,
+            journal,
+            UploadSpool(SPOOL_DIR) if auto_commit and spool else None,
+            auto_commit,
+            listing,
+            batch_files,
+            message,
+            push_strategy,
+            shard_files,
+            shard_size,
+            state,
+        )
+        return
+    
+    file_paths = [Path(f).resolve() for f in files]
+    file_objects: List[Path] = []
+    removed_files: List[Path] = []
+    
+    if state is not None:
+        uncommitted, uncommitted_removed = state.uncommitted_files()
+        file_objects.extend(Path(f) for f in uncommitted)
+        removed_files.extend(Path(f) for f in uncommitted_removed)
+        console.print(
+            f"[cyan]Resuming upload: {len(file_paths)} source(s) to copy, "
+            f"{len(file_objects) + len(removed_files)} file(s) to commit[/cyan]"
+        )
+        
+        # Drop temporary files left by copies that were interrupted
+        file_handler.remove_partial_files(FILES_DIR, recursive=False)
+        for file_path in file_paths:
+            if file_path.is_dir():
+                file_handler.remove_partial_files(FILES_DIR / file_path.name)
+    elif journal is not None:
+        journal.start(file_paths, TARGET_BRANCH, message)
+    
+    with writing_blobs(file_handler, git_handler, auto_commit and not spool):
+        copied, deleted = copy_sources(file_handler, file_paths, journal)
+    file_objects.extend(copied)
+    removed_files.extend(deleted)
+    save_upload_state(file_handler)
+    
+    if not file_objects and not removed_files:
+        if state is not None and not state.pushed:
+            # Everything was committed before the interruption; only the push is left
+            push_upload(git_handler, state.branch, push_strategy)
+            journal.finish()
+            return
+        if file_handler.deduplicated or file_handler.unchanged_count:
+            file_handler.save_manifests()
+            console.print("[green]✓ Everything is already uploaded; nothing to commit[/green]")
+            if journal is not None:
+                journal.finish()
+            return
+        console.print("[red]✗ No files were successfully uploaded[/red]")
+        return
+    
+    if file_handler.copy_backend.strategy_counts:
+        console.print(f"[dim]Copy strategy: {file_handler.copy_backend.summary()}[/dim]")
+    
+    # Git operations
+    if auto_commit and spool:
+        upload_spool = UploadSpool(SPOOL_DIR)
+        request = upload_spool.submit(file_objects, removed_files, message)
+        # The spool keeps the request until it is committed
+        file_handler.save_manifests()
+        committed, ok = commit_spool(git_handler, upload_spool, push_strategy, shard_files, shard_size)
+        if not ok:
+            console.print("[red]✗ Failed to commit spooled files; run 'emery commit' to retry[/red]")
+        elif request in committed:
+            console.print(f"[green]✓ Successfully uploaded {len(file_objects)} file(s)[/green]")
+        else:
+            console.print(
+                f"[cyan]✓ Spooled {len(file_objects)} file(s); another emery process is committing them[/cyan]"
+            )
+    elif auto_commit:
+        # Commit straight onto the target branch; HEAD and the worktree are left alone
+        if not git_handler.commit_in_shards(
+            TARGET_BRANCH,
+            [str(f.absolute()) for f in file_objects],
+            GIT_AUTHOR_NAME,
+            GIT_AUTHOR_EMAIL,
+            message=message,
+            removed_files=removed_files,
+            max_files=shard_files,
+            max_bytes=shard_size * 1024 * 1024,
+            summary_base=FILES_DIR,
+            journal=journal,
+        ):
+            console.print("[red]✗ Failed to commit files[/red]")
+            return
+        file_handler.save_manifests()
+        
+        # Push (a failed push stays queued for 'emery push')
+        push_upload(git_handler, TARGET_BRANCH, push_strategy)
+        journal.record_pushed()
+        journal.finish()
+        
+        console.print(f"[green]✓ Successfully uploaded {len(file_objects)} file(s)[/green]")
+    else:
+        console.print(f"[cyan]✓ Copied {len(file_objects)} file(s) to {FILES_DIR}[/cyan]")
+        console.print("[yellow]Use --commit to push to the 'files' branch[/yellow]")
+
+
+def commit_spool(
+    git_handler: "GitHandler",
+    upload_spool: "UploadSpool",
+    push_strategy: PushStrategy,
+    shard_files: int = 0,
+    shard_size: int = 0,
+    push: bool = True,
+) -> tuple[List[Path], bool]:
+    """Commit and push everything waiting in the spool, unless another process is.
+    
+    Args:
+        git_handler: Git handler for the repository
+        upload_spool: Spool to drain
+        push_strategy: When to push the commits
+        shard_files: Split commits at this many files (0 for no limit)
+        shard_size: Split commits at this many MB (0 for no limit)
+        push: Push the commits (otherwise the caller pushes later)
+        
+    Returns:
+        Tuple of (committed_request_paths, success)
+    """
+    def commit(files: List[str], removed: List[str], message: Optional[str]) -> bool:
+        if not files and not removed:
+            return True
+        return git_handler.commit_in_shards(
+            TARGET_BRANCH,
+            files,
+            GIT_AUTHOR_NAME,
+            GIT_AUTHOR_EMAIL,
+            message=message,
+            removed_files=removed,
+            max_files=shard_files,
+            max_bytes=shard_size * 1024 * 1024,
+            summary_base=FILES_DIR,
+        )
+    
+    committed, ok = upload_spool.drain(commit)
+    if committed:
+        console.print(f"[cyan]Committed {len(committed)} spooled upload(s)[/cyan]")
+        if push:
+            # Push (a failed push stays queued for 'emery push')
+            push_upload(git_handler, TARGET_BRANCH, push_strategy)
+    return committed, ok
+
+
+@contextmanager
+def writing_blobs(file_handler: "FileHandler", git_handler: Optional["GitHandler"], enabled: bool) -> Iterator[None]:
+    """Write the git blobs of files stored inside the block on a background thread.
+    
+    The blobs are all written when the block exits. Nothing is done for the
+    checked-out branch, which is committed through the index instead.
+    
+    Args:
+        file_handler: Handler whose stored files are passed on
+        git_handler: Handler that commits them afterwards (None when not committing)
+        enabled: False to do nothing (the files are not committed by this process)
+    """
+    if not enabled or git_handler.is_checked_out(TARGET_BRANCH):
+        yield
+        return
+    
+    from emery_cli.blob_writer import BlobWriter
+    
+    blob_writer = BlobWriter(git_handler)
+    file_handler.on_stored = blob_writer.submit
+    try:
+        yield
+    finally:
+        blob_writer.close()
+        file_handler.on_stored = None
+    
+    if blob_writer.errors:
+        path, error = blob_writer.errors[0]
+        console.print(
+            f"[yellow]⚠ {len(blob_writer.errors)} blob(s) could not be written during the copy "
+            f"({path.name}: {error}); the commit writes them again[/yellow]"
+        )
+
+
+def save_upload_state(file_handler: "FileHandler") -> None:
+    """Save the dedup index, checksums, storage summary and naming counters updated by copies."""
+    file_handler.namer.save()
+    if file_handler.dedup_index is not None:
+        file_handler.dedup_index.save()
+    if file_handler.checksums is not None:
+        file_handler.checksums.save()
+    if file_handler.summary is not None:
+        file_handler.summary.save()
+
+
+def upload_list(
+    file_handler: "FileHandler",
+    git_handler: Optional["GitHandler"],
+    journal: Optional["UploadJournal"],
+    upload_spool: Optional["UploadSpool"],
+    auto_commit: bool,
+    listing: dict,
+    batch_files: int,
+    message: Optional[str],
+    push_strategy: PushStrategy,
+    shard_files: int = 0,
+    shard_size: int = 0,
+    state: Optional["JournalState"] = None,
+) -> None:
+    """Upload the paths of a list file or stdin, batch_files paths at a time.
+    
+    The list is read lazily and each batch is copied and committed before
+    the next one is read, so memory use follows the batch size rather than
+    the length of the list. The branch is pushed once, at the end. The
+    journal records where each batch ends in the list, so --resume finishes
+    the interrupted batch and then carries on reading a list file from there.
+    
+    Args:
+        file_handler: Handler that performs the copies
+        git_handler: Git handler for the repository (None when not committing)
+        journal: Upload journal (None when spooling or not committing)
+        upload_spool: Spool to hand commits to, when spooling
+        auto_commit: Commit the copied files
+        listing: List "source" ("-" for stdin), "format", "base_dir" for
+            relative paths and "position" (entries already uploaded)
+        batch_files: Listed paths per batch
+        message: Custom commit message, if any
+        push_strategy: When to push the commits
+        shard_files: Split commits at this many files (0 for no limit)
+        shard_size: Split commits at this many MB (0 for no limit)
+        state: Journal state of an interrupted list upload being resumed
+    """
+    from emery_cli.path_list import STDIN, ListEntry, batched, iter_records, open_list, parse_entry
+    
+    uploaded = failed = commits = 0
+    position = listing["position"]
+    base_dir = Path(listing["base_dir"])
+    
+    if state is not None:
+        # Finish the interrupted batch first
+        destinations = listing.get("destinations", {})
+        carried, carried_removed = state.uncommitted_files()
+        entries = []
+        reused: List[Path] = []
+        placeholders: List[Path] = []
+        for source in state.pending_sources():
+            dest = state.reserved.get(source)
+            if dest is not None and file_handler.finished_copy(Path(source), Path(dest)):
+                # Copied before the interruption; commit it under the name it got
+                journal.record_copied(Path(source), [Path(dest)])
+                reused.append(Path(dest))
+                continue
+            if dest is not None:
+                placeholders.append(Path(dest))
+            entries.append(ListEntry(Path(source), destinations.get(source)))
+        file_handler.record_resumed(reused)
+        carried.extend(str(path) for path in reused)
+        console.print(
+            f"[cyan]Resuming list upload (batch ending at entry {position}): {len(entries)} path(s) to copy, "
+            f"{len(carried) + len(carried_removed)} file(s) to commit[/cyan]"
+        )
+        for dest_dir in {FILES_DIR / entry.dest if entry.dest else FILES_DIR for entry in entries}:
+            file_handler.remove_partial_files(
+                dest_dir, recursive=False, placeholders=[path for path in placeholders if path.parent == dest_dir]
+            )
+        for entry in entries:
+            if entry.path.is_dir():
+                dest_dir = FILES_DIR / entry.dest if entry.dest else FILES_DIR
+                file_handler.remove_partial_files(dest_dir / entry.path.name)
+        pending = [(entries, [Path(f) for f in carried], [Path(f) for f in carried_removed])]
+    else:
+        pending = []
+    
+    def read_batches():
+        nonlocal position, failed
+        yield from pending
+        if state is not None and listing["source"] == STDIN:
+            console.print(f"[yellow]⚠ Paths after entry {position} of stdin were not read; pipe them in again[/yellow]")
+            return
+        
+        stream = open_list(listing["source"])
+        try:
+            records = iter_records(stream, listing["format"])
+            # Entries up to the position were uploaded before an interruption
+            for _ in range(position):
+                if next(records, None) is None:
+                    break
+            for records_batch in batched(records, batch_files):
+                entries = []
+                for number, record in enumerate(records_batch, position + 1):
+                    try:
+                        entries.append(parse_entry(record, listing["format"], base_dir))
+                    except ValueError as e:
+                        failed += 1
+                        console.print(f"[red]✗ Entry {number}: {e}[/red]")
+                position += len(records_batch)
+                if journal is not None:
+                    journal.start(
+                        [entry.path for entry in entries],
+                        TARGET_BRANCH,
+                        message,
+                        {
+                            **listing,
+                            "position": position,
+                            "destinations": {str(entry.path): entry.dest for entry in entries if entry.dest},
+                        },
+                    )
+                yield entries, [], []
+        finally:
+            if listing["source"] != STDIN:
+                stream.close()
+    
+    for entries, file_objects, removed_files in read_batches():
+        with writing_blobs(file_handler, git_handler, journal is not None):
+            copied, deleted, batch_failed = copy_list_entries(file_handler, entries, journal)
+        save_upload_state(file_handler)
+        file_objects = file_objects + copied
+        removed_files = removed_files + deleted
+        uploaded += len(file_objects)
+        failed += batch_failed
+        
+        if not auto_commit:
+            continue
+        if not file_objects and not removed_files:
+            file_handler.save_manifests()
+            continue
+        if upload_spool is not None:
+            upload_spool.submit(file_objects, removed_files, message)
+            file_handler.save_manifests()
+            _, ok = commit_spool(git_handler, upload_spool, push_strategy, shard_files, shard_size, push=False)
+        else:
+            ok = git_handler.commit_in_shards(
+                TARGET_BRANCH,
+                [str(f.absolute()) for f in file_objects],
+                GIT_AUTHOR_NAME,
+                GIT_AUTHOR_EMAIL,
+                message=message,
+                removed_files=removed_files,
+                max_files=shard_files,
+                max_bytes=shard_size * 1024 * 1024,
+                summary_base=FILES_DIR,
+                journal=journal,
+            )
+        if not ok:
+            console.print("[red]✗ Failed to commit files; run 'emery upload --resume' to retry[/red]")
+            return
+        file_handler.save_manifests()
+        commits += 1
+        console.print(f"[cyan]Batch ending at entry {position}: {len(file_objects)} file(s) uploaded[/cyan]")
+    
+    if failed:
+        console.print(f"[yellow]⚠ {failed} listed path(s) could not be uploaded[/yellow]")
+    if not auto_commit:
+        console.print(f"[cyan]✓ Copied {uploaded} file(s) to {FILES_DIR}[/cyan]")
+        console.print("[yellow]Use --commit to push to the 'files' branch[/yellow]")
+        return
+    
+    if commits or (state is not None and not state.pushed):
+        # Push (a failed push stays queued for 'emery push')
+        push_upload(git_handler, TARGET_BRANCH, push_strategy)
+    if journal is not None:
+        journal.record_pushed()
+        journal.finish()
+    console.print(f"[green]✓ Successfully uploaded {uploaded} file(s) in {commits} commit(s)[/green]")
+
+
+def copy_list_entries(
+    file_handler: "FileHandler", entries: List["ListEntry"], journal: Optional["UploadJournal"]
+) -> tuple[List[Path], List[Path], int]:
+    """Copy one batch of a path list into FILES_DIR.
+    
+    Plain files going to the same directory are copied together by the
+    parallel copy engine; folders and files to be chunked are copied one
+    by one.
+    
+    Args:
+        file_handler: Handler that performs the copies
+        entries: Listed paths with their destination directories
+        journal: Upload journal; copied sources are recorded in it
+        
+    Returns:
+        Tuple of (copied_files, removed_files, failed_count)
+    """
+    copied: List[Path] = []
+    removed: List[Path] = []
+    failed = 0
+    # Destination directory -> plain files copied into it
+    groups: Dict[Path, List[Path]] = {}
+    
+    for entry in entries:
+        dest_dir = FILES_DIR / entry.dest if entry.dest else FILES_DIR
+        chunks_before = len(file_handler.stored_chunks)
+        deleted_before = len(file_handler.deleted)
+        
+        if entry.path.is_dir():
+            success, result, files = file_handler.copy_directory(entry.path, dest_dir)
+        elif file_handler.chunk_mode is not None and entry.path.is_file() \
+                and entry.path.stat().st_size > file_handler.max_size_bytes:
+            success, result = file_handler.copy_file(entry.path, dest_dir)
+            files = [Path(result)] if success else []
+        else:
+            groups.setdefault(dest_dir, []).append(entry.path)
+            continue
+        
+        if not success:
+            console.print(f"[red]✗ {entry.path}: {result}[/red]")
+            failed += 1
+            continue
+        files = files + file_handler.stored_chunks[chunks_before:]
+        deleted = file_handler.deleted[deleted_before:]
+        copied.extend(files)
+        removed.extend(deleted)
+        if journal is not None:
+            journal.record_copied(entry.path, files, deleted)
+    
+    for dest_dir, paths in groups.items():
+        failures: List[Path] = []
+        stored, errors = file_handler.copy_files_batch(
+            paths, dest_dir, failures, journal.record_reserved if journal is not None else None
+        )
+        for error in errors:
+            console.print(f"[red]✗ {error}[/red]")
+        failed += len(failures)
+        copied.extend(stored)
+        if journal is not None:
+            failed_paths = set(failures)
+            journal.record_copied_many([path for path in paths if path not in failed_paths], stored)
+    
+    return copied, removed, failed
+
+
+def push_upload(git_handler: "GitHandler", branch_name: str, strategy: PushStrategy) -> bool:
+    """Push or queue the commits of an upload.
+    
+    Args:
+        git_handler: Git handler for the repository
+        branch_name: Branch to push
+        strategy: When to push
+        
+    Returns:
+        True if the branch was pushed now, False if it was queued
+    """
+    if strategy == PushStrategy.NOW:
+        if git_handler.push(branch_name):
+            return True
+        git_handler.queue_push(branch_name, PUSH_QUEUE_PATH)
+        console.print("[yellow]⚠ Push failed; queued. Run 'emery push' to retry[/yellow]")
+        return False
+    
+    git_handler.queue_push(branch_name, PUSH_QUEUE_PATH)
+    if strategy == PushStrategy.BACKGROUND:
+        import subprocess
+        
+        subprocess.Popen(
+            [sys.executable, "-m", "emery_cli.main", "push"],
+            cwd=str(REPO_ROOT),
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+        console.print("[cyan]✓ Pushing in the background[/cyan]")
+    else:
+        console.print("[cyan]✓ Push queued; run 'emery push' to send it[/cyan]")
+    return False
+
+
+def copy_sources(
+    file_handler: "FileHandler", file_paths: List[Path], journal: Optional["UploadJournal"]
+) -> tuple[List[Path], List[Path]]:
+    """Copy files and folders into FILES_DIR with a byte-based progress bar.
+    
+    Args:
+        file_handler: Handler that performs the copies
+        file_paths: Resolved files and folders to upload
+        journal: Upload journal; each fully copied source is recorded in it
+        
+    Returns:
+        Tuple of (copied_files, removed_files)
+    """
+    from rich.progress import (
+        BarColumn,
+        DownloadColumn,
+        Progress,
+        TextColumn,
+        TimeRemainingColumn,
+        TransferSpeedColumn,
+    )
+    
+    # Scan every argument once up front so progress can be tracked in bytes
+    sources = []
+    total_bytes = 0
+    for file_path in file_paths:
+        manifest = None
+        if file_path.is_dir():
+            manifest = file_handler.scan_directory(file_path)
+            total_bytes += manifest.total_bytes
+        elif file_path.is_file():
+            total_bytes += file_path.stat().st_size
+        sources.append((file_path, manifest))
+    
+    file_objects = []
+    with Progress(
+        TextColumn("[cyan]{task.description}"),
+        BarColumn(),
+        DownloadColumn(),
+        TransferSpeedColumn(),
+        TimeRemainingColumn(),
+        TextColumn("{task.fields[files]} files"),
+        console=console,
+        transient=True,
+    ) as progress:
+        task = progress.add_task("Uploading", total=total_bytes, files=0)
+        file_handler.copy_backend.progress_callback = make_progress_callback(progress, task)
         
         # Copy files and directories
-        file_objects = []
-        for file_path_arg in files:
-            file_path = Path(file_path_arg).resolve()
+        for file_path, manifest in sources:
+            dedup_before = len(file_handler.deduplicated)
+            unchanged_before = file_handler.unchanged_count
+            packed_before = file_handler.packed_count
+            chunked_before = file_handler.chunked_count
+            chunks_before = len(file_handler.stored_chunks)
+            deleted_before = len(file_handler.deleted)
             
             if file_path.is_dir():
                 # Handle directory upload
                 console.print(f"\n[cyan]📁 Uploading folder: {file_path.name}[/cyan]")
-                success, result, copied_files = file_handler.copy_directory(file_path, FILES_DIR)
+                success, result, copied_files = file_handler.copy_directory(file_path, FILES_DIR, manifest)
                 if success:
-                    console.print(f"[green]✓ Uploaded folder: {file_path.name} ({len(copied_files)} files)[/green]")
+                    notes = [f"{len(copied_files)} files"]
+                    for count, label in (
+                        (file_handler.packed_count - packed_before, "packed"),
+                        (file_handler.chunked_count - chunked_before, "chunked"),
+                        (file_handler.unchanged_count - unchanged_before, "unchanged"),
+                        (len(file_handler.deduplicated) - dedup_before, "deduplicated"),
+                        (len(file_handler.deleted) - deleted_before, "deleted"),
+                    ):
+                        if count:
+                            notes.append(f"{count} {label}")
+                    console.print(f"[green]✓ Uploaded folder: {file_path.name} ({', '.join(notes)})[/green]")
                     file_objects.extend(copied_files)
                 else:
                     console.print(f"[red]✗ Failed: {result}[/red]")
+                    continue
             else:
                 # Handle single file upload
                 file_handler.display_file_info(file_path)
                 success, result = file_handler.copy_file(file_path, FILES_DIR)
-                if success:
+                copied_files = []
+                if success and len(file_handler.deduplicated) > dedup_before:
+                    console.print(f"[cyan]≡ Deduplicated: {file_path.name} (already stored as {Path(result).name})[/cyan]")
+                elif success and file_handler.chunked_count > chunked_before:
+                    new_chunks = len(file_handler.stored_chunks) - chunks_before
+                    console.print(f"[green]✓ Uploaded: {file_path.name} (chunked, {new_chunks} new chunks)[/green]")
+                    copied_files = [Path(result)]
+                    file_objects.extend(copied_files)
+                elif success:
                     console.print(f"[green]✓ Uploaded: {file_path.name}[/green]")
-                    file_objects.append(Path(result))
+                    copied_files = [Path(result)]
+                    file_objects.extend(copied_files)
                 else:
                     console.print(f"[red]✗ Failed: {result}[/red]")
+                    continue
             
-            progress.advance(task)
+            # New chunks of large files are committed along with their manifests
+            new_chunks = file_handler.stored_chunks[chunks_before:]
+            file_objects.extend(new_chunks)
+            if journal is not None:
+                journal.record_copied(file_path, copied_files + new_chunks, file_handler.deleted[deleted_before:])
     
-    if not file_objects:
-        console.print("[red]✗ No files were successfully uploaded[/red]")
-        return
+    return file_objects, list(file_handler.deleted)
+
+
+@app.command()
+def watch(
+    folder: Path = typer.Argument(..., exists=True, file_okay=False, resolve_path=True, help="Folder to watch and upload"),
+    debounce: float = typer.Option(2.0, "--debounce", min=0.0, help="Seconds without changes before a batch is uploaded"),
+    max_wait: float = typer.Option(30.0, "--max-wait", min=0.0, help="Longest a change waits before it is uploaded, in seconds"),
+    batch_files: int = typer.Option(0, "--batch-files", min=0, help="Upload as soon as N paths have changed"),
+    batch_size: int = typer.Option(0, "--batch-size", min=0, help="Upload as soon as N MB have changed"),
+    poll: bool = typer.Option(False, "--poll", help="Poll for changes instead of using inotify"),
+    poll_interval: float = typer.Option(2.0, "--poll-interval", min=0.1, help="Seconds between rescans when polling"),
+    jobs: int = typer.Option(COPY_JOBS, "-j", "--jobs", min=1, help="Number of files to copy in parallel"),
+    delete: bool = typer.Option(False, "--delete", help="Remove uploaded files whose source was deleted from the folder"),
+    push_strategy: PushStrategy = typer.Option(
+        PUSH_STRATEGY, "--push", help="Push now, defer until 'emery push', or push in the background"
+    ),
+    exclude: Optional[List[str]] = typer.Option(
+        None, "--exclude", help="Skip folder paths matching this .gitignore-style pattern (repeatable)"
+    ),
+    include: Optional[List[str]] = typer.Option(
+        None, "--include", help="Only upload folder files matching this .gitignore-style pattern (repeatable)"
+    ),
+    min_size: Optional[int] = typer.Option(None, "--min-size", min=0, help="Skip folder files smaller than N KB"),
+    max_size: Optional[int] = typer.Option(None, "--max-size", min=0, help="Skip folder files larger than N KB"),
+    newer_than: Optional[str] = typer.Option(
+        None, "--newer-than", callback=validate_time, help="Only upload folder files modified within an age (7d, 12h) or since a date"
+    ),
+    older_than: Optional[str] = typer.Option(
+        None, "--older-than", callback=validate_time, help="Only upload folder files modified before an age (7d, 12h) or a date"
+    ),
+    ignore_files: bool = typer.Option(
+        True, "--ignore/--no-ignore", help="Honour .gitignore/.emeryignore files and skip .git, node_modules, .venv, tool caches and the like"
+    ),
+) -> None:
+    """
+    Watch a folder and upload its changes in batches.
     
-    # Git operations
-    if auto_commit:
-        # Ensure target branch exists
-        if not git_handler.ensure_branch(TARGET_BRANCH):
-            console.print("[red]✗ Failed to ensure target branch[/red]")
-            return
-        
-        # Save current branch to restore later
-        current_branch = git_handler.get_current_branch()
-        
-        # Switch to target branch
-        if not git_handler.switch_branch(TARGET_BRANCH):
-            console.print("[red]✗ Failed to switch to target branch[/red]")
-            return
+    Changes are collected with inotify (or by polling where inotify is not
+    available) and debounced into batches. Each batch goes through the
+    same copy, commit and push steps as 'emery upload', reusing the open
+    repository and the folder manifest held in memory.
+    
+    Examples:
+        emery watch my_folder/
+        emery watch --debounce 5 --max-wait 60 my_folder/
+        emery watch --batch-files 500 --push defer my_folder/
+        emery watch --poll my_folder/
+        emery watch --exclude "*.tmp" --max-size 10240 my_folder/
+    """
+    from emery_cli.file_handler import FileHandler
+    from emery_cli.git_handler import GitHandler
+    from emery_cli.journal import UploadJournal
+    from emery_cli.manifest_cache import ManifestCache
+    from emery_cli.summary import StorageSummary
+    from emery_cli.watcher import ChangeBatcher, InotifyWatcher, LiveManifest, open_watcher
+    
+    show_banner()
+    
+    journal = UploadJournal(JOURNAL_PATH)
+    with journal.lock:
+        if journal.load() is not None:
+            console.print("[red]✗ An interrupted upload is pending; run 'emery upload --resume' first[/red]")
+            raise typer.Exit(1)
+    
+    file_filter = build_file_filter(ignore_files, exclude, include, min_size, max_size, newer_than, older_than)
+    file_handler = FileHandler(
+        MAX_FILE_SIZE_MB,
+        jobs=jobs,
+        manifest_cache=ManifestCache(MANIFEST_CACHE_DIR),
+        delete_missing=delete,
+        buffer_size=COPY_BUFFER_SIZE,
+        summary=StorageSummary(SUMMARY_PATH, FILES_DIR),
+        file_filter=file_filter,
+    )
+    git_handler = GitHandler(REPO_ROOT)
+    FILES_DIR.mkdir(parents=True, exist_ok=True)
+    
+    watcher = open_watcher(folder, poll=poll, poll_interval=poll_interval, file_filter=file_filter)
+    live_manifest = LiveManifest(folder, file_filter)
+    batcher = ChangeBatcher(
+        watcher,
+        live_manifest,
+        debounce=debounce,
+        max_wait=max_wait,
+        max_files=batch_files,
+        max_bytes=batch_size * 1024 * 1024,
+    )
+    
+    mode = "inotify" if isinstance(watcher, InotifyWatcher) else f"polling every {poll_interval:g}s"
+    console.print(
+        f"[cyan]👀 Watching {folder} ({len(live_manifest.entries)} files, {mode}); press Ctrl+C to stop[/cyan]"
+    )
+    
+    try:
+        # Catch up on changes made while the folder was not being watched
+        with journal.lock:
+            upload_batch(file_handler, git_handler, journal, live_manifest, push_strategy)
+        while True:
+            changes = batcher.next_batch()
+            console.print(f"\n[cyan]{len(changes)} change(s) detected[/cyan]")
+            with journal.lock:
+                upload_batch(file_handler, git_handler, journal, live_manifest, push_strategy)
+    finally:
+        watcher.close()
+
+
+def upload_batch(
+    file_handler: "FileHandler",
+    git_handler: "GitHandler",
+    journal: "UploadJournal",
+    live_manifest: "LiveManifest",
+    push_strategy: PushStrategy,
+) -> bool:
+    """Copy, commit and push the changes of a watched folder.
+    
+    Files a previous batch copied but failed to commit are committed
+    along with this batch.
+    
+    Args:
+        file_handler: Handler whose manifest cache holds the folder's last upload
+        git_handler: Git handler for the repository
+        journal: Upload journal for the batch
+        live_manifest: Current manifest of the watched folder
+        push_strategy: When to push
         
+    Returns:
+        True if the batch was uploaded (or had nothing to upload)
+    """
+    folder = live_manifest.root
+    state = journal.load()
+    carried, carried_removed = state.uncommitted_files() if state is not None else ([], [])
+    
+    file_handler.reset_stats()
+    journal.start([folder], TARGET_BRANCH, None)
+    if carried or carried_removed:
+        journal.record_copied(folder, carried, carried_removed)
+    
+    success, result, copied_files = file_handler.copy_directory(folder, FILES_DIR, live_manifest.manifest())
+    if not success:
+        console.print(f"[red]✗ Failed: {result}[/red]")
+    if file_handler.summary is not None:
+        file_handler.summary.save()
+    
+    file_objects = [Path(f) for f in carried] + copied_files
+    removed_files = [Path(f) for f in carried_removed] + file_handler.deleted
+    journal.record_copied(folder, file_objects, removed_files)
+    if not file_objects and not removed_files:
+        file_handler.save_manifests()
+        journal.finish()
+        return success
+    
+    if not git_handler.commit_in_shards(
+        TARGET_BRANCH,
+        [str(f.absolute()) for f in file_objects],
+        GIT_AUTHOR_NAME,
+        GIT_AUTHOR_EMAIL,
+        removed_files=removed_files,
+        summary_base=FILES_DIR,
+        journal=journal,
+    ):
+        # The journal keeps the batch so the next one commits it
+        console.print("[red]✗ Failed to commit files[/red]")
+        return False
+    file_handler.save_manifests()
+    
+    push_upload(git_handler, TARGET_BRANCH, push_strategy)
+    journal.record_pushed()
+    journal.finish()
+    
+    notes = [f"{len(copied_files)} copied"]
+    if file_handler.deleted:
+        notes.append(f"{len(file_handler.deleted)} deleted")
+    console.print(f"[green]✓ Uploaded batch ({', '.join(notes)})[/green]")
+    return success
+
+
+@app.command()
+def commit(
+    push_strategy: PushStrategy = typer.Option(
+        PUSH_STRATEGY, "--push", help="Push now, defer until 'emery push', or push in the background"
+    ),
+) -> None:
+    """Commit uploads waiting in the spool, folded into one commit."""
+    from emery_cli.spool import UploadSpool
+    
+    upload_spool = UploadSpool(SPOOL_DIR)
+    waiting = len(upload_spool.pending())
+    if not waiting:
+        console.print("[yellow]✓ Nothing waiting in the spool[/yellow]")
+        return
+    
+    from emery_cli.git_handler import GitHandler
+    
+    console.print(f"[cyan]{waiting} spooled upload(s) waiting[/cyan]")
+    committed, ok = commit_spool(GitHandler(REPO_ROOT), upload_spool, push_strategy)
+    if not ok:
+        console.print("[red]✗ Commit failed; uploads remain spooled[/red]")
+        raise typer.Exit(1)
+    if not committed:
+        console.print("[cyan]✓ Another emery process is committing the spool[/cyan]")
+
+
+@app.command()
+def push() -> None:
+    """Push every queued upload commit to the remote in one round-trip."""
+    from emery_cli.git_handler import GitHandler
+    
+    git_handler = GitHandler(REPO_ROOT)
+    if not git_handler.push_queued(PUSH_QUEUE_PATH):
+        console.print("[red]✗ Push failed; commits remain queued[/red]")
+        raise typer.Exit(1)
+
+
+@app.command()
+def verify(
+    jobs: int = typer.Option(COPY_JOBS, "-j", "--jobs", min=1, help="Number of processes hashing files"),
+) -> None:
+    """Check uploaded files against the checksums recorded with --hash."""
+    from emery_cli.checksums import ChecksumManifest
+    
+    checksums = ChecksumManifest(CHECKSUMS_PATH, FILES_DIR)
+    if not len(checksums):
+        console.print("[yellow]⚠ No checksums recorded; upload with --hash to record them[/yellow]")
+        return
+    
+    console.print(f"[cyan]Verifying {len(checksums)} file(s)...[/cyan]")
+    result = checksums.verify(jobs)
+    
+    for path in result.mismatched:
+        console.print(f"[red]✗ Checksum mismatch: {path.relative_to(FILES_DIR)}[/red]")
+    for path in result.missing:
+        console.print(f"[red]✗ Missing: {path.relative_to(FILES_DIR)}[/red]")
+    
+    if not result.ok:
+        console.print(
+            f"[red]✗ {len(result.mismatched)} corrupted, {len(result.missing)} missing, {result.verified} OK[/red]"
+        )
+        raise typer.Exit(1)
+    console.print(f"[green]✓ All {result.verified} file(s) match their checksums[/green]")
+
+
+@app.command()
+def packed(
+    patterns: Optional[List[str]] = typer.Argument(None, help="Glob patterns matched against paths under the files directory"),
+) -> None:
+    """List files stored inside packs."""
+    from emery_cli.packer import find_packed
+    
+    matches = find_packed(FILES_DIR, patterns or []) if FILES_DIR.exists() else {}
+    if not matches:
+        console.print("[yellow]⚠ No packed files found[/yellow]")
+        return
+    
+    total = 0
+    for pack_path, members in matches.items():
+        console.print(f"\n[cyan]📦 {pack_path.relative_to(FILES_DIR)}[/cyan]")
+        for name in members:
+            console.print(f"  • {name}")
+        total += len(members)
+    console.print(f"\n[green]{total} file(s) in {len(matches)} pack(s)[/green]")
+
+
+@app.command()
+def extract(
+    patterns: List[str] = typer.Argument(..., help="Glob patterns of packed files to extract"),
+    output: Path = typer.Option(Path("."), "-o", "--output", help="Directory to extract into"),
+) -> None:
+    """Extract files from packs, keeping their paths relative to the files directory."""
+    from emery_cli.packer import extract_members, find_packed
+    
+    matches = find_packed(FILES_DIR, patterns) if FILES_DIR.exists() else {}
+    if not matches:
+        console.print("[red]✗ No packed files match[/red]")
+        raise typer.Exit(1)
+    
+    extracted = 0
+    for pack_path, members in matches.items():
+        out_dir = output / pack_path.parent.relative_to(FILES_DIR)
         try:
-            # Stage files - pass absolute paths
-            file_paths = [str(f.absolute()) for f in file_objects]
-            git_handler.add_files(file_paths)
-            
-            # Create commit message
-            if not message:
-                file_names = ", ".join([f.name for f in file_objects])
-                message = f"Upload: {file_names}"
-            
-            # Commit
-            git_handler.commit(message, GIT_AUTHOR_NAME, GIT_AUTHOR_EMAIL)
-            
-            # Push
-            git_handler.push(TARGET_BRANCH)
-            
-            console.print(f"[green]✓ Successfully uploaded {len(file_objects)} file(s)[/green]")
-            
-        finally:
-            # Try to restore original branch
-            try:
-                git_handler.switch_branch(current_branch)
-            except:
-                pass
-    else:
-        console.print(f"[cyan]✓ Copied {len(file_objects)} file(s) to {FILES_DIR}[/cyan]")
-        console.print("[yellow]Use --commit to push to the 'files' branch[/yellow]")
+            extracted += len(extract_members(pack_path, members, out_dir))
+        except Exception as e:
+            console.print(f"[red]✗ Error extracting from {pack_path.name}: {e}[/red]")
+            raise typer.Exit(1)
+    console.print(f"[green]✓ Extracted {extracted} file(s) to {output}[/green]")
 
 
 @app.command()
-def info() -> None:
-    """Display CLI configuration and information."""
-    show_banner()
-    show_info()
+def restore(
+    manifest: Path = typer.Argument(..., help="Chunk manifest (<name>.chunks.json) of the file to restore"),
+    output: Optional[Path] = typer.Option(None, "-o", "--output", help="Where to write the file (default: its original name)"),
+) -> None:
+    """Reassemble a file uploaded with --chunk from its chunks."""
+    import json
+    
+    from emery_cli.chunker import restore_chunked
+    
+    if not manifest.exists() and (FILES_DIR / manifest).exists():
+        manifest = FILES_DIR / manifest
     
-    # Show upload directory contents if it exists
-    if FILES_DIR.exists():
-        uploaded_files = list(FILES_DIR.glob("*"))
-        if uploaded_files:
-            console.print(f"\n[cyan]Files in {FILES_DIR.name}:[/cyan]")
-            for f in uploaded_files:
-                if f.is_file():
-                    size_mb = f.stat().st_size / (1024 * 1024)
-                    console.print(f"  • {f.name} ({size_mb:.2f} MB)")
+    try:
+        with open(manifest, "r", encoding="utf-8") as f:
+            name = json.load(f)["name"]
+        output = output or Path(name)
+        size = restore_chunked(manifest, output)
+    except Exception as e:
+        console.print(f"[red]✗ Error restoring {manifest.name}: {e}[/red]")
+        raise typer.Exit(1)
+    
+    console.print(f"[green]✓ Restored {output} ({size / (1024 * 1024):.2f} MB)[/green]")
 
 
 @app.command()
-def clean() -> None:
-    """Clear all uploaded files from the files directory."""
+def info(
+    exact: bool = typer.Option(False, "--exact", help="Rebuild the summary by scanning the upload directory"),
+    top: int = typer.Option(10, "--top", min=0, help="Show the N largest folders and N latest uploads (0 for all)"),
+    jobs: int = typer.Option(COPY_JOBS, "-j", "--jobs", min=1, help="Directories scanned in parallel by --exact"),
+) -> None:
+    """Display CLI configuration and a summary of the uploaded files.
+    
+    The summary comes from an index kept up to date by uploads, so it is
+    shown without scanning the upload directory.
+    """
+    from datetime import datetime
+    
+    from rich.table import Table
+    
+    from emery_cli.summary import ROOT_GROUP, StorageSummary
+    
+    show_banner()
+    show_info()
+    
     if not FILES_DIR.exists():
-        console.print("[yellow]✓ Files directory is already empty[/yellow]")
         return
     
-    import shutil
+    summary = StorageSummary(SUMMARY_PATH, FILES_DIR)
+    if exact or not summary.exists:
+        console.print(f"[cyan]Scanning {FILES_DIR}...[/cyan]")
+        summary.rebuild(jobs)
+    
+    if not summary.total_files:
+        console.print(f"\n[yellow]No files in {FILES_DIR.name}[/yellow]")
+        return
+    
+    updated = datetime.fromtimestamp(summary.updated_at).strftime("%Y-%m-%d %H:%M:%S")
+    console.print(
+        f"\n[cyan]{FILES_DIR.name}:[/cyan] {summary.total_files:,} files, "
+        f"{summary.total_bytes / (1024 * 1024):,.2f} MB in {len(summary.folders)} folder(s) "
+        f"[dim](updated {updated}; --exact to rescan)[/dim]"
+    )
+    
+    folders = sorted(summary.folders.items(), key=lambda item: item[1][1], reverse=True)
+    shown = folders[:top] if top else folders
+    table = Table(title="Largest folders", title_justify="left")
+    table.add_column("Folder")
+    table.add_column("Files", justify="right")
+    table.add_column("Size (MB)", justify="right")
+    for name, (files, size) in shown:
+        table.add_row(
+            "(top level)" if name == ROOT_GROUP else f"{name}/", f"{files:,}", f"{size / (1024 * 1024):,.2f}"
+        )
+    console.print(table)
+    if len(folders) > len(shown):
+        console.print(f"[dim]... and {len(folders) - len(shown)} more (--top 0 shows all)[/dim]")
+    
+    recent = list(reversed(summary.recent))
+    if recent:
+        table = Table(title="Latest uploads", title_justify="left")
+        table.add_column("File")
+        table.add_column("Size (MB)", justify="right")
+        table.add_column("Uploaded")
+        for rel_path, size, timestamp in recent[:top] if top else recent:
+            table.add_row(
+                rel_path,
+                f"{size / (1024 * 1024):,.2f}",
+                datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S"),
+            )
+        console.print(table)
+
+
+@app.command()
+def clean(
+    clear_commit: bool = typer.Option(
+        False, "--commit", help=f"Also commit the removal of every uploaded file to the '{TARGET_BRANCH}' branch"
+    ),
+    message: str = typer.Option("Clear uploaded files", "-m", "--message", help="Message of the --commit commit"),
+    push_strategy: PushStrategy = typer.Option(
+        PUSH_STRATEGY, "--push", help="Push the --commit commit now, defer until 'emery push', or push in the background"
+    ),
+    wait: bool = typer.Option(False, "--wait", help="Delete the old files before returning instead of in the background"),
+    jobs: int = typer.Option(COPY_JOBS, "-j", "--jobs", min=1, help="Directories deleted in parallel"),
+) -> None:
+    """Clear all uploaded files and the caches that describe them.
+    
+    The files directory is moved into a trash directory at once and
+    deleted in parallel by a background process.
+    
+    Examples:
+        emery clean
+        emery clean --commit
+        emery clean --wait -j 16
+    """
+    from emery_cli.cleaner import delete_tree, empty_trash, move_aside
+    from emery_cli.journal import UploadJournal
+    
+    journal = UploadJournal(JOURNAL_PATH)
+    if not journal.lock.acquire(blocking=False):
+        console.print("[red]✗ An upload is running; clean once it has finished[/red]")
+        raise typer.Exit(1)
     
     try:
-        shutil.rmtree(FILES_DIR)
-        console.print("[green]✓ Cleared files directory[/green]")
+        had_files = FILES_DIR.exists()
+        for path in (FILES_DIR, MANIFEST_CACHE_DIR):
+            try:
+                move_aside(path, TRASH_DIR)
+            except OSError:
+                # Not on the same filesystem as the trash; delete it in place
+                delete_tree(path, jobs)
+        for path in (CHECKSUMS_PATH, SUMMARY_PATH, DEDUP_INDEX_PATH, NAMING_COUNTERS_PATH):
+            path.unlink(missing_ok=True)
     except Exception as e:
         console.print(f"[red]✗ Error clearing directory: {e}[/red]")
+        raise typer.Exit(1)
+    finally:
+        journal.lock.release()
+    
+    if had_files:
+        console.print("[green]✓ Cleared files directory[/green]")
+    else:
+        console.print("[yellow]✓ Files directory is already empty[/yellow]")
+
+    if clear_commit:
+        from emery_cli.git_handler import GitHandler
+        
+        git_handler = GitHandler(REPO_ROOT)
+        if not git_handler.commit_removal(TARGET_BRANCH, FILES_DIR, message, GIT_AUTHOR_NAME, GIT_AUTHOR_EMAIL):
+            console.print("[red]✗ Failed to commit the removal[/red]")
+            raise typer.Exit(1)
+        push_upload(git_handler, TARGET_BRANCH, push_strategy)
+    
+    if not TRASH_DIR.exists():
+        return
+    if wait:
+        empty_trash(TRASH_DIR, jobs)
+        return
+    
+    import subprocess
+    
+    subprocess.Popen(
+        [sys.executable, "-m", "emery_cli.cleaner", "--jobs", str(jobs), str(TRASH_DIR)],
+        cwd=str(REPO_ROOT),
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+    console.print("[dim]Deleting the old files in the background[/dim]")
 
 
 def main() -> None:
@@ -0,0 +1,133 @@
+"""Persisted folder manifests for incremental re-uploads."""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from emery_cli.hashing import hash_file
+from emery_cli.scanner import Manifest, ManifestEntry
+
+# rel_path -> (size, mtime, digest or None)
+CachedEntries = Dict[str, tuple]
+
+
+class ManifestCache:
+    """Store the manifest of each uploaded folder between runs."""
+
+    def __init__(self, cache_dir: Path, checksum: bool = False):
+        """Initialize manifest cache.
+
+        Args:
+            cache_dir: Directory holding one JSON manifest per uploaded folder
+            checksum: Compare content hashes when only the mtime changed
+        """
+        self.cache_dir = cache_dir
+        self.checksum = checksum
+        # Manifests loaded or saved by this process, so long-running
+        # watchers do not re-read them from disk for every batch
+        self._warm: Dict[str, CachedEntries] = {}
+
+    def _path_for(self, key: str) -> Path:
+        key_hash = hashlib.sha1(key.encode("utf-8")).hexdigest()[:12]
+        return self.cache_dir / f"{Path(key).name}-{key_hash}.json"
+
+    def load(self, key: str) -> Optional[CachedEntries]:
+        """Load the manifest saved for a folder.
+
+        Args:
+            key: Absolute path of the destination folder
+
+        Returns:
+            Cached entries, or None if the folder was never uploaded
+        """
+        if key in self._warm:
+            return self._warm[key]
+
+        try:
+            with open(self._path_for(key), "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        entries = {rel_path: tuple(values) for rel_path, values in data.get("files", {}).items()}
+        self._warm[key] = entries
+        return entries
+
+    def save(self, key: str, source_dir: Path, entries: CachedEntries) -> None:
+        """Save a folder's manifest atomically.
+
+        Args:
+            key: Absolute path of the destination folder
+            source_dir: Folder the manifest was scanned from
+            entries: Entries to persist
+        """
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._path_for(key)
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"source": str(source_dir), "files": entries}, f)
+        os.replace(tmp_path, path)
+        self._warm[key] = entries
+
+    def diff(
+        self, previous: CachedEntries, manifest: Manifest
+    ) -> tuple[List[ManifestEntry], List[str], CachedEntries]:
+        """Compare a fresh scan against the cached manifest.
+
+        A file is unchanged when its size and mtime match. In checksum
+        mode a file whose mtime changed but whose content hash did not is
+        also unchanged.
+
+        Args:
+            previous: Entries from the last upload of this folder
+            manifest: Fresh scan of the folder
+
+        Returns:
+            Tuple of (changed_entries, deleted_rel_paths, entries_to_save)
+        """
+        changed = []
+        current: CachedEntries = {}
+
+        for entry in manifest:
+            old = previous.get(entry.rel_path)
+            digest = old[2] if old is not None else None
+
+            if old is not None and old[0] == entry.size and old[1] == entry.mtime:
+                current[entry.rel_path] = old
+                continue
+
+            if self.checksum:
+                new_digest = hash_file(manifest.root / entry.rel_path)
+                unchanged = old is not None and old[0] == entry.size and digest == new_digest
+                digest = new_digest
+                if unchanged:
+                    current[entry.rel_path] = (entry.size, entry.mtime, digest)
+                    continue
+            else:
+                digest = None
+
+            changed.append(entry)
+            current[entry.rel_path] = (entry.size, entry.mtime, digest)
+
+        scanned = {entry.rel_path for entry in manifest}
+        deleted = [rel_path for rel_path in previous if rel_path not in scanned]
+        return changed, deleted, current
+
+    def entries_for(self, manifest: Manifest) -> CachedEntries:
+        """Build cache entries for a folder uploaded in full.
+
+        Args:
+            manifest: Scan of the folder
+
+        Returns:
+            Entries to persist
+        """
+        return {
+            entry.rel_path: (
+                entry.size,
+                entry.mtime,
+                hash_file(manifest.root / entry.rel_path) if self.checksum else None,
+            )
+            for entry in manifest
+        }
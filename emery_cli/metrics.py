@@ -0,0 +1,142 @@
+"""Per-phase timing and counters for Emery CLI."""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+
+class Phase:
+    """Counters of one timed phase, filled in while it runs."""
+
+    def __init__(self, files: int = 0, bytes_: int = 0):
+        self.files = files
+        self.bytes = bytes_
+
+    def add(self, files: int = 0, bytes_: int = 0) -> None:
+        """Count files and bytes handled by the phase."""
+        self.files += files
+        self.bytes += bytes_
+
+
+class Metrics:
+    """Accumulate durations, file counts and byte counts per phase.
+
+    Phases may nest (dedup hashing happens inside a copy, for example), so
+    durations of different phases can overlap.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Phase name -> {"calls", "seconds", "files", "bytes"}, in first-seen order
+        self._phases: Dict[str, dict] = {}
+
+    def record(self, name: str, seconds: float, files: int = 0, bytes_: int = 0) -> None:
+        """Add one completed run of a phase.
+
+        Args:
+            name: Phase name, such as "copy" or "push"
+            seconds: Time the phase took
+            files: Files it handled
+            bytes_: Bytes it handled
+        """
+        with self._lock:
+            stats = self._phases.setdefault(name, {"calls": 0, "seconds": 0.0, "files": 0, "bytes": 0})
+            stats["calls"] += 1
+            stats["seconds"] += seconds
+            stats["files"] += files
+            stats["bytes"] += bytes_
+
+    @contextmanager
+    def phase(self, name: str, files: int = 0, bytes_: int = 0) -> Iterator[Phase]:
+        """Time a block of code as one run of a phase.
+
+        The phase is recorded even if the block raises.
+
+        Args:
+            name: Phase name
+            files: Files handled, if known up front
+            bytes_: Bytes handled, if known up front
+
+        Yields:
+            Phase whose counters can be increased inside the block
+        """
+        current = Phase(files, bytes_)
+        start = time.perf_counter()
+        try:
+            yield current
+        finally:
+            self.record(name, time.perf_counter() - start, current.files, current.bytes)
+
+    def snapshot(self) -> Dict[str, dict]:
+        """Copy of the statistics recorded so far, keyed by phase name."""
+        with self._lock:
+            return {name: dict(stats) for name, stats in self._phases.items()}
+
+    def reset(self) -> None:
+        """Forget everything recorded so far."""
+        with self._lock:
+            self._phases.clear()
+
+    def write_jsonl(self, path: Path, command: str, labels: Optional[dict] = None) -> None:
+        """Append the recorded phases to a JSON-lines file as one record.
+
+        Args:
+            path: File to append to
+            command: Command that ran, such as "upload"
+            labels: Extra fields for the record
+        """
+        record = {"timestamp": time.time(), "command": command, **(labels or {}), "phases": self.snapshot()}
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+
+    def write_prometheus(self, path: Path, command: str) -> None:
+        """Write the recorded phases in the Prometheus text-file format.
+
+        The file is replaced atomically, as the node_exporter text-file
+        collector expects.
+
+        Args:
+            path: File to write, usually ending in .prom
+            command: Command that ran, used as a label
+        """
+        phases = self.snapshot()
+        lines = []
+        for metric, key, help_text in (
+            ("emery_phase_duration_seconds", "seconds", "Time spent in each phase during the last run"),
+            ("emery_phase_files", "files", "Files handled by each phase during the last run"),
+            ("emery_phase_bytes", "bytes", "Bytes handled by each phase during the last run"),
+            ("emery_phase_calls", "calls", "Times each phase ran during the last run"),
+        ):
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} gauge")
+            for name, stats in phases.items():
+                lines.append(f'{metric}{{command="{command}",phase="{name}"}} {stats[key]}')
+        lines.append("# HELP emery_last_run_timestamp_seconds When the last run finished")
+        lines.append("# TYPE emery_last_run_timestamp_seconds gauge")
+        lines.append(f'emery_last_run_timestamp_seconds{{command="{command}"}} {time.time():.3f}')
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp_path, path)
+
+    def write(self, path: Path, command: str) -> None:
+        """Write metrics in the format implied by the file name.
+
+        Files ending in .prom get Prometheus text format; anything else
+        gets a JSON line appended.
+        """
+        if path.suffix == ".prom":
+            self.write_prometheus(path, command)
+        else:
+            self.write_jsonl(path, command)
+
+
+# Process-wide metrics shared by the file and git handlers
+metrics = Metrics()
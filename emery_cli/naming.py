@@ -0,0 +1,221 @@
+"""Collision-free destination names for uploaded files.
+
+Single-file uploads all land in one directory, so the same name arrives
+again and again (report.pdf from many folders). A name is claimed by
+creating the destination with O_EXCL, which fails if another thread or
+process got there first, so two uploads never pick the same path. On a
+collision the strategy decides the alternative name:
+
+    counter    report_1.pdf, report_2.pdf, ... from a per-stem counter, so the
+               next free number is found in constant time instead of probing
+               report_1, report_2, ... The counters are saved between runs;
+               a directory is scanned once, the first time it has a
+               collision, to seed them
+    hash       report_<hash of the source path>.pdf, stable for a given source
+    timestamp  report_<upload time>.pdf
+    subdir     every file of an upload goes to a subdirectory named after
+               the upload time
+
+Any name that still collides falls back to the counter.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Set
+
+from emery_cli.locking import FileLock
+
+NAMING_COUNTER = "counter"
+NAMING_HASH = "hash"
+NAMING_TIMESTAMP = "timestamp"
+NAMING_SUBDIR = "subdir"
+NAMING_STRATEGIES = (NAMING_COUNTER, NAMING_HASH, NAMING_TIMESTAMP, NAMING_SUBDIR)
+
+# Stem of a name made unique by the counter: <stem>_<n> (hash tags are
+# 10 characters, so an all-digit one is never mistaken for a counter)
+_COUNTED = re.compile(r"(.*)_(\d{1,9})")
+
+
+def check_strategy(strategy: str) -> str:
+    """Make sure a naming strategy is known.
+
+    Args:
+        strategy: One of NAMING_STRATEGIES
+
+    Returns:
+        The strategy
+
+    Raises:
+        ValueError: If the strategy is unknown
+    """
+    if strategy not in NAMING_STRATEGIES:
+        raise ValueError(f"Unknown naming strategy: {strategy} (choose from {', '.join(NAMING_STRATEGIES)})")
+    return strategy
+
+
+def claim(path: Path) -> bool:
+    """Atomically create an empty file at path if nothing is there yet.
+
+    Returns:
+        True if the path was claimed, False if it already existed
+    """
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+    except FileExistsError:
+        return False
+    os.close(fd)
+    return True
+
+
+class DestinationNamer:
+    """Pick and claim unique destination paths for uploaded files.
+
+    Claimed paths exist as empty files until the copy replaces them; call
+    release() for copies that failed, and save() once the upload is done.
+    """
+
+    def __init__(self, strategy: str = NAMING_COUNTER, counters_path: Optional[Path] = None):
+        """Initialize destination namer.
+
+        Args:
+            strategy: One of NAMING_STRATEGIES
+            counters_path: JSON file keeping the counters between runs; without
+                it every process scans a directory on its first collision there
+        """
+        self.strategy = check_strategy(strategy)
+        self.counters_path = counters_path
+        # One upload shares one timestamp, which also names its subdirectory
+        self.upload_id = time.strftime("%Y%m%d-%H%M%S")
+        # (directory, stem, suffix) -> highest counter handed out or seen on disk
+        self._counters: Dict[tuple, int] = {}
+        self._seeded: Set[Path] = set()
+        # Saved counters: directory -> {file name: counter}; loaded on the first collision
+        self._saved: Optional[Dict[str, Dict[str, int]]] = None
+        self._changed: Set[tuple] = set()
+        # Directories scanned by this process, whose counters are not saved yet
+        self._scanned: Set[Path] = set()
+        self._lock = threading.Lock()
+
+    def reserve(self, source_path: Path, dest_dir: Path) -> Path:
+        """Claim a destination path for a file.
+
+        Args:
+            source_path: File being uploaded (only its name and path are used)
+            dest_dir: Directory the file is uploaded to
+
+        Returns:
+            Claimed destination path, which now exists as an empty file
+        """
+        if self.strategy == NAMING_SUBDIR:
+            dest_dir = dest_dir / self.upload_id
+        dest_dir.mkdir(parents=True, exist_ok=True)
+
+        dest_path = dest_dir / source_path.name
+        if claim(dest_path):
+            return dest_path
+
+        stem, suffix = source_path.stem, source_path.suffix
+        if self.strategy == NAMING_HASH:
+            tag = hashlib.sha256(str(source_path.absolute()).encode()).hexdigest()[:10]
+            dest_path = dest_dir / f"{stem}_{tag}{suffix}"
+            if claim(dest_path):
+                return dest_path
+        elif self.strategy == NAMING_TIMESTAMP:
+            dest_path = dest_dir / f"{stem}_{self.upload_id}{suffix}"
+            if claim(dest_path):
+                return dest_path
+
+        key = (dest_dir, stem, suffix)
+        while True:
+            with self._lock:
+                if dest_dir not in self._seeded:
+                    self._seed(dest_dir)
+                counter = self._counters.get(key, 0) + 1
+                self._counters[key] = counter
+                self._changed.add(key)
+            dest_path = dest_dir / f"{stem}_{counter}{suffix}"
+            # Only fails when another process took the name since the counter was saved
+            if claim(dest_path):
+                return dest_path
+
+    def release(self, dest_path: Path) -> None:
+        """Remove a claimed path whose copy failed."""
+        dest_path.unlink(missing_ok=True)
+
+    def _load_saved(self) -> Dict[str, Dict[str, int]]:
+        if self.counters_path is None:
+            return {}
+        try:
+            with open(self.counters_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _seed(self, dest_dir: Path) -> None:
+        """Load the highest counter of every stem in a directory.
+
+        Saved counters are used when there are some for the directory;
+        otherwise the directory is scanned once and its counters are saved
+        by the next save().
+        """
+        self._seeded.add(dest_dir)
+        if self._saved is None:
+            self._saved = self._load_saved()
+        saved = self._saved.get(str(dest_dir))
+        if saved is not None:
+            for name, counter in saved.items():
+                path = Path(name)
+                key = (dest_dir, path.stem, path.suffix)
+                self._counters[key] = max(self._counters.get(key, 0), counter)
+            return
+
+        self._scanned.add(dest_dir)
+        try:
+            with os.scandir(dest_dir) as entries:
+                names = [entry.name for entry in entries]
+        except OSError:
+            return
+        for name in names:
+            path = Path(name)
+            match = _COUNTED.fullmatch(path.stem)
+            if match is None:
+                continue
+            key = (dest_dir, match.group(1), path.suffix)
+            self._counters[key] = max(self._counters.get(key, 0), int(match.group(2)))
+            self._changed.add(key)
+
+    def save(self) -> None:
+        """Merge the counters used by this process into the saved ones.
+
+        Counters only grow, so concurrent uploads merging their own keep
+        the highest of each.
+        """
+        if self.counters_path is None:
+            return
+        with self._lock:
+            if not self._changed and not self._scanned:
+                return
+            changed = {key: self._counters[key] for key in self._changed}
+            scanned = self._scanned
+            self._changed = set()
+            self._scanned = set()
+
+        self.counters_path.parent.mkdir(parents=True, exist_ok=True)
+        with FileLock(self.counters_path.with_suffix(".lock")):
+            saved = self._load_saved()
+            for dest_dir in scanned:
+                # An empty entry records that the directory has no counters yet
+                saved.setdefault(str(dest_dir), {})
+            for (dest_dir, stem, suffix), counter in changed.items():
+                counters = saved.setdefault(str(dest_dir), {})
+                name = f"{stem}{suffix}"
+                counters[name] = max(counters.get(name, 0), counter)
+            tmp_path = self.counters_path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(saved, f)
+            os.replace(tmp_path, self.counters_path)
@@ -0,0 +1,291 @@
+"""Packing of small files into compressed archives for Emery CLI."""
+
+import fnmatch
+import json
+import os
+import tarfile
+import time
+import zipfile
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+try:
+    import zstandard
+except ImportError:  # optional dependency: pip install emery-cli[zstd]
+    zstandard = None
+
+PACK_TAR = "tar"
+PACK_ZIP = "zip"
+PACK_ZSTD = "zstd"
+
+# Archive extension for each pack format
+PACK_EXTENSIONS = {
+    PACK_TAR: ".tar.gz",
+    PACK_ZIP: ".zip",
+    PACK_ZSTD: ".tar.zst",
+}
+
+# Every pack has a JSON index next to it: <pack><INDEX_SUFFIX>
+INDEX_SUFFIX = ".index.json"
+
+# Compression level used for every format (gzip and deflate: 1-9, zstd: 1-22)
+COMPRESS_LEVEL = 6
+
+
+def check_format(pack_format: str) -> str:
+    """Make sure a pack format is known and its compressor is installed.
+
+    Args:
+        pack_format: One of PACK_EXTENSIONS
+
+    Returns:
+        The pack format
+
+    Raises:
+        ValueError: If the format is unknown or needs a missing dependency
+    """
+    if pack_format not in PACK_EXTENSIONS:
+        raise ValueError(f"Unknown pack format: {pack_format} (choose from {', '.join(PACK_EXTENSIONS)})")
+    if pack_format == PACK_ZSTD and zstandard is None:
+        raise ValueError("zstd packs need the 'zstandard' package (pip install emery-cli[zstd])")
+    return pack_format
+
+
+class PackWriter:
+    """Stream files into one compressed pack and record them in its index.
+
+    The pack is written under a temporary name and renamed into place, with
+    its index, only when it is closed successfully.
+    """
+
+    def __init__(self, dest_dir: Path, pack_format: str, name: Optional[str] = None):
+        """Open a new pack.
+
+        Args:
+            dest_dir: Directory the pack and its index are written to
+            pack_format: One of PACK_EXTENSIONS
+            name: Pack name without extension (timestamped if omitted)
+        """
+        self.pack_format = check_format(pack_format)
+        name = name or f"pack-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+        self.pack_path = dest_dir / f"{name}{PACK_EXTENSIONS[pack_format]}"
+        self.index_path = self.pack_path.with_name(self.pack_path.name + INDEX_SUFFIX)
+        self._tmp_path = self.pack_path.with_name(f".{self.pack_path.name}.emery-tmp")
+        # Archive member name -> (size, mtime)
+        self.members: Dict[str, tuple] = {}
+
+        self._raw = None
+        self._compressor = None
+        if pack_format == PACK_ZIP:
+            self._archive = zipfile.ZipFile(
+                self._tmp_path, "w", zipfile.ZIP_DEFLATED, compresslevel=COMPRESS_LEVEL
+            )
+        elif pack_format == PACK_ZSTD:
+            self._raw = open(self._tmp_path, "wb")
+            self._compressor = zstandard.ZstdCompressor(level=COMPRESS_LEVEL).stream_writer(self._raw)
+            self._archive = tarfile.open(fileobj=self._compressor, mode="w|")
+        else:
+            self._archive = tarfile.open(self._tmp_path, "w:gz", compresslevel=COMPRESS_LEVEL)
+
+    def add(self, source_path: Path, arcname: str) -> int:
+        """Append a file to the pack.
+
+        Args:
+            source_path: File to add
+            arcname: Name of the file inside the pack
+
+        Returns:
+            Size of the file in bytes
+        """
+        with open(source_path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            if self.pack_format == PACK_ZIP:
+                info = zipfile.ZipInfo(arcname, time.localtime(stat.st_mtime)[:6])
+                info.compress_type = zipfile.ZIP_DEFLATED
+                info.external_attr = 0o644 << 16
+                with self._archive.open(info, "w") as dst:
+                    while True:
+                        chunk = f.read(1024 * 1024)
+                        if not chunk:
+                            break
+                        dst.write(chunk)
+            else:
+                info = tarfile.TarInfo(arcname)
+                info.size = stat.st_size
+                info.mtime = int(stat.st_mtime)
+                info.mode = 0o644
+                self._archive.addfile(info, f)
+        self.members[arcname] = (stat.st_size, stat.st_mtime)
+        return stat.st_size
+
+    def close(self) -> None:
+        """Finish the pack and write its index."""
+        self._archive.close()
+        if self._compressor is not None:
+            self._compressor.close()
+        os.replace(self._tmp_path, self.pack_path)
+        _write_index(self.index_path, {"pack": self.pack_path.name, "format": self.pack_format, "files": self.members})
+
+    def abort(self) -> None:
+        """Discard a pack that could not be completed."""
+        try:
+            self._archive.close()
+            if self._compressor is not None:
+                self._compressor.close()
+        except Exception:
+            pass
+        if self._raw is not None and not self._raw.closed:
+            self._raw.close()
+        self._tmp_path.unlink(missing_ok=True)
+
+
+def _read_index(index_path: Path) -> Optional[dict]:
+    try:
+        with open(index_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_index(index_path: Path, index: dict) -> None:
+    tmp_index = index_path.with_name(f".{index_path.name}.emery-tmp")
+    with open(tmp_index, "w", encoding="utf-8") as f:
+        json.dump(index, f)
+    os.replace(tmp_index, index_path)
+
+
+def iter_packs(files_dir: Path) -> Iterator[tuple[Path, dict]]:
+    """Find every pack under a directory.
+
+    Args:
+        files_dir: Directory to search
+
+    Yields:
+        Tuples of (pack_path, index) for packs whose index can be read
+    """
+    for index_path in sorted(files_dir.rglob(f"*{INDEX_SUFFIX}")):
+        index = _read_index(index_path)
+        if index is not None:
+            yield index_path.with_name(index["pack"]), index
+
+
+def drop_members(dest_dir: Path, names: Iterable[str], keep: Optional[Path] = None) -> tuple[List[Path], List[Path]]:
+    """Remove files from the indexes of the packs in a folder.
+
+    Used when packed files are deleted or stored again, so each file is
+    listed by one pack at most. Members are dropped from the index only;
+    a pack left without members is for the caller to delete.
+
+    Args:
+        dest_dir: Folder holding the packs (not searched recursively)
+        names: Member names to drop
+        keep: Pack whose members are left alone, e.g. the one just written
+
+    Returns:
+        Tuple of (rewritten_index_paths, emptied_paths); emptied_paths
+        holds the pack and index of every pack that lost all its members
+    """
+    names = set(names)
+    rewritten: List[Path] = []
+    emptied: List[Path] = []
+    if not names:
+        return rewritten, emptied
+
+    for index_path in sorted(dest_dir.glob(f"*{INDEX_SUFFIX}")):
+        index = _read_index(index_path)
+        if index is None:
+            continue
+        pack_path = index_path.with_name(index["pack"])
+        dropped = names.intersection(index["files"])
+        if not dropped or pack_path == keep:
+            continue
+        if len(dropped) == len(index["files"]):
+            emptied.extend([pack_path, index_path])
+            continue
+        for name in dropped:
+            del index["files"][name]
+        _write_index(index_path, index)
+        rewritten.append(index_path)
+    return rewritten, emptied
+
+
+def find_packed(files_dir: Path, patterns: List[str]) -> Dict[Path, List[str]]:
+    """Find packed files whose path matches any of the glob patterns.
+
+    Patterns match the path of the file relative to files_dir, as it
+    would have been stored without packing.
+
+    Args:
+        files_dir: Directory holding the packs
+        patterns: Glob patterns; all files match if empty
+
+    Returns:
+        Mapping of pack path to the matching member names
+    """
+    matches = {}
+    for pack_path, index in iter_packs(files_dir):
+        prefix = pack_path.parent.relative_to(files_dir).as_posix()
+        members = [
+            name
+            for name in index["files"]
+            if not patterns or any(fnmatch.fnmatch(f"{prefix}/{name}", pattern) for pattern in patterns)
+        ]
+        if members:
+            matches[pack_path] = members
+    return matches
+
+
+def _safe_target(out_dir: Path, name: str) -> Path:
+    target = (out_dir / name).resolve()
+    if out_dir.resolve() not in target.parents:
+        raise ValueError(f"Refusing to extract outside the output directory: {name}")
+    return target
+
+
+def extract_members(pack_path: Path, members: List[str], out_dir: Path) -> List[Path]:
+    """Extract files from a pack.
+
+    Args:
+        pack_path: Pack to read
+        members: Member names to extract
+        out_dir: Directory the members are written to, keeping their relative paths
+
+    Returns:
+        Paths of the extracted files
+    """
+    wanted = set(members)
+    extracted = []
+
+    def write(name: str, src) -> None:
+        target = _safe_target(out_dir, name)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        with open(target, "wb") as dst:
+            while True:
+                chunk = src.read(1024 * 1024)
+                if not chunk:
+                    break
+                dst.write(chunk)
+        extracted.append(target)
+
+    if pack_path.name.endswith(PACK_EXTENSIONS[PACK_ZIP]):
+        with zipfile.ZipFile(pack_path) as archive:
+            for name in members:
+                with archive.open(name) as src:
+                    write(name, src)
+        return extracted
+
+    with open(pack_path, "rb") as raw:
+        if pack_path.name.endswith(PACK_EXTENSIONS[PACK_ZSTD]):
+            check_format(PACK_ZSTD)
+            archive = tarfile.open(fileobj=zstandard.ZstdDecompressor().stream_reader(raw), mode="r|")
+        else:
+            archive = tarfile.open(fileobj=raw, mode="r|gz")
+        with archive:
+            # Compressed tars are read front to back, stopping once everything is found
+            for info in archive:
+                if info.name in wanted and info.isfile():
+                    write(info.name, archive.extractfile(info))
+                    wanted.discard(info.name)
+                    if not wanted:
+                        break
+    return extracted
@@ -0,0 +1,140 @@
+"""Lists of paths to upload, read from a file or stdin.
+
+Lists are read lazily, one record at a time, so a single `emery upload`
+can ingest more paths than fit on a command line or in memory. Three
+formats are accepted:
+
+    lines   one path per line
+    nul     NUL-separated paths, as written by `find -print0`
+    jsonl   one JSON object per line: {"path": "...", "dest": "..."}
+
+`dest` is an optional directory inside the upload directory that the
+path is uploaded into.
+"""
+
+import json
+import os
+import sys
+from pathlib import Path, PurePosixPath
+from typing import BinaryIO, Iterable, Iterator, List, NamedTuple, Optional
+
+LIST_LINES = "lines"
+LIST_NUL = "nul"
+LIST_JSONL = "jsonl"
+
+LIST_FORMATS = (LIST_LINES, LIST_NUL, LIST_JSONL)
+
+# Bytes read from the list at a time
+READ_SIZE = 64 * 1024
+
+# List path meaning standard input
+STDIN = "-"
+
+
+class ListEntry(NamedTuple):
+    """One path read from a list."""
+
+    path: Path
+    # Directory inside the upload directory, or None for its top level
+    dest: Optional[str]
+
+
+def check_format(list_format: str) -> str:
+    """Validate a list format name.
+
+    Raises:
+        ValueError: If the format is unknown
+    """
+    if list_format not in LIST_FORMATS:
+        raise ValueError(f"Unknown list format '{list_format}' (choose from {', '.join(LIST_FORMATS)})")
+    return list_format
+
+
+def open_list(list_path: str) -> BinaryIO:
+    """Open a path list for reading, "-" meaning standard input."""
+    if list_path == STDIN:
+        return sys.stdin.buffer
+    return open(list_path, "rb")
+
+
+def iter_records(stream: BinaryIO, list_format: str) -> Iterator[bytes]:
+    """Split a list into records without reading it all at once.
+
+    Empty records are skipped; a trailing carriage return is dropped from
+    lines.
+
+    Args:
+        stream: Binary stream holding the list
+        list_format: One of LIST_FORMATS
+
+    Yields:
+        Raw records
+    """
+    separator = b"\0" if list_format == LIST_NUL else b"\n"
+    pending = b""
+    while True:
+        data = stream.read(READ_SIZE)
+        if not data:
+            break
+        records = (pending + data).split(separator)
+        pending = records.pop()
+        for record in records:
+            if separator == b"\n":
+                record = record.rstrip(b"\r")
+            if record:
+                yield record
+    if separator == b"\n":
+        pending = pending.rstrip(b"\r")
+    if pending:
+        yield pending
+
+
+def check_dest(dest: str) -> str:
+    """Normalize a destination directory, keeping it inside the upload directory.
+
+    Raises:
+        ValueError: If the destination is absolute or climbs out with ".."
+    """
+    path = PurePosixPath(dest.replace(os.sep, "/"))
+    if path.is_absolute() or ".." in path.parts:
+        raise ValueError(f"Destination must be a relative path inside the upload directory: {dest}")
+    return path.as_posix()
+
+
+def parse_entry(record: bytes, list_format: str, base_dir: Path) -> ListEntry:
+    """Turn a record into an entry.
+
+    Args:
+        record: Raw record from iter_records
+        list_format: One of LIST_FORMATS
+        base_dir: Directory relative paths are resolved against
+
+    Raises:
+        ValueError: If a JSON record is malformed or its destination is invalid
+    """
+    dest = None
+    if list_format == LIST_JSONL:
+        try:
+            data = json.loads(record)
+        except ValueError as e:
+            raise ValueError(f"Invalid JSON: {e}") from None
+        if not isinstance(data, dict) or not isinstance(data.get("path"), str) or not data["path"]:
+            raise ValueError('Expected an object with a "path" string')
+        path = data["path"]
+        if data.get("dest") not in (None, "", "."):
+            dest = check_dest(str(data["dest"]))
+    else:
+        path = os.fsdecode(record)
+    return ListEntry(Path(os.path.abspath(base_dir / path)), dest)
+
+
+def batched(items: Iterable, size: int) -> Iterator[List]:
+    """Group items into lists of up to size items, reading only one group ahead."""
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
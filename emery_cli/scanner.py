@@ -0,0 +1,104 @@
+"""Directory scanning for Emery CLI."""
+
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterator, List, NamedTuple, Optional
+
+if TYPE_CHECKING:
+    from emery_cli.ignore import FileFilter
+
+
+class ManifestEntry(NamedTuple):
+    """A single file found while scanning a directory."""
+
+    rel_path: str
+    size: int
+    mtime: float
+    inode: int
+
+
+class Manifest:
+    """Files found under a directory by a single scan."""
+
+    def __init__(self, root: Path, entries: List[ManifestEntry]):
+        """Initialize manifest.
+
+        Args:
+            root: Directory that was scanned
+            entries: Files found under root
+        """
+        self.root = root
+        self.entries = entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __iter__(self) -> Iterator[ManifestEntry]:
+        return iter(self.entries)
+
+    @property
+    def total_bytes(self) -> int:
+        """Total size of all files in the manifest."""
+        return sum(entry.size for entry in self.entries)
+
+
+def iter_directory(root: Path, file_filter: Optional["FileFilter"] = None, start: str = "") -> Iterator[ManifestEntry]:
+    """Walk a directory once with os.scandir, yielding every file.
+
+    Symlinks to files are followed, symlinks to directories are not,
+    matching Path.rglob. Unreadable subdirectories are skipped. With a
+    filter, ignored directories are pruned without being listed and
+    ignored files are skipped before they are stat'ed.
+
+    Args:
+        root: Directory to walk
+        file_filter: Ignore rules and filters to apply
+        start: Walk only this subdirectory of root (POSIX path relative to root)
+
+    Yields:
+        Manifest entries with POSIX-style paths relative to root
+    """
+    chain = ()
+    if file_filter is not None:
+        chain = file_filter.chain_for(str(root), start)
+        if chain is None:
+            return
+    prefix = f"{start}/" if start else ""
+    stack = [(prefix, os.path.join(str(root), start) if start else str(root), chain)]
+    while stack:
+        prefix, path, chain = stack.pop()
+        try:
+            with os.scandir(path) as it:
+                entries = list(it)
+        except (PermissionError, FileNotFoundError, NotADirectoryError):
+            continue
+        if file_filter is not None:
+            chain = file_filter.extend(chain, prefix, path, {entry.name for entry in entries})
+        for entry in entries:
+            rel_path = prefix + entry.name
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if file_filter is None or not file_filter.ignored(chain, rel_path, True):
+                        stack.append((rel_path + "/", entry.path, chain))
+                elif entry.is_file():
+                    if file_filter is not None and file_filter.ignored(chain, rel_path, False):
+                        continue
+                    stat = entry.stat()
+                    if file_filter is not None and not file_filter.keep(rel_path, stat.st_size, stat.st_mtime):
+                        continue
+                    yield ManifestEntry(rel_path, stat.st_size, stat.st_mtime, stat.st_ino)
+            except FileNotFoundError:
+                continue
+
+
+def scan_directory(root: Path, file_filter: Optional["FileFilter"] = None) -> Manifest:
+    """Scan a directory into a reusable manifest.
+
+    Args:
+        root: Directory to scan
+        file_filter: Ignore rules and filters to apply
+
+    Returns:
+        Manifest of every file under root that passes the filter
+    """
+    return Manifest(root, list(iter_directory(root, file_filter)))
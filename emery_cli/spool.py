@@ -0,0 +1,152 @@
+"""Spool of copied uploads waiting to be committed, for Emery CLI.
+
+Concurrent `emery upload --spool` processes copy their files as usual and
+then drop a small request, listing the files to commit, into the spool
+directory. Whichever process holds the committer lock drains the spool,
+folding every waiting request into one commit; the others return at once
+and leave their requests to it.
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Callable, List, NamedTuple, Optional
+
+from emery_cli.locking import FileLock
+
+# Lock file held by the process draining the spool
+COMMITTER_LOCK_NAME = "committer.lock"
+
+# Called with (files, removed_files, message); returns True if they were committed
+CommitCallback = Callable[[List[str], List[str], Optional[str]], bool]
+
+
+class SpoolRequest(NamedTuple):
+    """Files of one upload waiting in the spool."""
+
+    path: Path
+    files: List[str]
+    removed: List[str]
+    message: Optional[str]
+
+
+class UploadSpool:
+    """Directory of upload requests drained by a single committer."""
+
+    def __init__(self, spool_dir: Path):
+        """Initialize upload spool.
+
+        Args:
+            spool_dir: Directory holding the requests
+        """
+        self.spool_dir = spool_dir
+        self.committer_lock = FileLock(spool_dir / COMMITTER_LOCK_NAME)
+
+    def submit(self, files: List[Path], removed: List[Path] = (), message: Optional[str] = None) -> Path:
+        """Add an upload to the spool.
+
+        Args:
+            files: Copied files to commit
+            removed: Uploaded files to delete from the branch
+            message: Commit message of the upload
+
+        Returns:
+            Path of the request
+        """
+        self.spool_dir.mkdir(parents=True, exist_ok=True)
+        # Names sort in submission order
+        request_path = self.spool_dir / f"{time.time_ns():020d}-{os.getpid()}.json"
+        tmp_path = request_path.with_name(f".{request_path.name}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "files": [str(Path(p).absolute()) for p in files],
+                    "removed": [str(Path(p).absolute()) for p in removed],
+                    "message": message,
+                },
+                f,
+            )
+        os.replace(tmp_path, request_path)
+        return request_path
+
+    def pending(self) -> List[SpoolRequest]:
+        """List waiting requests, oldest first; unreadable ones are skipped."""
+        try:
+            names = sorted(
+                entry.name
+                for entry in os.scandir(self.spool_dir)
+                if entry.name.endswith(".json") and not entry.name.startswith(".")
+            )
+        except FileNotFoundError:
+            return []
+
+        requests = []
+        for name in names:
+            request_path = self.spool_dir / name
+            try:
+                with open(request_path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                continue
+            requests.append(SpoolRequest(request_path, data["files"], data["removed"], data.get("message")))
+        return requests
+
+    @staticmethod
+    def fold(requests: List[SpoolRequest]) -> tuple[List[str], List[str], Optional[str]]:
+        """Combine requests into the changes of a single commit.
+
+        Later requests win: a file uploaded by one request and deleted by a
+        later one is deleted. Files that no longer exist are left out.
+
+        Args:
+            requests: Requests in submission order
+
+        Returns:
+            Tuple of (files, removed_files, message); message is None
+            unless some request had one
+        """
+        changes = {}
+        for request in requests:
+            for file_path in request.files:
+                changes[file_path] = True
+            for file_path in request.removed:
+                changes[file_path] = False
+
+        files = [path for path, added in changes.items() if added and os.path.exists(path)]
+        removed = [path for path, added in changes.items() if not added]
+        messages = list(dict.fromkeys(request.message for request in requests if request.message))
+        return files, removed, "; ".join(messages) or None
+
+    def drain(self, commit: CommitCallback) -> tuple[List[Path], bool]:
+        """Commit every waiting request, unless another process is already at it.
+
+        Requests that arrive while committing are folded into a following
+        commit. The spool is checked again after the committer lock is
+        released, so a request submitted just before that is not stranded.
+
+        Args:
+            commit: Commits the folded changes of a group of requests
+
+        Returns:
+            Tuple of (committed_request_paths, success); requests whose
+            commit failed stay in the spool
+        """
+        committed: List[Path] = []
+        while self.pending():
+            if not self.committer_lock.acquire(blocking=False):
+                # The active committer will pick up whatever is waiting
+                return committed, True
+            try:
+                while True:
+                    requests = self.pending()
+                    if not requests:
+                        break
+                    if not commit(*self.fold(requests)):
+                        return committed, False
+                    for request in requests:
+                        request.path.unlink(missing_ok=True)
+                        committed.append(request.path)
+            finally:
+                self.committer_lock.release()
+        return committed, True
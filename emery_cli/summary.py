@@ -0,0 +1,223 @@
+"""Summary index of the upload directory for `emery info`.
+
+The index keeps file and byte counts per top-level folder of FILES_DIR
+and the most recent uploads. Uploads update it with the changes they
+make, so `emery info` never has to walk FILES_DIR; `emery info --exact`
+rebuilds it with a parallel scan when it may have drifted (files edited
+outside emery, for example).
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from emery_cli.copy_backend import TEMP_SUFFIX
+from emery_cli.locking import FileLock
+
+# Group of files stored directly in FILES_DIR rather than in a folder
+ROOT_GROUP = "."
+
+# Number of most recent uploads kept in the index
+RECENT_LIMIT = 100
+
+
+class StorageSummary:
+    """File and byte counts per top-level folder of the upload directory.
+
+    Changes are collected in memory and merged into the index on disk by
+    save(), under a lock, so concurrent uploads do not lose each other's
+    updates.
+    """
+
+    def __init__(self, summary_path: Path, files_dir: Path):
+        """Initialize storage summary.
+
+        Args:
+            summary_path: JSON file holding the index
+            files_dir: Directory being summarized
+        """
+        self.summary_path = summary_path
+        self.files_dir = files_dir
+        self._lock = FileLock(summary_path.with_suffix(".lock"))
+        # Group -> [files, bytes]
+        self.folders: Dict[str, List[int]] = {}
+        # [rel_path, size, timestamp], oldest first
+        self.recent: List[list] = []
+        self.updated_at: Optional[float] = None
+        self.rebuilt_at: Optional[float] = None
+        # Changes made since the last save
+        self._deltas: Dict[str, List[int]] = {}
+        self._new_recent: List[list] = []
+        self.load()
+
+    @property
+    def exists(self) -> bool:
+        """True once the index has been built or updated at least once."""
+        return self.updated_at is not None
+
+    @property
+    def total_files(self) -> int:
+        """Number of files in the upload directory."""
+        return sum(files for files, _ in self.folders.values())
+
+    @property
+    def total_bytes(self) -> int:
+        """Total size of the upload directory."""
+        return sum(size for _, size in self.folders.values())
+
+    def load(self) -> None:
+        """Load the index from disk, starting empty if it is missing or corrupt."""
+        try:
+            with open(self.summary_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+        self.folders = data.get("folders", {})
+        self.recent = data.get("recent", [])
+        self.updated_at = data.get("updated_at")
+        self.rebuilt_at = data.get("rebuilt_at")
+
+    def _rel_path(self, path: Path) -> Optional[str]:
+        try:
+            return path.relative_to(self.files_dir).as_posix()
+        except ValueError:
+            return None
+
+    def _apply(self, rel_path: str, files: int, size: int) -> None:
+        group = rel_path.split("/", 1)[0] if "/" in rel_path else ROOT_GROUP
+        for counts in (self.folders, self._deltas):
+            entry = counts.setdefault(group, [0, 0])
+            entry[0] += files
+            entry[1] += size
+
+    def add(self, path: Path, size: int, replaced_size: Optional[int] = None) -> None:
+        """Count a file written to the upload directory.
+
+        Args:
+            path: Stored file under files_dir (others are ignored)
+            size: Its size in bytes
+            replaced_size: Size of the file it overwrote, if any
+        """
+        rel_path = self._rel_path(path)
+        if rel_path is None:
+            return
+        if replaced_size is None:
+            self._apply(rel_path, 1, size)
+        else:
+            self._apply(rel_path, 0, size - replaced_size)
+        entry = [rel_path, size, time.time()]
+        self.recent.append(entry)
+        self._new_recent.append(entry)
+        del self.recent[:-RECENT_LIMIT]
+        del self._new_recent[:-RECENT_LIMIT]
+
+    def remove(self, path: Path, size: int) -> None:
+        """Count a file deleted from the upload directory.
+
+        Args:
+            path: Deleted file under files_dir (others are ignored)
+            size: Its size in bytes
+        """
+        rel_path = self._rel_path(path)
+        if rel_path is not None:
+            self._apply(rel_path, -1, -size)
+
+    def save(self) -> None:
+        """Merge the changes made since the last save into the index on disk."""
+        if not self._deltas and not self._new_recent:
+            return
+
+        with self._lock:
+            deltas, new_recent = self._deltas, self._new_recent
+            self.load()
+            for group, (files, size) in deltas.items():
+                entry = self.folders.setdefault(group, [0, 0])
+                entry[0] += files
+                entry[1] += size
+                if entry[0] <= 0:
+                    del self.folders[group]
+            self.recent = sorted(self.recent + new_recent, key=lambda entry: entry[2])[-RECENT_LIMIT:]
+            self.updated_at = time.time()
+            self._write()
+        self._deltas = {}
+        self._new_recent = []
+
+    def _write(self) -> None:
+        self.summary_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.summary_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "folders": self.folders,
+                    "recent": self.recent,
+                    "updated_at": self.updated_at,
+                    "rebuilt_at": self.rebuilt_at,
+                },
+                f,
+            )
+        os.replace(tmp_path, self.summary_path)
+
+    def rebuild(self, jobs: int = 1) -> None:
+        """Recount everything by scanning the upload directory.
+
+        Every directory is listed by its own task, so up to `jobs` of them
+        are scanned at once however the tree is shaped. Recent uploads are
+        kept, minus those whose file is gone.
+
+        Args:
+            jobs: Number of directories scanned in parallel
+        """
+        folders: Dict[str, List[int]] = {}
+        if self.files_dir.is_dir():
+            from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+            with ThreadPoolExecutor(max_workers=jobs) as pool:
+                pending = {pool.submit(_scan_dir, str(self.files_dir)): None}
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        group = pending.pop(future)
+                        files, size, subdirs = future.result()
+                        counts = folders.setdefault(group or ROOT_GROUP, [0, 0])
+                        counts[0] += files
+                        counts[1] += size
+                        for subdir in subdirs:
+                            # Everything below a top-level folder counts towards it
+                            pending[pool.submit(_scan_dir, subdir)] = group or os.path.basename(subdir)
+
+        with self._lock:
+            self.load()
+            self.folders = {group: counts for group, counts in folders.items() if counts[0]}
+            self.recent = [entry for entry in self.recent if (self.files_dir / entry[0]).exists()]
+            self.updated_at = self.rebuilt_at = time.time()
+            self._write()
+        self._deltas = {}
+        self._new_recent = []
+
+
+def _scan_dir(path: str) -> tuple[int, int, List[str]]:
+    """List one directory.
+
+    Returns:
+        Tuple of (file_count, total_bytes, subdirectory_paths); unreadable
+        directories count as empty
+    """
+    files = 0
+    size = 0
+    subdirs = []
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                    elif entry.is_file() and not entry.name.endswith(TEMP_SUFFIX):
+                        files += 1
+                        size += entry.stat().st_size
+                except OSError:
+                    continue
+    except OSError:
+        pass
+    return files, size, subdirs
@@ -0,0 +1,366 @@
+"""Filesystem watching for `emery watch`."""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Optional, Set
+
+from emery_cli.scanner import Manifest, ManifestEntry, iter_directory
+
+if TYPE_CHECKING:
+    from emery_cli.ignore import FileFilter
+
+# inotify event flags (see inotify(7))
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+
+WATCH_MASK = (
+    IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+)
+
+_EVENT_HEADER = struct.Struct("iIII")
+
+# Reported instead of individual paths when the whole tree must be rescanned
+RESCAN_ALL = ""
+
+
+class InotifyWatcher:
+    """Report changed paths under a directory using Linux inotify."""
+
+    def __init__(self, root: Path, file_filter: Optional["FileFilter"] = None):
+        """Start watching every directory under root.
+
+        Args:
+            root: Directory to watch
+            file_filter: Ignore rules; ignored directories are not watched
+
+        Raises:
+            OSError: If inotify is not available
+        """
+        libc_name = ctypes.util.find_library("c")
+        if libc_name is None:
+            raise OSError("libc not found")
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(self._libc, "inotify_init1"):
+            raise OSError("inotify is not supported")
+
+        self.root = root
+        self.file_filter = file_filter
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        # Watch descriptor -> directory path relative to root ("" for root)
+        self._watches: Dict[int, str] = {}
+        self._add_tree("")
+
+    def _add_watch(self, rel_dir: str) -> None:
+        path = os.path.join(str(self.root), rel_dir) if rel_dir else str(self.root)
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), WATCH_MASK | IN_ONLYDIR)
+        if wd >= 0:
+            self._watches[wd] = rel_dir
+
+    def _add_tree(self, rel_dir: str) -> None:
+        """Watch a directory and every directory below it that is not ignored."""
+        chain = ()
+        if self.file_filter is not None:
+            chain = self.file_filter.chain_for(str(self.root), rel_dir)
+            if chain is None:
+                return
+        stack = [(rel_dir, chain)]
+        while stack:
+            current, chain = stack.pop()
+            self._add_watch(current)
+            path = self.root / current if current else self.root
+            try:
+                with os.scandir(path) as it:
+                    entries = list(it)
+            except OSError:
+                continue
+            prefix = f"{current}/" if current else ""
+            if self.file_filter is not None:
+                chain = self.file_filter.extend(chain, prefix, str(path), {entry.name for entry in entries})
+            for entry in entries:
+                try:
+                    if not entry.is_dir(follow_symlinks=False):
+                        continue
+                except OSError:
+                    continue
+                rel_path = prefix + entry.name
+                if self.file_filter is None or not self.file_filter.ignored(chain, rel_path, True):
+                    stack.append((rel_path, chain))
+
+    def read(self, timeout: float) -> Set[str]:
+        """Wait up to timeout seconds for changes.
+
+        Args:
+            timeout: Seconds to wait
+
+        Returns:
+            Relative paths of changed files and directories; RESCAN_ALL
+            if the kernel dropped events
+        """
+        ready, _, _ = select.select([self._fd], [], [], max(0.0, timeout))
+        if not ready:
+            return set()
+
+        changes = set()
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, name_len = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = os.fsdecode(data[offset:offset + name_len].rstrip(b"\0"))
+                offset += name_len
+
+                if mask & IN_Q_OVERFLOW:
+                    changes.add(RESCAN_ALL)
+                    continue
+                if mask & IN_IGNORED:
+                    self._watches.pop(wd, None)
+                    continue
+
+                rel_dir = self._watches.get(wd)
+                if rel_dir is None or not name:
+                    continue
+                rel_path = f"{rel_dir}/{name}" if rel_dir else name
+                if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                    self._add_tree(rel_path)
+                changes.add(rel_path)
+        return changes
+
+    def close(self) -> None:
+        """Stop watching."""
+        os.close(self._fd)
+
+
+class PollingWatcher:
+    """Report changed paths by rescanning a directory periodically."""
+
+    def __init__(self, root: Path, interval: float = 2.0, file_filter: Optional["FileFilter"] = None):
+        """Take the initial snapshot of root.
+
+        Args:
+            root: Directory to watch
+            interval: Seconds between rescans
+            file_filter: Ignore rules and filters applied to each rescan
+        """
+        self.root = root
+        self.interval = interval
+        self.file_filter = file_filter
+        self._snapshot = self._scan()
+        self._last_poll = time.monotonic()
+
+    def _scan(self) -> Dict[str, tuple]:
+        return {entry.rel_path: (entry.size, entry.mtime) for entry in iter_directory(self.root, self.file_filter)}
+
+    def read(self, timeout: float) -> Set[str]:
+        """Wait up to timeout seconds, rescanning when the interval is due.
+
+        Args:
+            timeout: Seconds to wait
+
+        Returns:
+            Relative paths of changed files
+        """
+        wait = min(max(0.0, timeout), self._last_poll + self.interval - time.monotonic())
+        if wait > 0:
+            time.sleep(wait)
+        if time.monotonic() - self._last_poll < self.interval:
+            return set()
+
+        snapshot = self._scan()
+        self._last_poll = time.monotonic()
+        changes = {rel_path for rel_path, stat in snapshot.items() if self._snapshot.get(rel_path) != stat}
+        changes.update(rel_path for rel_path in self._snapshot if rel_path not in snapshot)
+        self._snapshot = snapshot
+        return changes
+
+    def close(self) -> None:
+        """Stop watching."""
+
+
+def open_watcher(
+    root: Path, poll: bool = False, poll_interval: float = 2.0, file_filter: Optional["FileFilter"] = None
+):
+    """Watch a directory with inotify, falling back to polling.
+
+    Args:
+        root: Directory to watch
+        poll: Always poll, even if inotify is available
+        poll_interval: Seconds between rescans when polling
+        file_filter: Ignore rules and filters for the directory
+
+    Returns:
+        InotifyWatcher or PollingWatcher
+    """
+    if not poll:
+        try:
+            return InotifyWatcher(root, file_filter)
+        except OSError:
+            pass
+    return PollingWatcher(root, poll_interval, file_filter)
+
+
+class LiveManifest:
+    """Manifest of a watched directory, kept current from change events.
+
+    Only changed paths are stat'ed again, so a batch does not need a
+    full rescan of the tree.
+    """
+
+    def __init__(self, root: Path, file_filter: Optional["FileFilter"] = None):
+        """Scan root once.
+
+        Args:
+            root: Directory to track
+            file_filter: Ignore rules and filters; rejected files are not tracked
+        """
+        self.root = root
+        self.file_filter = file_filter
+        self.entries: Dict[str, ManifestEntry] = {}
+        self.apply({RESCAN_ALL})
+
+    def _drop_tree(self, rel_dir: str) -> None:
+        prefix = f"{rel_dir}/" if rel_dir else ""
+        for rel_path in [rel_path for rel_path in self.entries if rel_path.startswith(prefix)]:
+            del self.entries[rel_path]
+
+    def _scan_tree(self, rel_dir: str) -> None:
+        for entry in iter_directory(self.root, self.file_filter, rel_dir):
+            self.entries[entry.rel_path] = entry
+
+    def apply(self, changes: Set[str]) -> int:
+        """Update the manifest for changed paths.
+
+        Args:
+            changes: Relative paths of changed files or directories
+
+        Returns:
+            Bytes of files that were added or modified
+        """
+        changed_bytes = 0
+        for rel_path in sorted(changes):
+            if rel_path == RESCAN_ALL:
+                self.entries.clear()
+                self._scan_tree(RESCAN_ALL)
+                changed_bytes += sum(entry.size for entry in self.entries.values())
+                continue
+
+            path = self.root / rel_path
+            try:
+                stat = path.stat()
+            except OSError:
+                self.entries.pop(rel_path, None)
+                self._drop_tree(rel_path)
+                continue
+
+            if path.is_dir() and not path.is_symlink():
+                self._drop_tree(rel_path)
+                self._scan_tree(rel_path)
+                changed_bytes += sum(
+                    entry.size for name, entry in self.entries.items() if name.startswith(f"{rel_path}/")
+                )
+            elif path.is_file():
+                if self.file_filter is not None and not self.file_filter.accepts(
+                    str(self.root), rel_path, stat.st_size, stat.st_mtime
+                ):
+                    # Also drops a file that no longer passes the filter
+                    self.entries.pop(rel_path, None)
+                    continue
+                self.entries[rel_path] = ManifestEntry(rel_path, stat.st_size, stat.st_mtime, stat.st_ino)
+                changed_bytes += stat.st_size
+        return changed_bytes
+
+    def manifest(self) -> Manifest:
+        """Snapshot of the tracked files."""
+        return Manifest(self.root, list(self.entries.values()))
+
+
+class ChangeBatcher:
+    """Debounce change events into upload batches.
+
+    A batch is released once no change has arrived for `debounce`
+    seconds, once `max_wait` seconds have passed since its first change,
+    or once it holds `max_files` paths or `max_bytes` of changed data.
+    """
+
+    def __init__(
+        self,
+        watcher,
+        live_manifest: LiveManifest,
+        debounce: float = 2.0,
+        max_wait: float = 30.0,
+        max_files: int = 0,
+        max_bytes: int = 0,
+    ):
+        """Initialize change batcher.
+
+        Args:
+            watcher: InotifyWatcher or PollingWatcher for the directory
+            live_manifest: Manifest updated as changes arrive
+            debounce: Quiet period that ends a batch, in seconds
+            max_wait: Longest a change waits before its batch is released
+            max_files: Release a batch at this many changed paths (0 for no limit)
+            max_bytes: Release a batch at this many changed bytes (0 for no limit)
+        """
+        self.watcher = watcher
+        self.live_manifest = live_manifest
+        self.debounce = debounce
+        self.max_wait = max_wait
+        self.max_files = max_files
+        self.max_bytes = max_bytes
+
+    def next_batch(self) -> Set[str]:
+        """Block until a batch of changes is ready.
+
+        The live manifest already reflects the returned changes.
+
+        Returns:
+            Relative paths changed in the batch
+        """
+        pending: Set[str] = set()
+        pending_bytes = 0
+        first_change = last_change = 0.0
+
+        while True:
+            now = time.monotonic()
+            if pending:
+                timeout = min(last_change + self.debounce, first_change + self.max_wait) - now
+                if timeout <= 0:
+                    return pending
+            else:
+                timeout = self.max_wait
+
+            changes = self.watcher.read(timeout)
+            if not changes:
+                continue
+
+            now = time.monotonic()
+            if not pending:
+                first_change = now
+            last_change = now
+            pending |= changes
+            pending_bytes += self.live_manifest.apply(changes)
+
+            if (self.max_files and len(pending) >= self.max_files) or (
+                self.max_bytes and pending_bytes >= self.max_bytes
+            ):
+                return pending
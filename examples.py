@@ -35,16 +35,9 @@ def example_with_git():
     successful, errors = file_handler.copy_files_batch(test_files, FILES_DIR)
     
     if successful:
-        # Ensure branch exists
-        git_handler.ensure_branch(TARGET_BRANCH)
-        
-        # Switch to target branch
-        git_handler.switch_branch(TARGET_BRANCH)
-        
-        # Stage and commit
+        # Commit directly onto the target branch (no checkout needed)
         file_paths = [str(f.absolute()) for f in successful]
-        git_handler.add_files(file_paths)
-        git_handler.commit("Upload files", GIT_AUTHOR_NAME, GIT_AUTHOR_EMAIL)
+        git_handler.commit_files(TARGET_BRANCH, file_paths, "Upload files", GIT_AUTHOR_NAME, GIT_AUTHOR_EMAIL)
         
         # Push to remote
         git_handler.push(TARGET_BRANCH)
@@ -0,0 +1,42 @@
+"""Shared fixtures for the Emery CLI tests."""
+
+from pathlib import Path
+
+import pytest
+from git import Repo
+
+from emery_cli.git_handler import GitHandler
+
+AUTHOR = ("Emery Test", "test@emery.local")
+
+
+def commit_file(handler: GitHandler, branch: str, rel_path: str, content: str) -> None:
+    """Write a file into a handler's repository and commit it onto a branch."""
+    path = Path(handler.repo.working_tree_dir) / rel_path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+    assert handler.commit_files(branch, [path], f"Add {rel_path}", *AUTHOR)
+
+
+@pytest.fixture
+def remote(tmp_path: Path) -> Repo:
+    """An empty bare repository acting as origin."""
+    return Repo.init(tmp_path / "remote.git", bare=True)
+
+
+@pytest.fixture
+def make_clone(tmp_path: Path, remote: Repo):
+    """Create GitHandlers for repositories whose origin is the bare remote.
+
+    Branches that already exist on the remote are created locally from
+    their remote-tracking branches.
+    """
+    def make(name: str) -> GitHandler:
+        repo = Repo.init(tmp_path / name)
+        origin = repo.create_remote("origin", remote.git_dir)
+        origin.fetch()
+        for ref in origin.refs:
+            repo.create_head(ref.remote_head, ref)
+        return GitHandler(tmp_path / name)
+
+    return make
@@ -0,0 +1,29 @@
+"""Writing git blobs in the background during uploads."""
+
+from git import Repo
+
+from emery_cli.blob_writer import BlobWriter
+from emery_cli.git_handler import GitHandler
+
+
+def test_blobs_are_reused_and_errors_reported(tmp_path):
+    Repo.init(tmp_path)
+    handler = GitHandler(tmp_path)
+    stored = tmp_path / "files" / "a.txt"
+    stored.parent.mkdir()
+    stored.write_text("a")
+    missing = tmp_path / "files" / "missing.txt"
+
+    with BlobWriter(handler) as writer:
+        writer.submit(stored)
+        writer.submit(missing)
+
+    assert writer.written == 1
+    assert [path for path, _ in writer.errors] == [missing]
+    assert isinstance(writer.errors[0][1], FileNotFoundError)
+
+    binsha = handler.prewritten["files/a.txt"][0]
+    assert handler.write_blob(stored) == ("files/a.txt", binsha, 0o100644)
+    assert handler.repo.git.hash_object(str(stored)) == binsha.hex()
+    # Each prewritten blob is used once
+    assert "files/a.txt" not in handler.prewritten
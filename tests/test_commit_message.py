@@ -0,0 +1,24 @@
+"""Commit messages summarizing uploads."""
+
+from pathlib import Path
+
+from emery_cli.git_handler import summarize_upload
+
+BASE = Path("/uploads/files")
+
+
+def test_names_uploaded_files():
+    assert summarize_upload([BASE / "a.txt", BASE / "b.txt"], 4, BASE) == "Upload 2 files (4 B): a.txt, b.txt"
+
+
+def test_single_file_in_folder_is_named_by_its_path():
+    assert summarize_upload([BASE / "sub" / "a.txt"], 4, BASE) == "Upload 1 file (4 B): sub/a.txt"
+
+
+def test_folders_are_named_as_locations():
+    message = summarize_upload([BASE / "a.txt", BASE / "d" / "x", BASE / "d" / "y"], 2048, BASE, removed_count=1)
+    assert message == "Upload 3 files (2.0 KB) in a.txt, d/, remove 1 file"
+
+
+def test_removal_only():
+    assert summarize_upload([], 0, BASE, removed_count=3) == "Remove 3 files"
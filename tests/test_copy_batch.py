@@ -0,0 +1,86 @@
+"""Copying batches of single files into the upload directory."""
+
+import threading
+
+import pytest
+
+from emery_cli import file_handler
+from emery_cli.dedup import DedupIndex
+from emery_cli.file_handler import FileHandler
+
+
+def interrupt_on_copy(monkeypatch, handler: FileHandler, number: int) -> None:
+    """Raise KeyboardInterrupt when the handler starts its number-th copy."""
+    copy = handler.copy_backend.copy
+    calls = []
+
+    def interrupted(source_path, dest_path):
+        calls.append(source_path)
+        if len(calls) == number:
+            raise KeyboardInterrupt
+        return copy(source_path, dest_path)
+
+    monkeypatch.setattr(handler.copy_backend, "copy", interrupted)
+
+
+@pytest.fixture
+def sources(tmp_path):
+    src = tmp_path / "src"
+    src.mkdir()
+    paths = []
+    for i in range(1, 7):
+        path = src / f"l{i}.txt"
+        path.write_text(f"file {i}")
+        paths.append(path)
+    return paths
+
+
+def test_interrupted_batch_releases_unfinished_reservations(tmp_path, sources, monkeypatch):
+    dest_dir = tmp_path / "files"
+    handler = FileHandler(jobs=1)
+    interrupt_on_copy(monkeypatch, handler, 3)
+
+    with pytest.raises(KeyboardInterrupt):
+        handler.copy_files_batch(sources, dest_dir)
+
+    assert sorted(path.name for path in dest_dir.iterdir()) == ["l1.txt", "l2.txt"]
+    assert (dest_dir / "l2.txt").read_text() == "file 2"
+
+
+def test_reservations_let_a_resume_reuse_finished_copies(tmp_path, sources):
+    dest_dir = tmp_path / "files"
+    dest_dir.mkdir()
+    reserved = []
+    handler = FileHandler(jobs=1)
+    handler.copy_files_batch(sources[:2], dest_dir, on_reserved=reserved.extend)
+    # A crash after claiming the next name leaves its empty placeholder behind
+    placeholder = handler.namer.reserve(sources[2], dest_dir)
+    reserved.append((sources[2], placeholder))
+
+    finished = [dest for source, dest in reserved if handler.finished_copy(source, dest)]
+    assert finished == [dest_dir / "l1.txt", dest_dir / "l2.txt"]
+
+    assert handler.remove_partial_files(dest_dir, recursive=False, placeholders=[placeholder]) == 1
+    assert sorted(path.name for path in dest_dir.iterdir()) == ["l1.txt", "l2.txt"]
+
+
+def test_dedup_candidates_are_hashed_on_the_copy_workers(tmp_path, sources, monkeypatch):
+    dest_dir = tmp_path / "files"
+    dest_dir.mkdir()
+    sources[1].write_text("file 1")
+    hash_file = file_handler.hash_file
+    threads = set()
+
+    def hashed(path, *args, **kwargs):
+        threads.add(threading.current_thread())
+        return hash_file(path, *args, **kwargs)
+
+    monkeypatch.setattr(file_handler, "hash_file", hashed)
+    handler = FileHandler(jobs=4, dedup_index=DedupIndex(tmp_path / "dedup.json", dest_dir))
+
+    successful, errors = handler.copy_files_batch(sources, dest_dir)
+
+    assert errors == []
+    assert threading.main_thread() not in threads
+    assert handler.deduplicated == [(sources[1], dest_dir / "l1.txt")]
+    assert len(successful) == 5
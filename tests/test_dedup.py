@@ -0,0 +1,59 @@
+"""Content-addressed dedup index."""
+
+import os
+
+from emery_cli import dedup
+from emery_cli.dedup import DedupIndex
+from emery_cli.hashing import hash_file
+
+
+def count_hashes(monkeypatch) -> list:
+    calls = []
+
+    def counted(path, *args, **kwargs):
+        calls.append(path)
+        return hash_file(path, *args, **kwargs)
+
+    monkeypatch.setattr(dedup, "hash_file", counted)
+    return calls
+
+
+def stored_index(tmp_path):
+    files_dir = tmp_path / "files"
+    files_dir.mkdir()
+    stored = files_dir / "a.txt"
+    stored.write_text("original")
+    index = DedupIndex(tmp_path / "dedup.json", files_dir)
+    index.record(hash_file(stored), stored)
+    index.save()
+    return DedupIndex(tmp_path / "dedup.json", files_dir), stored
+
+
+def test_unchanged_file_is_trusted_without_hashing(tmp_path, monkeypatch):
+    index, stored = stored_index(tmp_path)
+    hashes = count_hashes(monkeypatch)
+
+    assert index.lookup(hash_file(stored)) == stored
+    assert hashes == []
+
+
+def test_edited_file_is_hashed_and_dropped(tmp_path, monkeypatch):
+    index, stored = stored_index(tmp_path)
+    digest = hash_file(stored)
+    stored.write_text("changed!")
+    hashes = count_hashes(monkeypatch)
+
+    assert index.lookup(digest) is None
+    assert hashes == [stored]
+    assert index.lookup(digest) is None
+
+
+def test_touched_file_is_hashed_once(tmp_path, monkeypatch):
+    index, stored = stored_index(tmp_path)
+    digest = hash_file(stored)
+    os.utime(stored, ns=(0, 0))
+    hashes = count_hashes(monkeypatch)
+
+    assert index.lookup(digest) == stored
+    assert index.lookup(digest) == stored
+    assert hashes == [stored]
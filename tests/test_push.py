@@ -0,0 +1,115 @@
+"""Pushing upload branches to a bare remote."""
+
+from pathlib import Path
+
+from emery_cli.git_handler import GitHandler
+
+from conftest import commit_file
+
+
+def remote_sha(remote, branch: str) -> str:
+    return remote.git.rev_parse(f"refs/heads/{branch}")
+
+
+def remote_files(remote, branch: str) -> set:
+    return set(remote.git.ls_tree("-r", "--name-only", branch).split())
+
+
+def count_round_trips(monkeypatch) -> list:
+    """Record the branches of every push sent to the remote."""
+    calls = []
+    push_refspecs = GitHandler._push_refspecs
+
+    def spy(self, branch_names):
+        calls.append(list(branch_names))
+        return push_refspecs(self, branch_names)
+
+    monkeypatch.setattr(GitHandler, "_push_refspecs", spy)
+    return calls
+
+
+def test_push_fast_forward(remote, make_clone, monkeypatch):
+    local = make_clone("local")
+    commit_file(local, "files", "a.txt", "a")
+    assert local.push("files")
+
+    commit_file(local, "files", "b.txt", "b")
+    calls = count_round_trips(monkeypatch)
+    monkeypatch.setattr(GitHandler, "_sync_with_remote", lambda self, name: False)
+    assert local.push("files")
+
+    assert calls == [["files"]]
+    assert remote_sha(remote, "files") == local.repo.heads["files"].commit.hexsha
+    assert remote_files(remote, "files") == {"a.txt", "b.txt"}
+
+
+def test_push_rejected_fetches_and_rebases(remote, make_clone, monkeypatch):
+    local = make_clone("local")
+    commit_file(local, "files", "a.txt", "a")
+    assert local.push("files")
+
+    other = make_clone("other")
+    commit_file(other, "files", "b.txt", "b")
+    assert other.push("files")
+    upstream = remote_sha(remote, "files")
+
+    commit_file(local, "files", "c.txt", "c")
+    calls = count_round_trips(monkeypatch)
+    assert local.push("files")
+
+    # Rejected once, then pushed again after the rebase
+    assert calls == [["files"], ["files"]]
+    head = local.repo.heads["files"].commit
+    assert remote_sha(remote, "files") == head.hexsha
+    assert [parent.hexsha for parent in head.parents] == [upstream]
+    assert head.message == "Add c.txt"
+    assert remote_files(remote, "files") == {"a.txt", "b.txt", "c.txt"}
+    # Nothing was checked out
+    assert not (Path(local.repo.working_tree_dir) / "b.txt").exists()
+
+
+def test_push_branches_in_one_round_trip(remote, make_clone, monkeypatch):
+    local = make_clone("local")
+    commit_file(local, "files", "a.txt", "a")
+    commit_file(local, "archive", "old.txt", "old")
+
+    calls = count_round_trips(monkeypatch)
+    assert local.push_branches(["files", "archive"])
+
+    assert calls == [["files", "archive"]]
+    assert remote_files(remote, "files") == {"a.txt"}
+    assert remote_files(remote, "archive") == {"old.txt"}
+
+
+def test_push_queued_drains_queue(remote, make_clone, tmp_path, monkeypatch):
+    local = make_clone("local")
+    queue_path = tmp_path / "state" / "push-queue.json"
+    commit_file(local, "files", "a.txt", "a")
+    local.queue_push("files", queue_path)
+    commit_file(local, "archive", "old.txt", "old")
+    local.queue_push("archive", queue_path)
+    local.queue_push("files", queue_path)
+    assert local.queued_pushes(queue_path) == ["files", "archive"]
+
+    calls = count_round_trips(monkeypatch)
+    assert local.push_queued(queue_path)
+
+    assert calls == [["files", "archive"]]
+    assert not queue_path.exists()
+    assert remote_sha(remote, "files") == local.repo.heads["files"].commit.hexsha
+    assert remote_sha(remote, "archive") == local.repo.heads["archive"].commit.hexsha
+
+    # An empty queue is a no-op
+    assert local.push_queued(queue_path)
+    assert calls == [["files", "archive"]]
+
+
+def test_push_queued_keeps_queue_on_failure(make_clone, tmp_path):
+    local = make_clone("local")
+    queue_path = tmp_path / "push-queue.json"
+    commit_file(local, "files", "a.txt", "a")
+    local.queue_push("files", queue_path)
+    local.repo.remotes.origin.set_url(str(tmp_path / "missing.git"))
+
+    assert not local.push_queued(queue_path)
+    assert local.queued_pushes(queue_path) == ["files"]
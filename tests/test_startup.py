@@ -0,0 +1,111 @@
+"""Startup cost of every subcommand, measured with `python -X importtime`.
+
+Each command runs for real in a scratch repository holding a copy of the
+package, so the paths taken are the ones users hit rather than --help.
+`watch` runs until interrupted and is only checked with --help.
+"""
+
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+import pytest
+from git import Repo
+
+import emery_cli
+
+# Modules loaded only by the commands that use them. rich.table is not one
+# of them: rich.console, which every command prints with, imports it
+GIT = "git"
+TKINTER = "tkinter"
+PROGRESS = "rich.progress"
+LAZY_MODULES = {GIT, TKINTER, PROGRESS}
+
+# Import time of emery's own modules, as a share of typer's (a fixed cost
+# that scales with the speed of the machine)
+OWN_IMPORT_BUDGET = 0.5
+
+# (arguments, expected exit code, lazy modules the command is expected to load),
+# run in this order
+COMMANDS = [
+    (["upload", "--no-commit", "{src}/a.txt"], 0, {PROGRESS}),
+    (["upload", "{src}/folder"], 0, {GIT, PROGRESS}),
+    (["info"], 0, set()),
+    (["verify"], 0, set()),
+    (["packed"], 0, set()),
+    (["extract", "missing*"], 1, set()),
+    (["restore", "missing.chunks.json"], 1, set()),
+    (["commit"], 0, set()),
+    (["push"], 0, {GIT}),
+    (["watch", "--help"], 0, set()),
+    (["clean", "--wait"], 0, set()),
+]
+
+
+def parse_importtime(stderr: str) -> Dict[str, int]:
+    """Map each imported module to its cumulative import time in microseconds."""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, _, rest = line.partition(":")
+        _, cumulative_us, name = rest.split("|")
+        modules[name.strip()] = int(cumulative_us)
+    return modules
+
+
+@pytest.fixture(scope="module")
+def scratch(tmp_path_factory) -> Path:
+    """A repository with its own copy of emery_cli, an origin, and files to upload."""
+    root = tmp_path_factory.mktemp("startup")
+    repo_dir = root / "repo"
+    shutil.copytree(
+        Path(emery_cli.__file__).parent, repo_dir / "emery_cli", ignore=shutil.ignore_patterns("__pycache__")
+    )
+    repo = Repo.init(repo_dir)
+    remote = Repo.init(root / "remote.git", bare=True)
+    repo.create_remote("origin", remote.git_dir)
+
+    src = root / "src"
+    (src / "folder").mkdir(parents=True)
+    (src / "a.txt").write_text("a")
+    (src / "folder" / "b.txt").write_text("b")
+    return root
+
+
+def run(root: Path, args: List[str]) -> subprocess.CompletedProcess:
+    # Import the module by name (not with -m) so it shows up in the timings
+    code = "import sys; sys.argv = ['emery'] + sys.argv[1:]; import emery_cli.main as m; m.main()"
+    args = [arg.format(src=root / "src") for arg in args]
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code, *args],
+        cwd=str(root / "repo"),
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+
+
+def test_commands_load_modules_lazily(scratch):
+    failures = []
+    for args, exit_code, expected in COMMANDS:
+        result = run(scratch, args)
+        modules = parse_importtime(result.stderr)
+        if result.returncode != exit_code:
+            failures.append(f"{' '.join(args)}: exited with {result.returncode}\n{result.stdout}")
+            continue
+
+        eager = sorted((LAZY_MODULES - expected) & modules.keys())
+        if eager:
+            failures.append(f"{' '.join(args)}: imported {', '.join(eager)}")
+
+        own_us = modules["emery_cli.main"] - modules["typer"]
+        if own_us > OWN_IMPORT_BUDGET * modules["typer"]:
+            failures.append(
+                f"{' '.join(args)}: emery_cli.main took {own_us / 1000:.1f} ms to import "
+                f"on top of typer's {modules['typer'] / 1000:.1f} ms"
+            )
+
+    assert not failures, "\n".join(failures)